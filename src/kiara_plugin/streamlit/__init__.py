@@ -108,6 +108,7 @@ def init(
     context_config: Union[None, "KiaraContextConfig"] = None,
     runtime_config: Union[None, "KiaraRuntimeConfig"] = None,
     page_config: Union[None, Dict[str, typing.Any]] = None,
+    precompute_previews: bool = False,
 ) -> "KiaraStreamlitAPI":
 
     import kiara_plugin.streamlit.utils.monkey_patches  # noqa
@@ -122,7 +123,9 @@ def init(
     def get_ktx() -> "KiaraStreamlit":
         # print("CREATE KIARA STREAMLIT")
         ktx = KiaraStreamlit(
-            context_config=context_config, runtime_config=runtime_config
+            context_config=context_config,
+            runtime_config=runtime_config,
+            precompute_previews=precompute_previews,
         )
         return ktx
 
@@ -70,6 +70,7 @@ class KiaraStreamlitComponents(Protocol):
     def current_values_preview(
         self,
         values: "Mapping[str, kiara.models.values.value.Value]",
+        field_selector: "Union[None, str]" = "tabs",
         add_value_types: "Union[None, bool]" = True,
         key: "Union[None, str]" = "-- generated --",
     ):
@@ -85,32 +86,47 @@ class KiaraStreamlitComponents(Protocol):
     def explore_database(
         self,
         value: "Union[str, uuid.UUID, kiara.models.values.value.Value]",
+        server_side_computation: "Union[None, bool]" = True,
+        columns: "Union[List[str], None]" = None,
         display_style: "Union[None, str]" = "default",
         height: "Union[None, int]" = None,
         show_properties: "Union[None, bool]" = True,
         key: "Union[None, str]" = "-- generated --",
     ):
-        """Preview a value of type 'database'."""
+        """Preview a value of type 'database'.
+
+        By default, the explorer queries are translated to SQL and run against the database file, so only aggregated results are loaded.
+        """
 
     def explore_table(
         self,
         value: "Union[str, uuid.UUID, kiara.models.values.value.Value]",
+        server_side_computation: "Union[None, bool]" = True,
+        columns: "Union[List[str], None]" = None,
         display_style: "Union[None, str]" = "default",
         height: "Union[None, int]" = None,
         show_properties: "Union[None, bool]" = True,
         key: "Union[None, str]" = "-- generated --",
     ):
-        """Explore a 'table' value visually."""
+        """Explore a 'table' value visually.
+
+        By default, the explorer queries are computed server-side (using DuckDB on the Arrow data), so tables larger than the browser memory can be explored.
+        """
 
     def explore_tables(
         self,
         value: "Union[str, uuid.UUID, kiara.models.values.value.Value]",
+        server_side_computation: "Union[None, bool]" = True,
+        columns: "Union[List[str], None]" = None,
         display_style: "Union[None, str]" = "default",
         height: "Union[None, int]" = None,
         show_properties: "Union[None, bool]" = True,
         key: "Union[None, str]" = "-- generated --",
     ):
-        """Preview a value of type 'tables'."""
+        """Preview a value of type 'tables'.
+
+        By default, the explorer queries are computed server-side (using DuckDB on the Arrow data of the selected table).
+        """
 
     def fields_info(
         self,
@@ -168,6 +184,22 @@ class KiaraStreamlitComponents(Protocol):
     ):
         """Render a text input widget."""
 
+    def input_file_bundle(
+        self,
+        show_preview: "Union[None, bool]" = None,
+        bundle_name: "Union[str, None]" = None,
+        accepted_file_extensions: "Union[List[str], None]" = None,
+        label: "Union[None, str]" = "-- no label --",
+        help: "Union[None, str]" = "-- n/a --",
+        smart_label: "Union[None, bool]" = True,
+        display_style: "Union[None, str]" = "default",
+        key: "Union[None, str]" = "-- generated --",
+    ):
+        """Render a multi-file upload widget, that registers all uploaded files as one 'file_bundle' value.
+
+        The uploaded files are hashed and staged in parallel, files with identical content are only included once.
+        """
+
     def input_float(
         self,
         label: "Union[None, str]" = "-- no label --",
@@ -305,22 +337,32 @@ class KiaraStreamlitComponents(Protocol):
     def preview(
         self,
         value: "Union[str, uuid.UUID, kiara.models.values.value.Value]",
+        max_chars: "Union[None, int]" = 20000,
+        max_lines: "Union[None, int]" = 200,
         display_style: "Union[None, str]" = "default",
         height: "Union[None, int]" = None,
         show_properties: "Union[None, bool]" = True,
         key: "Union[None, str]" = "-- generated --",
     ):
-        """The default preview component, will render a preview component dependent on the data type of the provided value."""
+        """The default preview component, will render a preview component dependent on the data type of the provided value.
+
+        If no preview component exists for the data type, the value is rendered as text. Only the first lines of that text are displayed, more can be loaded on demand.
+        """
 
     def preview_array(
         self,
         value: "Union[str, uuid.UUID, kiara.models.values.value.Value]",
+        num_bins: "Union[None, int]" = 20,
+        page_size: "Union[None, int]" = 100,
         display_style: "Union[None, str]" = "default",
         height: "Union[None, int]" = None,
         show_properties: "Union[None, bool]" = True,
         key: "Union[None, str]" = "-- generated --",
     ):
-        """Preview a value of type 'array'."""
+        """Preview a value of type 'array'.
+
+        Only the currently displayed window of the array is converted, (Arrow) chunks are never concatenated. Numeric arrays also get a summary with a histogram and (approximate) quantiles, computed chunk by chunk.
+        """
 
     def preview_boolean(
         self,
@@ -335,16 +377,24 @@ class KiaraStreamlitComponents(Protocol):
     def preview_database(
         self,
         value: "Union[str, uuid.UUID, kiara.models.values.value.Value]",
+        page_size: "Union[None, int]" = 100,
+        columns: "Union[List[str], None]" = None,
         display_style: "Union[None, str]" = "default",
         height: "Union[None, int]" = None,
         show_properties: "Union[None, bool]" = True,
         key: "Union[None, str]" = "-- generated --",
     ):
-        """Preview a value of type 'database'."""
+        """Preview a value of type 'database'.
+
+        The database file is accessed read-only, and only the rows of the currently displayed page are queried.
+        """
 
     def preview_dict(
         self,
         value: "Union[str, uuid.UUID, kiara.models.values.value.Value]",
+        max_json_size: "Union[None, int]" = 262144,
+        max_items: "Union[None, int]" = 50,
+        max_depth: "Union[None, int]" = 2,
         display_style: "Union[None, str]" = "default",
         height: "Union[None, int]" = None,
         show_properties: "Union[None, bool]" = True,
@@ -355,22 +405,33 @@ class KiaraStreamlitComponents(Protocol):
     def preview_file(
         self,
         value: "Union[str, uuid.UUID, kiara.models.values.value.Value]",
+        max_lines: "Union[None, int]" = 100,
+        max_bytes: "Union[None, int]" = 65536,
         display_style: "Union[None, str]" = "default",
         height: "Union[None, int]" = None,
         show_properties: "Union[None, bool]" = True,
         key: "Union[None, str]" = "-- generated --",
     ):
-        """Preview a value of type 'file'."""
+        """Preview a value of type 'file'.
+
+        Only the parts of the file that are displayed are read (via a memory map), so this also works for very large files. Binary files are displayed as hex dump.
+        """
 
     def preview_file_bundle(
         self,
         value: "Union[str, uuid.UUID, kiara.models.values.value.Value]",
+        page_size: "Union[None, int]" = 100,
+        max_lines: "Union[None, int]" = 100,
+        max_bytes: "Union[None, int]" = 65536,
         display_style: "Union[None, str]" = "default",
         height: "Union[None, int]" = None,
         show_properties: "Union[None, bool]" = True,
         key: "Union[None, str]" = "-- generated --",
     ):
-        """Preview a value of type 'file_bundle'."""
+        """Preview a value of type 'file_bundle'.
+
+        The file listing is created once per bundle (as an Arrow table), and can be filtered by path (substring, or glob pattern) and paged through. A summary per mime-type is computed from the filtered listing. The content of a single selected file can be previewed, only that file is read.
+        """
 
     def preview_float(
         self,
@@ -395,6 +456,9 @@ class KiaraStreamlitComponents(Protocol):
     def preview_list(
         self,
         value: "Union[str, uuid.UUID, kiara.models.values.value.Value]",
+        max_json_size: "Union[None, int]" = 262144,
+        max_items: "Union[None, int]" = 50,
+        max_depth: "Union[None, int]" = 2,
         display_style: "Union[None, str]" = "default",
         height: "Union[None, int]" = None,
         show_properties: "Union[None, bool]" = True,
@@ -402,17 +466,21 @@ class KiaraStreamlitComponents(Protocol):
     ):
         """Preview a value of type 'list'."""
 
-    def preview_network_data(
+    def preview_network_data_sampled(
         self,
         value: "Union[str, uuid.UUID, kiara.models.values.value.Value]",
+        hops: "Union[None, int]" = 2,
+        max_edges: "Union[None, int]" = 500,
+        max_nodes: "Union[None, int]" = 100,
+        sample_strategy: "Union[None, str]" = "top_degree",
         display_style: "Union[None, str]" = "default",
         height: "Union[None, int]" = None,
         show_properties: "Union[None, bool]" = True,
         key: "Union[None, str]" = "-- generated --",
     ):
-        """Preview a value of type 'network data'.
+        """Preview a value of type 'network_data'.
 
-        Currently, this displays a graph, as well as the nodes and edges tables. The graph is only a preview, and takes a while to render depending on the network data size, this will replaced at some point.
+        Graph-level statistics are computed once per value. The rendered graph is a bounded sample of the network (the nodes with the highest degree, the k-hop neighborhood of a node, or the nodes visited by a random walk), so the preview stays fast independent of the network size.
         """
 
     def preview_none(
@@ -438,16 +506,24 @@ class KiaraStreamlitComponents(Protocol):
     def preview_table(
         self,
         value: "Union[str, uuid.UUID, kiara.models.values.value.Value]",
+        page_size: "Union[None, int]" = 100,
+        columns: "Union[List[str], None]" = None,
         display_style: "Union[None, str]" = "default",
         height: "Union[None, int]" = None,
         show_properties: "Union[None, bool]" = True,
         key: "Union[None, str]" = "-- generated --",
     ):
-        """Preview a value of type 'table'."""
+        """Preview a value of type 'table'.
+
+        Rows can be filtered and sorted, this happens on the underlying Arrow data, and only the displayed page of the result is converted.
+
+        Use the 'profile' display style to show per-column statistics instead of the table content. The profile is computed once per table (using the 'table.profile' module) and stored as a value in the kiara context, so it can be re-used later on.
+        """
 
     def preview_tables(
         self,
         value: "Union[str, uuid.UUID, kiara.models.values.value.Value]",
+        columns: "Union[List[str], None]" = None,
         display_style: "Union[None, str]" = "default",
         height: "Union[None, int]" = None,
         show_properties: "Union[None, bool]" = True,
@@ -455,6 +531,22 @@ class KiaraStreamlitComponents(Protocol):
     ):
         """Preview a value of type 'tables'."""
 
+    def query_table(
+        self,
+        value: "Union[str, uuid.UUID, kiara.models.values.value.Value]",
+        query: "Union[str, None]" = None,
+        page_size: "Union[None, int]" = 100,
+        timeout: "Union[float, None]" = 30.0,
+        add_save_option: "Union[None, bool]" = True,
+        key: "Union[None, str]" = "-- generated --",
+    ):
+        """Run SQL queries against a 'table' or 'tables' value.
+
+        The (Arrow) tables are registered with an in-memory DuckDB connection without copying them. A 'table' value can be queried as 'data', the tables of a 'tables' value by their names. Only the displayed page of the result is computed, unless the result is stored as a new value.
+
+        Returns the stored result value, if the user stored one.
+        """
+
     def run_job_panel(
         self,
         job_desc: "JobDesc",
@@ -735,6 +827,7 @@ class KiaraStreamlitComponents(Protocol):
     def value_map_preview(
         self,
         value_map: "Mapping[str, Union[str, uuid.UUID, kiara.models.values.value.Value]]",
+        field_selector: "Union[None, str]" = "tabs",
         add_save_option: "Union[None, bool]" = False,
         add_value_types: "Union[None, bool]" = True,
         key: "Union[None, str]" = "-- generated --",
@@ -58,7 +58,7 @@ class ContextSwitch(KiaraComponent[ContextSwitchOptions]):
                 help="Select the active context.",
             )
             if selected_context != current:
-                self.api.set_active_context(selected_context)
+                self.kiara_streamlit.set_active_context(selected_context)
 
             return selected_context
 
@@ -117,7 +117,7 @@ class ContextSwitch(KiaraComponent[ContextSwitchOptions]):
             )
 
             if selected_context != current and options.switch_to_selected:
-                self.api.set_active_context(selected_context)
+                self.kiara_streamlit.set_active_context(selected_context)
 
             return selected_context
 
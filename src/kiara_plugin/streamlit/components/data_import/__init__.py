@@ -196,7 +196,9 @@ class DataImportComponent(KiaraComponent[ONBOARDING_OPTIONS_TYPE]):
                 st.error("No value to import.")
             else:
 
-                self.api.store_value(result_value, alias=alias, allow_overwrite=True)
+                self.kiara_streamlit.store_value(
+                    result_value, alias=alias, allow_overwrite=True
+                )
                 request.result.modal_finished = True
                 request.result.value = result_value  # type: ignore
                 request.result.alias = alias  # type: ignore
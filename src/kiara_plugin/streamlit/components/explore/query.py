@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+import uuid
+from typing import TYPE_CHECKING, Mapping, Union
+
+from pydantic import Field
+
+from kiara.api import Value
+from kiara_plugin.streamlit.components import ComponentOptions, KiaraComponent
+from kiara_plugin.streamlit.defaults import (
+    DEFAULT_LISTING_PAGE_SIZE,
+    DEFAULT_QUERY_TIMEOUT,
+)
+from kiara_plugin.streamlit.utils.queries import query_tables, query_tables_page
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+    from kiara_plugin.streamlit.api import KiaraStreamlitAPI
+
+DEFAULT_TABLE_NAME = "data"
+
+
+class QueryTableOptions(ComponentOptions):
+
+    add_save_option: bool = Field(
+        description="Whether to add an option to store the query result as a new 'table' value.",
+        default=True,
+    )
+    timeout: Union[float, None] = Field(
+        description="The maximum number of seconds a query is allowed to run.",
+        default=DEFAULT_QUERY_TIMEOUT,
+    )
+    page_size: int = Field(
+        description="The number of result rows to display per page.",
+        default=DEFAULT_LISTING_PAGE_SIZE,
+    )
+    query: Union[str, None] = Field(
+        description="The initial SQL query. If not provided, all rows of the (first) table are selected.",
+        default=None,
+    )
+    value: Union[str, uuid.UUID, Value] = Field(
+        description="The 'table' or 'tables' value to query."
+    )
+
+
+class QueryTable(KiaraComponent[QueryTableOptions]):
+    """Run SQL queries against a 'table' or 'tables' value.
+
+    The (Arrow) tables are registered with an in-memory DuckDB connection without copying them. A 'table' value can be queried as 'data', the tables of a 'tables' value by their names. Only the displayed page of the result is computed, unless the result is stored as a new value.
+
+    Returns the stored result value, if the user stored one.
+    """
+
+    _component_name = "query_table"
+    _options = QueryTableOptions
+
+    _examples = [
+        {
+            "doc": "Query a table.",
+            "args": {
+                "value": "nodes_table",
+                "query": "SELECT * FROM data LIMIT 10",
+            },
+        },
+    ]
+
+    def get_query_tables(self, value: Value) -> Mapping[str, "pa.Table"]:
+
+        if value.data_type_name == "table":
+            return {DEFAULT_TABLE_NAME: value.data.arrow_table}
+        elif value.data_type_name == "tables":
+            return {
+                table_name: value.data.get_table(table_name).arrow_table
+                for table_name in value.data.table_names
+            }
+        else:
+            raise Exception(
+                f"Can't query value of type '{value.data_type_name}': only 'table' and 'tables' values are supported."
+            )
+
+    def _render(
+        self, st: "KiaraStreamlitAPI", options: QueryTableOptions
+    ) -> Union[Value, None]:
+
+        import duckdb
+
+        value = self.api.get_value(options.value)
+        tables = self.get_query_tables(value)
+        table_names = list(tables.keys())
+        if not table_names:
+            st.info("The value does not contain any tables to query.")
+            return None
+
+        _key = options.create_key("query", str(value.value_id))
+
+        default_query = options.query
+        if not default_query:
+            default_query = f'SELECT * FROM "{table_names[0]}"'  # noqa
+
+        with st.form(key=f"{_key}_form"):
+            query = st.text_area(
+                "SQL query",
+                value=default_query,
+                help=f"Available tables: {', '.join(table_names)}",
+                key=f"{_key}_query",
+            )
+            st.form_submit_button("Run query")
+
+        # go back to the first page if the query changed
+        last_query = self.get_session_var(options, "query", "last_query")
+        if last_query != query:
+            self.set_session_var(options, "query", "last_query", value=query)
+            self.set_session_var(options, "query", "page", value=0)
+        page = self.get_session_var(options, "query", "page", default=0)
+
+        page_size = max(1, options.page_size)
+        try:
+            result = query_tables_page(
+                tables,
+                query,
+                offset=page * page_size,
+                limit=page_size,
+                timeout=options.timeout,
+            )
+        except (TimeoutError, duckdb.Error) as e:
+            st.error(str(e))
+            return self.get_session_var(options, "query", "result")
+
+        st.dataframe(
+            result.table.to_pandas(), use_container_width=True, hide_index=True
+        )
+
+        def _change_page(delta: int):
+            self.set_session_var(options, "query", "page", value=page + delta)
+
+        info_col, prev_col, next_col = st.columns([4, 1, 1])
+        info_col.caption(
+            f"Rows {result.offset + 1} - {result.offset + result.table.num_rows}"
+            if result.table.num_rows
+            else "No rows."
+        )
+        prev_col.button(
+            "Previous",
+            key=f"{_key}_previous",
+            disabled=page == 0,
+            on_click=_change_page,
+            args=(-1,),
+            use_container_width=True,
+        )
+        next_col.button(
+            "Next",
+            key=f"{_key}_next",
+            disabled=not result.has_more,
+            on_click=_change_page,
+            args=(1,),
+            use_container_width=True,
+        )
+
+        if options.add_save_option:
+            with st.form(key=f"{_key}_save_form"):
+                alias = st.text_input(
+                    "Alias",
+                    help="The alias to store the query result as.",
+                    key=f"{_key}_alias",
+                )
+                store = st.form_submit_button("Store result")
+
+            if store:
+                if not alias:
+                    st.error("No alias specified.")
+                else:
+                    try:
+                        result_table = query_tables(
+                            tables, query, timeout=options.timeout
+                        )
+                    except (TimeoutError, duckdb.Error) as e:
+                        st.error(str(e))
+                    else:
+                        result_value = self.api.register_data(
+                            result_table, data_type="table"
+                        )
+                        store_result = self.kiara_streamlit.store_value(
+                            result_value, alias=alias, allow_overwrite=True
+                        )
+                        if store_result.error:
+                            st.error(store_result.error)
+                        else:
+                            self.set_session_var(
+                                options, "query", "result", value=result_value
+                            )
+                            st.success(f"Stored query result as '{alias}'.")
+
+        return self.get_session_var(options, "query", "result")
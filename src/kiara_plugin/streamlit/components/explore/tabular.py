@@ -1,19 +1,153 @@
 # -*- coding: utf-8 -*-
-from typing import TYPE_CHECKING
+import abc
+import uuid
+from typing import TYPE_CHECKING, Any, List, Tuple, Union
 
 import pygwalker as pyg
+from pydantic import Field
 
 import streamlit.components.v1 as components
+from kiara.api import Value
 from kiara_plugin.streamlit.components.preview import PreviewComponent, PreviewOptions
+from kiara_plugin.streamlit.defaults import DEFAULT_EXPLORER_CACHE_SIZE
+from kiara_plugin.streamlit.utils.caching import BoundedCache
+from kiara_plugin.streamlit.utils.components import create_column_selector
+from kiara_plugin.streamlit.utils.databases import get_sqlite_reader, quote_identifier
 from kiara_plugin.tabular.models.db import KiaraDatabase
 from kiara_plugin.tabular.models.tables import KiaraTable, KiaraTables
 
 if TYPE_CHECKING:
     from kiara_plugin.streamlit.api import KiaraStreamlitAPI
+    from kiara_plugin.streamlit.streamlit import KiaraStreamlit
 
 
-class TableExplorer(PreviewComponent):
-    """Explore a 'table' value visually."""
+def init_explorer_comm() -> bool:
+    """Register pygwalker's communication handler with the streamlit server.
+
+    Returns:
+        whether the handler could be registered (this fails if there is no streamlit server, e.g. in tests)
+    """
+
+    try:
+        from pygwalker.api.streamlit import init_streamlit_comm
+
+        init_streamlit_comm()
+        return True
+    except Exception:
+        return False
+
+
+class ExplorerOptions(PreviewOptions):
+
+    columns: Union[List[str], None] = Field(
+        description="The columns to explore initially (all columns, if not specified).",
+        default=None,
+    )
+    server_side_computation: bool = Field(
+        description="Run the explorer queries on the server (via DuckDB over the Arrow data, or SQL for databases), and only send aggregated results to the browser. If the streamlit server can't be used for that, all rows are embedded instead.",
+        default=True,
+    )
+
+
+class TabularExplorerComponent(PreviewComponent):
+    """Base class for components that render a pygwalker explorer for (a table in) a tabular value.
+
+    The generated explorer html is memoized per value, table and explorer configuration, so reruns of the page (triggered by unrelated widgets) re-send the identical document, which the browser does not reload.
+    """
+
+    _options = ExplorerOptions  # type: ignore
+
+    @classmethod
+    def get_preview_name(cls) -> str:
+        return "explore"
+
+    def __init__(
+        self, kiara_streamlit: "KiaraStreamlit", component_name: str, doc: Any = None
+    ):
+
+        super().__init__(
+            kiara_streamlit=kiara_streamlit, component_name=component_name, doc=doc
+        )
+        # the renderer is kept alongside its html, since its communication channel answers the server-side queries
+        self._explorers: BoundedCache[Tuple[Any, str]] = BoundedCache(
+            max_items=DEFAULT_EXPLORER_CACHE_SIZE
+        )
+
+    @abc.abstractmethod
+    def get_column_names(self, value: Value, table_name: Union[str, None]) -> List[str]:
+        """Return the names of all columns of the (selected table of the) value."""
+
+    @abc.abstractmethod
+    def create_explorer_dataset(
+        self,
+        value: Value,
+        table_name: Union[str, None],
+        columns: List[str],
+        server_side: bool,
+    ) -> Any:
+        """Create the dataset (a dataframe, or a pygwalker database connector) for the explorer, containing only the selected columns."""
+
+    def get_explorer_html(
+        self,
+        value: Value,
+        table_name: Union[str, None],
+        columns: List[str],
+        server_side: bool,
+    ) -> str:
+        """Return the (memoized) explorer html for a value (and table and column selection)."""
+
+        cache_key = (value.value_id, table_name, tuple(columns), server_side)
+        explorer = self._explorers.get(cache_key)
+        if explorer is not None:
+            return explorer[1]
+
+        dataset = self.create_explorer_dataset(
+            value, table_name=table_name, columns=columns, server_side=server_side
+        )
+        if server_side:
+            from pygwalker.api.streamlit import StreamlitRenderer
+
+            # a stable id, so the (server side) communication channel is re-used across reruns
+            gid = uuid.uuid5(
+                value.value_id, f"{table_name or ''}:{','.join(columns)}"
+            ).hex
+            renderer = StreamlitRenderer(dataset, gid=gid, use_kernel_calc=True)
+            # the public 'render_explore' passes the html straight to 'components.html', so it can't be memoized,
+            # '_get_html' (available from pygwalker 0.3.10 to at least 0.5.0, see the version range in pyproject.toml) returns it instead
+            explorer = (renderer, renderer._get_html())
+        else:
+            explorer = (None, pyg.walk(dataset, return_html=True))
+
+        self._explorers.set(cache_key, explorer)
+        return explorer[1]
+
+    def render_explorer(
+        self,
+        st: "KiaraStreamlitAPI",
+        value: Value,
+        table_name: Union[str, None],
+        options: ExplorerOptions,
+    ):
+
+        columns = create_column_selector(
+            st,
+            key=options.create_key("explore", str(value.value_id), table_name or ""),
+            column_names=self.get_column_names(value, table_name=table_name),
+            default=options.columns,
+        )
+
+        server_side = options.server_side_computation and init_explorer_comm()
+        pyg_html = self.get_explorer_html(
+            value, table_name=table_name, columns=columns, server_side=server_side
+        )
+        components.html(pyg_html, height=1000, scrolling=True)
+
+
+class TableExplorer(TabularExplorerComponent):
+    """Explore a 'table' value visually.
+
+    By default, the explorer queries are computed server-side (using DuckDB on the Arrow data), so tables larger than the browser memory can be explored.
+    """
 
     _component_name = "explore_table"
 
@@ -25,17 +159,34 @@ class TableExplorer(PreviewComponent):
     def get_data_type(cls) -> str:
         return "table"
 
-    def render_preview(self, st: "KiaraStreamlitAPI", options: PreviewOptions):
+    def get_column_names(self, value: Value, table_name: Union[str, None]) -> List[str]:
+
+        table: KiaraTable = value.data
+        return table.arrow_table.column_names
+
+    def create_explorer_dataset(
+        self,
+        value: Value,
+        table_name: Union[str, None],
+        columns: List[str],
+        server_side: bool,
+    ) -> Any:
+
+        import polars as pl
+
+        table: KiaraTable = value.data
+        return pl.from_arrow(table.arrow_table.select(columns))
+
+    def render_preview(self, st: "KiaraStreamlitAPI", options: ExplorerOptions):
         _value = self.api.get_value(options.value)
-        table: KiaraTable = _value.data
+        self.render_explorer(st, value=_value, table_name=None, options=options)
 
-        df = table.to_polars_dataframe()  # noqa
-        pyg_html = pyg.walk(df, return_html=True)
-        components.html(pyg_html, height=1000, scrolling=True)
 
+class DatabasePreview(TabularExplorerComponent):
+    """Preview a value of type 'database'.
 
-class DatabasePreview(PreviewComponent):
-    """Preview a value of type 'database'."""
+    By default, the explorer queries are translated to SQL and run against the database file, so only aggregated results are loaded.
+    """
 
     _component_name = "explore_database"
     _examples = [
@@ -46,25 +197,57 @@ class DatabasePreview(PreviewComponent):
     def get_data_type(cls) -> str:
         return "database"
 
-    def render_preview(self, st: "KiaraStreamlitAPI", options: PreviewOptions):
+    def get_column_names(self, value: Value, table_name: Union[str, None]) -> List[str]:
+
+        db: KiaraDatabase = value.data
+        return get_sqlite_reader(db.db_file_path).get_column_names(table_name)  # type: ignore
+
+    def create_explorer_dataset(
+        self,
+        value: Value,
+        table_name: Union[str, None],
+        columns: List[str],
+        server_side: bool,
+    ) -> Any:
+
+        db: KiaraDatabase = value.data
+        if server_side:
+            from pygwalker.data_parsers.database_parser import Connector
+
+            column_list = ", ".join(quote_identifier(c) for c in columns)
+            return Connector(
+                db.db_url,
+                f"SELECT {column_list} FROM {quote_identifier(table_name)}",  # type: ignore # noqa
+            )
+        return get_sqlite_reader(db.db_file_path).read_rows(
+            table_name, columns=columns  # type: ignore
+        )
+
+    def render_preview(self, st: "KiaraStreamlitAPI", options: ExplorerOptions):
 
         _value = self.api.get_value(options.value)
         db: KiaraDatabase = _value.data
 
-        table_names = list(db.table_names)
+        table_names = get_sqlite_reader(db.db_file_path).get_table_names()
 
-        selected_table = st.selectbox("Select table", table_names)
+        selected_table = st.selectbox(
+            "Select table",
+            table_names,
+            key=options.create_key("explore", "database", str(_value.value_id)),
+        )
         if not selected_table:
             return
 
-        table = db.get_table_as_pandas_df(selected_table)
+        self.render_explorer(
+            st, value=_value, table_name=selected_table, options=options
+        )
 
-        pyg_html = pyg.walk(table, return_html=True)
-        components.html(pyg_html, height=1000, scrolling=True)
 
+class TablesPreview(TabularExplorerComponent):
+    """Preview a value of type 'tables'.
 
-class TablesPreview(PreviewComponent):
-    """Preview a value of type 'tables'."""
+    By default, the explorer queries are computed server-side (using DuckDB on the Arrow data of the selected table).
+    """
 
     _component_name = "explore_tables"
     _examples = [
@@ -73,19 +256,41 @@ class TablesPreview(PreviewComponent):
 
     @classmethod
     def get_data_type(cls) -> str:
-        return "database"
+        return "tables"
+
+    def get_column_names(self, value: Value, table_name: Union[str, None]) -> List[str]:
 
-    def render_preview(self, st: "KiaraStreamlitAPI", options: PreviewOptions):
+        tables: KiaraTables = value.data
+        return tables.get_table(table_name).arrow_table.column_names  # type: ignore
+
+    def create_explorer_dataset(
+        self,
+        value: Value,
+        table_name: Union[str, None],
+        columns: List[str],
+        server_side: bool,
+    ) -> Any:
+
+        import polars as pl
+
+        tables: KiaraTables = value.data
+        arrow_table = tables.get_table(table_name).arrow_table  # type: ignore
+        return pl.from_arrow(arrow_table.select(columns))
+
+    def render_preview(self, st: "KiaraStreamlitAPI", options: ExplorerOptions):
 
         _value = self.api.get_value(options.value)
         tables: KiaraTables = _value.data
 
-        selected_table = st.selectbox("Select table", tables.table_names)
+        selected_table = st.selectbox(
+            "Select table",
+            tables.table_names,
+            key=options.create_key("explore", "tables", str(_value.value_id)),
+        )
 
         if not selected_table:
             return
 
-        table = tables.get_table(selected_table).to_polars_dataframe()
-
-        pyg_html = pyg.walk(table, return_html=True)
-        components.html(pyg_html, height=1000, scrolling=True)
+        self.render_explorer(
+            st, value=_value, table_name=selected_table, options=options
+        )
@@ -9,6 +9,7 @@ from typing import (
     Iterable,
     List,
     Mapping,
+    Tuple,
     TypeVar,
     Union,
 )
@@ -25,10 +26,12 @@ from kiara_plugin.streamlit.components.modals import (
     ModalResult,
 )
 from kiara_plugin.streamlit.defaults import (
+    ACTIVE_FORM_MARKER_KEY,
     NO_LABEL_MARKER,
     NO_VALUE_MARKER,
     WANTS_MODAL_MARKER_KEY,
 )
+from kiara_plugin.streamlit.utils.aliases import AliasEntry, get_data_type_name
 
 if TYPE_CHECKING:
     from kiara_plugin.streamlit import KiaraStreamlit
@@ -96,6 +99,44 @@ class InputComponent(KiaraComponent[INPUT_OPTIONS_TYPE]):
     ) -> Union[ValueLink, None, str, uuid.UUID]:
         pass
 
+    def _create_session_store_callback(
+        self, options: ComponentOptions, *key, default=None
+    ) -> Tuple[Callable, str]:
+
+        callback, widget_key = super()._create_session_store_callback(
+            options, *key, default=default
+        )
+        form_key = self._session_state.get(ACTIVE_FORM_MARKER_KEY, None)
+        if form_key is None:
+            return callback, widget_key
+
+        # widgets in a form can't have change callbacks, so the callback is run when the form is submitted instead
+        self._session_state[f"{form_key}_callbacks"].append(callback)
+        return None, widget_key  # type: ignore
+
+    def register_input_data(
+        self, options: INPUT_OPTIONS_TYPE, data: Any, data_type: str
+    ) -> uuid.UUID:
+        """Register the raw input of a widget as a value, and return the value id.
+
+        The registration is memoized per session and widget, so the data is only hashed and registered again if the raw input changed since the last rerun.
+        """
+
+        context_id = self.api.context.id
+        memo = self.get_session_var(options, "input", "registered", data_type)
+        if memo is not None and memo[0] == context_id and memo[1] == data:
+            return memo[2]
+
+        value = self.api.register_data(data, data_type=data_type, reuse_existing=True)
+        self.set_session_var(
+            options,
+            "input",
+            "registered",
+            data_type,
+            value=(context_id, copy.deepcopy(data), value.value_id),
+        )
+        return value.value_id
+
     def _render(
         self, st: "KiaraStreamlitAPI", options: INPUT_OPTIONS_TYPE
     ) -> Union[Value, None]:
@@ -263,13 +304,22 @@ class DefaultInputComponent(InputComponent):
         also_return_key: bool = False,
     ) -> Any:
 
+        # only the data types of the candidates are needed, the selected value is resolved later on
         has_alias = options.value_has_alias
         if has_alias:
-            available_values = self.api.list_aliases(data_types=list(data_types))
+            value_data_types = {
+                alias: entry.data_type
+                for alias, entry in self.kiara_streamlit.list_aliases(
+                    data_types=data_types
+                ).items()
+            }
         else:
-            available_values = self.api.list_values(
-                data_types=list(data_types), has_alias=False
-            )
+            value_data_types = {
+                value_id: value.data_type_name
+                for value_id, value in self.api.list_values(
+                    data_types=list(data_types), has_alias=False
+                ).items()
+            }
 
         default = None
 
@@ -296,14 +346,14 @@ class DefaultInputComponent(InputComponent):
             def format_func(v: Any) -> str:
                 if v == NO_VALUE_MARKER:
                     return v  # type: ignore
-                return f"{v} ({available_values[v].data_type_name})"
+                return f"{v} ({value_data_types[v]})"
 
         if optional:
-            _item_options = [NO_VALUE_MARKER, *available_values.keys()]
+            _item_options = [NO_VALUE_MARKER, *value_data_types.keys()]
             if not default:
                 default = NO_VALUE_MARKER
         else:
-            _item_options = list(available_values.keys())
+            _item_options = list(value_data_types.keys())
 
         callback, _select_key = self._create_session_store_callback(
             options, "input", "value", "select", default=default
@@ -369,7 +419,9 @@ class PickValueInputOptions(InputOptions):
         description="Whether to show a preview of the value. If not provided, a selectbox will be rendered so the user can choose.",
         default=None,
     )
-    values: Mapping[str, Value] = Field(description="The values to pick from.")
+    values: Mapping[str, Union[Value, AliasEntry]] = Field(
+        description="The values to pick from (either the values themselves, or lightweight alias entries)."
+    )
 
 
 class PickValueComponent(InputComponent):
@@ -393,10 +445,10 @@ class PickValueComponent(InputComponent):
 
         data_types = []
 
-        for name, value in options.values.items():
-            data_type = value.data_type_name
+        for value in options.values.values():
+            data_type = get_data_type_name(value)
             if data_type not in data_types:
-                data_types.append(value.data_type_name)
+                data_types.append(data_type)
 
         result: Union[str, None] = self._render_default_selectbox(
             st, options, data_types=data_types
@@ -424,7 +476,7 @@ class PickValueComponent(InputComponent):
             def format_func(v: Any) -> str:
                 if v == NO_VALUE_MARKER:
                     return v  # type: ignore
-                return f"{v} ({available_values[v].data_type_name})"
+                return f"{v} ({get_data_type_name(available_values[v])})"
 
         _item_options = list(available_values.keys())
 
@@ -10,6 +10,7 @@ from kiara.registries.data import ValueLink
 from kiara.utils.values import construct_valuemap
 from kiara_plugin.streamlit.components import ComponentOptions, KiaraComponent
 from kiara_plugin.streamlit.components.input import DefaultInputOptions, InputComponent
+from kiara_plugin.streamlit.defaults import ACTIVE_FORM_MARKER_KEY
 
 if TYPE_CHECKING:
     from kiara_plugin.streamlit.api import KiaraStreamlitAPI
@@ -21,7 +22,7 @@ class AssemblyOptions(ComponentOptions):
         description="The maximum number of columns to use for the assembly.", default=3
     )
     profile: str = Field(
-        description="The name of the profile that renders the assembly. Available: 'default' and 'all'",
+        description="The name of the profile that renders the assembly. Available: 'default', 'all', and 'form' (like 'default', but the inputs are only updated when the form is submitted)",
         default="default",
     )
     smart_label: bool = Field(
@@ -77,6 +78,26 @@ class InputAssemblyComponent(KiaraComponent[ASSEMBLY_OPTIONS_TYPE]):
         value_map = self.api.assemble_value_map(result, values_schema=fields)
         return value_map
 
+    def _create_input_options(
+        self, key: str, field_name: str, schema: ValueSchema, options: AssemblyOptions
+    ) -> DefaultInputOptions:
+
+        help = None
+        if schema.doc.is_set:
+            help = schema.doc.full_doc
+
+        input_opts = DefaultInputOptions(
+            key=key,
+            label=field_name,
+            value_schema=schema,
+            help=help,
+            smart_label=options.smart_label,
+        )
+        if ACTIVE_FORM_MARKER_KEY in self._session_state:
+            # previews can contain buttons, which are not allowed in forms
+            input_opts.show_preview = False
+        return input_opts
+
     def render_all(
         self,
         st: "KiaraStreamlitAPI",
@@ -100,9 +121,6 @@ class InputAssemblyComponent(KiaraComponent[ASSEMBLY_OPTIONS_TYPE]):
         values: Dict[str, Union[None, ValueLink, str, uuid.UUID]] = {}
         for idx, field_name in enumerate(fields.keys()):
             schema = fields[field_name]
-            help = None
-            if schema.doc.is_set:
-                help = schema.doc.full_doc
             data_type_name = schema.type
             _key = options.create_key("op_input", "req", "all", field_name)
             comp: InputComponent = self.kiara_streamlit.get_input_component(
@@ -110,12 +128,8 @@ class InputAssemblyComponent(KiaraComponent[ASSEMBLY_OPTIONS_TYPE]):
             )
 
             column_idx = idx % num_columns
-            input_opts = DefaultInputOptions(
-                key=_key,
-                label=field_name,
-                value_schema=schema,
-                help=help,
-                smart_label=options.smart_label,
+            input_opts = self._create_input_options(
+                key=_key, field_name=field_name, schema=schema, options=options
             )
             r = comp.render_input_field(columns[column_idx], input_opts)  # type: ignore
 
@@ -155,20 +169,13 @@ class InputAssemblyComponent(KiaraComponent[ASSEMBLY_OPTIONS_TYPE]):
             columns = req_expander.columns(num_columns)
             for idx, field_name in enumerate(required.keys()):
                 schema = required[field_name]
-                help = None
-                if schema.doc.is_set:
-                    help = schema.doc.full_doc
                 data_type_name = schema.type
                 _key = options.create_key("op_input", "req", "default", field_name)
                 comp = self.kiara_streamlit.get_input_component(data_type_name)
 
                 column_idx = idx % num_columns
-                input_opts = DefaultInputOptions(
-                    key=_key,
-                    label=field_name,
-                    value_schema=schema,
-                    help=help,
-                    smart_label=options.smart_label,
+                input_opts = self._create_input_options(
+                    key=_key, field_name=field_name, schema=schema, options=options
                 )
 
                 r = comp.render_input_field(columns[column_idx], input_opts)  # type: ignore
@@ -189,9 +196,6 @@ class InputAssemblyComponent(KiaraComponent[ASSEMBLY_OPTIONS_TYPE]):
 
             for idx, field_name in enumerate(optional.keys()):
                 schema = optional[field_name]
-                help = None
-                if schema.doc.is_set:
-                    help = schema.doc.full_doc
 
                 if idx >= num_columns:
                     if idx % num_columns == 0:
@@ -201,12 +205,8 @@ class InputAssemblyComponent(KiaraComponent[ASSEMBLY_OPTIONS_TYPE]):
                 _key = options.create_key("op_input", "opt", "default", field_name)
                 comp = self.kiara_streamlit.get_input_component(data_type_name)
                 column_idx = idx % num_columns
-                input_opts = DefaultInputOptions(
-                    key=_key,
-                    label=field_name,
-                    value_schema=schema,
-                    help=help,
-                    smart_label=options.smart_label,
+                input_opts = self._create_input_options(
+                    key=_key, field_name=field_name, schema=schema, options=options
                 )
 
                 r = comp.render_input_field(opt_columns[column_idx], input_opts)  # type: ignore
@@ -214,6 +214,41 @@ class InputAssemblyComponent(KiaraComponent[ASSEMBLY_OPTIONS_TYPE]):
 
         return values
 
+    def render_form(
+        self,
+        st: "KiaraStreamlitAPI",
+        fields: Mapping[str, ValueSchema],
+        options: AssemblyOptions,
+    ) -> Mapping[str, Union[str, None, uuid.UUID, ValueLink]]:
+        """Render the default layout inside a form, so changing an input does not trigger a rerun.
+
+        The returned inputs only change when the form is submitted (on the first run, the initial values are returned).
+        """
+
+        form_key = options.create_key("op_input", "form")
+        callbacks_key = f"{form_key}_callbacks"
+
+        def submit():
+            for callback in self._session_state.get(callbacks_key, []):
+                callback()
+
+        self._session_state[callbacks_key] = []
+        self._session_state[ACTIVE_FORM_MARKER_KEY] = form_key
+        try:
+            form = st.form(key=form_key)
+            values = self.render_default(form, fields, options=options)  # type: ignore
+        finally:
+            self._session_state.pop(ACTIVE_FORM_MARKER_KEY, None)
+        submitted = form.form_submit_button("Apply inputs", on_click=submit)
+
+        submitted_values = self.get_session_var(options, "op_input", "form", "values")
+        if submitted or submitted_values is None:
+            submitted_values = dict(values)
+            self.set_session_var(
+                options, "op_input", "form", "values", value=submitted_values
+            )
+        return dict(submitted_values)
+
 
 class OperationInputsOptions(AssemblyOptions):
 
@@ -45,5 +45,4 @@ class ListInput(InputComponent):
             if options.help:
                 st.caption(options.help)
 
-        value = self.api.register_data(items, data_type="list", reuse_existing=True)
-        return value
+        return self.register_input_data(options, data=items, data_type="list")
@@ -1,22 +1,20 @@
 # -*- coding: utf-8 -*-
-import atexit
-import os
-import shutil
-import tempfile
+import time
 import uuid
 from functools import lru_cache
-from typing import TYPE_CHECKING, Dict, List, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Union
 
+import humanfriendly
 from pydantic import Field
 
 from kiara.exceptions import KiaraException
-from kiara.interfaces.python_api import JobDesc
 from kiara.models.documentation import DocumentationMetadataModel
-from kiara.models.filesystem import KiaraFile
 from kiara.models.values.value import Value
 from kiara.registries.data import ValueLink
 from kiara.utils.doc import extract_doc_from_func
 from kiara_plugin.streamlit.components.input import InputComponent, InputOptions
+from kiara_plugin.streamlit.defaults import DEFAULT_DOWNLOAD_PROGRESS_INTERVAL
+from kiara_plugin.streamlit.utils.downloads import DownloadStatus
 
 if TYPE_CHECKING:
     from kiara_plugin.streamlit.api import KiaraStreamlitAPI
@@ -168,19 +166,14 @@ class FileOnboarding(InputComponent):
             options, "import", "file", "existing"
         )
 
-        values = self.api.list_aliases(data_types=["file"])
-
-        if not options.accepted_file_extensions:
-            _values = dict(values)
-        else:
-            _values = {}
-            for k, v in values.items():
-                file: KiaraFile = v.data
-                if file.file_extension in options.accepted_file_extensions:
-                    _values[k] = v
+        # a lookup in the file index, no file value is loaded
+        entries = self.kiara_streamlit.list_file_aliases(
+            extensions=options.accepted_file_extensions
+        )
 
+        # only the selected value is loaded (by the picker)
         value: Union[Value, None] = self.get_component("pick_value").render(
-            st, values=_values, key=existing_key, show_preview=False
+            st, values=entries, key=existing_key, show_preview=False
         )
 
         return value
@@ -208,41 +201,16 @@ class FileOnboarding(InputComponent):
             st.session_state[last_value_key] = None  # type: ignore
             return None
 
-        # TODO: in some very edge cases this change detection can still go wrong
-        if (
-            last_value
-            and last_value["uploaded_file"] == uploaded_file.name
-            and last_value["size"] == uploaded_file.size
-        ):
-            changed = False
-        else:
-            changed = True
-
-        if not changed:
+        # the file id changes with every upload, even of the same file
+        if last_value and last_value["file_id"] == uploaded_file.file_id:
             return last_value["value"]
 
-        if not uploaded_file:
-            return None
-
-        temp_dir = tempfile.mkdtemp()
-
-        def cleanup():
-            shutil.rmtree(temp_dir, ignore_errors=True)
-
-        atexit.register(cleanup)
-
-        path = os.path.join(temp_dir, uploaded_file.name)
-        with open(path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-
-        kiara_file = KiaraFile.load_file(path, file_name=uploaded_file.name)
-        value = self.api.register_data(
-            kiara_file, data_type="file", reuse_existing=True
+        value = self.kiara_streamlit.import_file_obj(
+            uploaded_file, file_name=uploaded_file.name
         )
 
         st.session_state[last_value_key] = {  # type: ignore
-            "uploaded_file": uploaded_file.name,
-            "size": uploaded_file.size,
+            "file_id": uploaded_file.file_id,
             "value": value,
         }
         return value
@@ -279,22 +247,16 @@ class FileOnboarding(InputComponent):
             last_value = None
             st.session_state[last_value_key] = None  # type: ignore
 
-        if not changed:
+        if not changed and not import_button:
             if last_value:
-                result_value: Union[Value, None] = last_value["value"]
-                return result_value
+                return self._render_download(st, last_value)
             else:
                 return None
 
-        valid_url = bool(url)  # TODO: validate URL
-
         if not import_button:
-            if last_value:
-                result_value = last_value["value"]
-                return result_value
-            else:
-                return None
+            return None
 
+        valid_url = bool(url)  # TODO: validate URL
         if not valid_url:
             return None
 
@@ -310,17 +272,150 @@ class FileOnboarding(InputComponent):
                 )
                 return None
 
-        inputs = {"source": url, "onboard_type": "url"}
+        if last_value and last_value["value"] is not None:
+            return last_value["value"]
+
+        # the download runs in the background, so it continues (and is picked up again) if the page is rerun
+        download_id = self.kiara_streamlit.start_download(url)  # type: ignore
+        last_value = {"url": url, "download_id": download_id, "value": None}
+        st.session_state[last_value_key] = last_value  # type: ignore
+
+        return self._render_download(st, last_value)
+
+    def _render_download(
+        self, st: "KiaraStreamlitAPI", last_value: Dict[str, Any]
+    ) -> Union[Value, None]:
+        """Render the progress of a (background) download, and return the imported file once the download is finished.
+
+        While the download is running, the current progress is rendered once per run, and another rerun is triggered after a short wait, so the progress bar updates across reruns.
+        """
+
+        if last_value["value"] is not None:
+            result_value: Value = last_value["value"]
+            return result_value
+
+        download_id = last_value["download_id"]
+        status = self.kiara_streamlit.get_download_status(download_id)
+        if status.state in ["pending", "running"]:
+            st.progress(status.fraction or 0.0, text=self._get_progress_text(status))
+            time.sleep(DEFAULT_DOWNLOAD_PROGRESS_INTERVAL)
+            st.rerun()
+
+        if status.state == "failed":
+            st.error(f"Download failed: {status.error}")
+            return None
 
         try:
-            job_desc = JobDesc(operation="import.file", inputs=inputs)
-            result = st.kiara.run_job_panel(job_desc=job_desc)
+            value = self.kiara_streamlit.import_download(download_id)
         except Exception as e:
             msg = KiaraException.get_root_details(e)
             st.error(msg)
             return None
 
-        value: Value = result.get_value_obj("file")
-        st.session_state[last_value_key] = {"url": url, "value": value}  # type: ignore
-
+        last_value["value"] = value
         return value
+
+    def _get_progress_text(self, status: DownloadStatus) -> str:
+
+        downloaded = humanfriendly.format_size(status.num_bytes)
+        if status.total_bytes is None:
+            return f"Downloading '{status.file_name}': {downloaded}"
+        total = humanfriendly.format_size(status.total_bytes)
+        return f"Downloading '{status.file_name}': {downloaded} of {total}"
+
+
+class InputFileBundleOptions(InputOptions):
+    accepted_file_extensions: Union[None, List[str]] = Field(
+        description="A list of file extensions that are accepted. If not specified, all files are accepted.",
+        default=None,
+    )
+    bundle_name: Union[str, None] = Field(
+        description="The name of the file bundle. Defaults to 'uploaded_files'.",
+        default=None,
+    )
+    show_preview: Union[bool, None] = Field(
+        description="Whether to show a preview of the file bundle. If not specified, the user can choose with a checkbox.",
+        default=None,
+    )
+
+
+class FileBundleOnboarding(InputComponent):
+    """Render a multi-file upload widget, that registers all uploaded files as one 'file_bundle' value.
+
+    The uploaded files are hashed and staged in parallel, files with identical content are only included once.
+    """
+
+    _component_name = "input_file_bundle"
+    _options = InputFileBundleOptions
+    _examples = [{"doc": "The default file bundle upload widget.", "args": {}}]
+
+    @classmethod
+    def get_data_type(cls) -> str:
+        return "file_bundle"
+
+    @classmethod
+    def get_default_label(cls) -> str:
+        return "Upload files"
+
+    def render_input_field(
+        self,
+        st: "KiaraStreamlitAPI",
+        options: InputFileBundleOptions,
+    ) -> Union[ValueLink, None, str, uuid.UUID]:
+
+        _, upload_key = self._create_session_store_callback(
+            options, "import", "file_bundle", "upload"
+        )
+
+        last_value_key = f"{upload_key}_last_value"
+        last_value: Dict[str, Any] = st.session_state.get(last_value_key, None)  # type: ignore
+
+        file_types = options.accepted_file_extensions
+        if not file_types:
+            file_types = None
+        uploaded_files = st.file_uploader(
+            label=options.label,
+            help=options.help,
+            key=upload_key,
+            type=file_types,
+            accept_multiple_files=True,
+        )
+
+        if not uploaded_files:
+            st.session_state[last_value_key] = None  # type: ignore
+            return None
+
+        # the file ids change with every upload, even of the same files
+        file_ids = tuple(f.file_id for f in uploaded_files)
+        if last_value and last_value["file_ids"] == file_ids:
+            bundle: Value = last_value["value"]
+        else:
+            bundle_name = options.bundle_name
+            if not bundle_name:
+                bundle_name = "uploaded_files"
+            with st.spinner(f"Importing {len(uploaded_files)} files..."):
+                bundle = self.kiara_streamlit.import_file_bundle(
+                    [(f, f.name) for f in uploaded_files], bundle_name=bundle_name
+                )
+            st.session_state[last_value_key] = {  # type: ignore
+                "file_ids": file_ids,
+                "value": bundle,
+            }
+
+        preview_callback, preview_key = self._create_session_store_callback(
+            options, "import", "file_bundle", "preview"
+        )
+        if options.show_preview is None:
+            preview = st.checkbox(
+                label="Preview files",
+                value=False,
+                key=preview_key,
+                on_change=preview_callback,
+            )
+        else:
+            preview = options.show_preview
+
+        if preview:
+            st.kiara.preview(value=bundle)
+
+        return bundle
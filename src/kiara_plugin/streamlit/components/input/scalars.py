@@ -26,10 +26,9 @@ class ScalarInput(InputComponent):
         scalar = self.render_scalar_input(st, options=options)
         if scalar is None:
             return None
-        value = self.api.register_data(
-            scalar, data_type=self.get_data_type(), reuse_existing=True
+        return self.register_input_data(
+            options, data=scalar, data_type=self.get_data_type()
         )
-        return value
 
     @abc.abstractmethod
     def render_scalar_input(
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
-from typing import TYPE_CHECKING, Any, Mapping, Union
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Mapping, NamedTuple, Tuple, Type, Union
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -116,33 +117,65 @@ def write_generic_data(
         st.write(data)
 
 
-def create_recursive_table_from_model_object(
-    model: BaseModel,
-    render_config: Union[Mapping[str, Any], None] = None,
-):
+class ModelFieldPlan(NamedTuple):
+    """Pre-computed information about a single field of a model class."""
 
-    if render_config is None:
-        render_config = {}
+    name: str
+    type: str
+    description: Union[str, None]
 
-    model_cls = model.__class__
 
-    table = {}
+@lru_cache(maxsize=None)
+def get_model_schema(model_cls: Type[BaseModel]) -> Mapping[str, Any]:
+    """Return the (cached) json schema for a model class."""
 
-    props = model_cls.schema().get("properties", {})
+    try:
+        return model_cls.model_json_schema()
+    except Exception:
+        # not all models can be represented as json schema
+        return {}
 
-    for field_name in sorted(model_cls.model_fields.keys()):
 
-        data = getattr(model, field_name)
+@lru_cache(maxsize=None)
+def get_model_flattening_plan(
+    model_cls: Type[BaseModel],
+) -> Tuple[ModelFieldPlan, ...]:
+    """Compile the list of fields (in display order) to render for a model class, only done once per class."""
+
+    props = get_model_schema(model_cls).get("properties", {})
+
+    plan = []
+    for field_name in sorted(model_cls.model_fields.keys()):
         p = props.get(field_name, None)
         p_type = None
+        desc = None
         if p is not None:
             p_type = p.get("type", None)
             # TODO: check 'anyOf' keys
-            p.get("description", None)
+            desc = p.get("description", None)
 
         if p_type is None:
             p_type = "-- n/a --"
 
+        plan.append(ModelFieldPlan(name=field_name, type=p_type, description=desc))
+
+    return tuple(plan)
+
+
+def create_recursive_table_from_model_object(
+    model: BaseModel,
+    render_config: Union[Mapping[str, Any], None] = None,
+):
+
+    if render_config is None:
+        render_config = {}
+
+    table = {}
+
+    for field_plan in get_model_flattening_plan(model.__class__):
+
+        data = getattr(model, field_plan.name)
+
         if isinstance(data, BaseModel):
             data_renderable = create_recursive_table_from_model_object(
                 data, render_config=render_config
@@ -164,12 +197,12 @@ def create_recursive_table_from_model_object(
             # )
             # data_renderable = None
 
-        # table[field_name] = {
+        # table[field_plan.name] = {
         #     "data": data_renderable,
-        #     "type": p_type,
-        #     "description": desc,
+        #     "type": field_plan.type,
+        #     "description": field_plan.description,
         # }
-        table[field_name] = data_renderable
+        table[field_plan.name] = data_renderable
 
     return table
 
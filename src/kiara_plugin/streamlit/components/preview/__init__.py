@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 import uuid
 from abc import abstractmethod
-from typing import TYPE_CHECKING, List, Mapping, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Union
 
+import humanfriendly
 from pydantic import Field
 
 from kiara.api import Value, ValueMap
@@ -10,10 +11,18 @@ from kiara_plugin.streamlit.components import ComponentOptions, KiaraComponent
 from kiara_plugin.streamlit.components.models import (
     create_recursive_table_from_model_object,
 )
+from kiara_plugin.streamlit.defaults import (
+    DEFAULT_PREVIEW_CACHE_SIZE,
+    DEFAULT_TEXT_PREVIEW_MAX_CHARS,
+    DEFAULT_TEXT_PREVIEW_MAX_LINES,
+)
+from kiara_plugin.streamlit.utils.caching import BoundedCache
 from kiara_plugin.streamlit.utils.components import create_list_component
+from kiara_plugin.streamlit.utils.text import split_text_chunks
 
 if TYPE_CHECKING:
     from kiara_plugin.streamlit.api import KiaraStreamlitAPI
+    from kiara_plugin.streamlit.streamlit import KiaraStreamlit
 
 
 class PreviewOptions(ComponentOptions):
@@ -43,6 +52,15 @@ class PreviewComponent(KiaraComponent[PreviewOptions]):
     def get_preview_name(cls) -> str:
         return "default"
 
+    def get_option_names(self) -> List[str]:
+
+        # make sure the value is always the first positional argument, even if
+        # a subclass adds its own options
+        option_fields = super().get_option_names()
+        option_fields.remove("value")
+        option_fields.insert(0, "value")
+        return option_fields
+
     @abstractmethod
     def render_preview(self, st: "KiaraStreamlitAPI", options: PreviewOptions):
         pass
@@ -56,6 +74,19 @@ class PreviewComponent(KiaraComponent[PreviewOptions]):
         self.render_preview(st=st, options=options)
 
 
+def create_value_summary(value: Value) -> Dict[str, Any]:
+    """Collect metadata about a value that is cheap to compute (no data needs to be loaded)."""
+
+    summary: Dict[str, Any] = {
+        "type": value.data_type_name,
+        "size": humanfriendly.format_size(value.value_size) if value.is_set else None,
+        "rows": None,
+    }
+    if value.is_set and "metadata.table" in value.property_names:
+        summary["rows"] = value.get_property_data("metadata.table").table.rows
+    return summary
+
+
 class PropertiesViewOptions(ComponentOptions):
     """Options for the properties view component."""
 
@@ -68,15 +99,37 @@ class PropertiesViewComponent(KiaraComponent[PropertiesViewOptions]):
     _component_name = "display_value_properties"
     _options = PropertiesViewOptions
 
+    def __init__(
+        self, kiara_streamlit: "KiaraStreamlit", component_name: str, doc: Any = None
+    ):
+
+        super().__init__(
+            kiara_streamlit=kiara_streamlit, component_name=component_name, doc=doc
+        )
+        self._property_tables: BoundedCache[
+            Dict[str, Mapping[str, Any]]
+        ] = BoundedCache(max_items=DEFAULT_PREVIEW_CACHE_SIZE)
+
+    def get_property_tables(self, value: Value) -> Mapping[str, Mapping[str, Any]]:
+        """Return the (memoized) property tables of a value, with the property name as key."""
+
+        tables = self._property_tables.get(value.value_id)
+        if tables is None:
+            tables = {
+                prop_name: create_recursive_table_from_model_object(prop_value.data)
+                for prop_name, prop_value in value.property_values.items()
+            }
+            self._property_tables.set(value.value_id, tables)
+        return tables
+
     def _render(self, st: "KiaraStreamlitAPI", options: PropertiesViewOptions):
 
         value = self.api.get_value(value=options.value)
 
-        for prop_name, prop_value in value.property_values.items():
+        for prop_name, table_data in self.get_property_tables(value).items():
             _prop_name = prop_name.replace("metadata.", "")
             st.write(f"Metadata item: **{_prop_name}**")
 
-            table_data = create_recursive_table_from_model_object(prop_value.data)
             name_col, val_col = st.columns([1, 3])
 
             for key, value in table_data.items():
@@ -91,22 +144,66 @@ class PropertiesViewComponent(KiaraComponent[PropertiesViewOptions]):
                         val_col.write(value)
 
 
+class DefaultPreviewOptions(PreviewOptions):
+
+    max_lines: int = Field(
+        description="The number of lines to display at once, more can be loaded on demand.",
+        default=DEFAULT_TEXT_PREVIEW_MAX_LINES,
+    )
+    max_chars: int = Field(
+        description="The number of characters to display at once, more can be loaded on demand.",
+        default=DEFAULT_TEXT_PREVIEW_MAX_CHARS,
+    )
+
+
 class DefaultPreviewComponent(PreviewComponent):
-    """The default preview component, will render a preview component dependent on the data type of the provided value."""
+    """The default preview component, will render a preview component dependent on the data type of the provided value.
+
+    If no preview component exists for the data type, the value is rendered as text. Only the first lines of that text are displayed, more can be loaded on demand.
+    """
 
     _component_name = "preview"
+    _options = DefaultPreviewOptions  # type: ignore
     _examples = [
         {"doc": "Preview a table value.", "args": {"value": "nodes_table"}},
     ]
 
+    def __init__(
+        self, kiara_streamlit: "KiaraStreamlit", component_name: str, doc: Any = None
+    ):
+
+        super().__init__(
+            kiara_streamlit=kiara_streamlit, component_name=component_name, doc=doc
+        )
+        self._rendered_chunks: BoundedCache[List[str]] = BoundedCache(
+            max_items=DEFAULT_PREVIEW_CACHE_SIZE
+        )
+
     @classmethod
     def get_data_type(cls) -> str:
         return "any"
 
+    def get_rendered_chunks(
+        self, value: Value, max_lines: int, max_chars: int
+    ) -> List[str]:
+        """Return the text rendering of a value, split into chunks that fit into the line/character budget."""
+
+        cache_key = (value.value_id, max_lines, max_chars)
+        chunks = self._rendered_chunks.get(cache_key)
+        if chunks is None:
+            renderable = self.api.render_value(
+                value=value, target_format="string", use_pretty_print=True
+            )
+            chunks = split_text_chunks(
+                str(renderable), max_lines=max_lines, max_chars=max_chars
+            )
+            self._rendered_chunks.set(cache_key, chunks)
+        return chunks
+
     def render_preview(
         self,
         st: "KiaraStreamlitAPI",
-        options: PreviewOptions,
+        options: DefaultPreviewOptions,  # type: ignore
     ):
 
         preview_name = options.display_style
@@ -122,25 +219,63 @@ class DefaultPreviewComponent(PreviewComponent):
         component = self._kiara_streamlit.get_preview_component(
             data_type=_value.data_type_name, preview_name=preview_name
         )
+        render_args = {}
+        if component is None and preview_name != "default":
+            # the default preview component of a data type might support the display style itself
+            component = self._kiara_streamlit.get_preview_component(
+                data_type=_value.data_type_name
+            )
+            render_args["display_style"] = preview_name
+
         if component is not None:
-            component.render_func(st)(value=_value, key=options.create_key("preview"))
+            component.render_func(st)(
+                value=_value, key=options.create_key("preview"), **render_args
+            )
         else:
             if isinstance(options.value, Value):
                 name = str(_value.value_id)
             else:
                 name = str(options.value)
 
-            renderable = self.api.render_value(
-                value=_value, target_format="string", use_pretty_print=True
+            chunks = self.get_rendered_chunks(
+                _value, max_lines=options.max_lines, max_chars=options.max_chars
+            )
+            num_chunks = self.get_session_var(
+                options, "preview", str(_value.value_id), "chunks", default=1
             )
             st.text_area(
                 f"Value: {name}",
-                value=renderable,
+                value="".join(chunks[0:num_chunks]),
                 disabled=True,
                 height=height,
-                key=options.create_key("preview", "default"),
+                key=options.create_key(
+                    "preview", "default", str(_value.value_id), str(num_chunks)
+                ),
             )
 
+            if num_chunks < len(chunks):
+                remaining_lines = sum(
+                    chunk.count("\n") for chunk in chunks[num_chunks:]
+                )
+                info_col, button_col = st.columns([5, 1])
+                info_col.caption(f"{remaining_lines} more lines")
+
+                def _load_more():
+                    self.set_session_var(
+                        options,
+                        "preview",
+                        str(_value.value_id),
+                        "chunks",
+                        value=num_chunks + 1,
+                    )
+
+                button_col.button(
+                    "Load more",
+                    key=options.create_key("preview", "load_more"),
+                    on_click=_load_more,
+                    use_container_width=True,
+                )
+
 
 class PreviewListOptions(ComponentOptions):
 
@@ -165,7 +300,7 @@ class ValueList(KiaraComponent[PreviewListOptions]):
             else:
                 data_types.extend(options.data_types)
 
-        values = self.api.list_aliases(data_types=data_types)
+        values = self.kiara_streamlit.list_aliases(data_types=data_types)
 
         _key = options.create_key("value_list")
         selected_alias: Union[str, None] = create_list_component(
@@ -202,8 +337,9 @@ class ValueListPreview(KiaraComponent[PreviewListOptions]):
             if component is None:
                 component = self.kiara_streamlit.get_preview_component("any")
 
-            pr_opts = PreviewOptions(key=options.create_key("preview"), value=value)
-            component.render_preview(preview_column, options=pr_opts)  # type: ignore
+            component.render_func(preview_column)(
+                value=value, key=options.create_key("preview")
+            )
 
         return selected_alias
 
@@ -217,6 +353,10 @@ class ValueMapPreviewOptions(ComponentOptions):
     add_save_option: bool = Field(
         description="Whether to add a save option for every value.", default=False
     )
+    field_selector: str = Field(
+        description="How to select the field to preview: 'tabs' (renders the previews of all fields), or 'select' (only renders the preview of the selected field, and a metadata summary for all others).",
+        default="tabs",
+    )
     value_map: Mapping[str, Union[str, uuid.UUID, Value]] = Field(
         description="The values to display."
     )
@@ -227,6 +367,57 @@ class ValueMapPreview(KiaraComponent[ValueMapPreviewOptions]):
     _component_name = "value_map_preview"
     _options = ValueMapPreviewOptions
 
+    def render_field(
+        self,
+        st: "KiaraStreamlitAPI",
+        idx: int,
+        field: str,
+        value: Value,
+        options: ValueMapPreviewOptions,
+    ) -> None:
+
+        if not value.is_set:
+            st.markdown("-- value not set --")
+            return
+
+        component = self.kiara_streamlit.get_preview_component(value.data_type_name)
+        if component is None:
+            component = self.kiara_streamlit.get_preview_component("any")
+
+        if options.add_save_option:
+            center, right = st.columns([4, 1])
+        else:
+            center = st
+            right = None
+
+        _key = options.create_key("preview", f"{idx}_{field}")
+        component.render_func(center)(value=value, key=_key)  # type: ignore
+
+        if options.add_save_option:
+            assert right is not None
+            right.write("Save value")
+            with right.form(key=options.create_key("save_form", f"{idx}_{field}")):
+                _key = options.create_key("alias", f"{idx}_{field}")
+                alias = self._st.text_input(
+                    "alias",
+                    value="",
+                    key=_key,
+                    placeholder="alias",
+                    label_visibility="hidden",
+                )
+                # _key = options.create_key("save", f"{idx}_{field}")
+                save = self._st.form_submit_button("Save")
+
+            if save and alias:
+                store_result = self.kiara_streamlit.store_value(
+                    value=value, alias=alias, allow_overwrite=False
+                )
+                if store_result.error:
+                    right.error(store_result.error)
+                else:
+                    right.success("Value saved")
+                    self._st.rerun()
+
     def _render(
         self,
         st: "KiaraStreamlitAPI",
@@ -240,6 +431,28 @@ class ValueMapPreview(KiaraComponent[ValueMapPreviewOptions]):
         _values = self.api.assemble_value_map(options.value_map)
 
         field_names = sorted(_values.keys())
+
+        if options.field_selector == "select":
+            summary: Dict[str, List[Any]] = {"field": []}
+            for field in field_names:
+                summary["field"].append(field)
+                for k, v in create_value_summary(_values[field]).items():
+                    summary.setdefault(k, []).append(v)
+            st.dataframe(summary, use_container_width=True, hide_index=True)
+
+            selected_field = st.selectbox(
+                label="Field",
+                options=field_names,
+                key=options.create_key("selected_field"),
+            )
+            idx = field_names.index(selected_field)
+            self.render_field(
+                st, idx, selected_field, _values[selected_field], options=options
+            )
+            return _values
+        elif options.field_selector != "tabs":
+            raise Exception(f"Invalid field selector: {options.field_selector}")
+
         if not options.add_value_types:
             tab_names = field_names
         else:
@@ -249,52 +462,6 @@ class ValueMapPreview(KiaraComponent[ValueMapPreviewOptions]):
 
         tabs = st.tabs(tab_names)
         for idx, field in enumerate(field_names):
-
-            value = _values[field]
-            if not value.is_set:
-                tabs[idx].markdown("-- value not set --")
-            else:
-                component = self.kiara_streamlit.get_preview_component(
-                    value.data_type_name
-                )
-                if component is None:
-                    component = self.kiara_streamlit.get_preview_component("any")
-
-                if options.add_save_option:
-                    center, right = tabs[idx].columns([4, 1])
-                else:
-                    center = tabs[idx]
-                    right = None
-
-                _key = options.create_key("preview", f"{idx}_{field}")
-                preview_opts = PreviewOptions(key=_key, value=value)
-                component.render_preview(st=center, options=preview_opts)  # type: ignore
-
-                if options.add_save_option:
-                    assert right is not None
-                    right.write("Save value")
-                    with right.form(
-                        key=options.create_key("save_form", f"{idx}_{field}")
-                    ):
-                        _key = options.create_key("alias", f"{idx}_{field}")
-                        alias = self._st.text_input(
-                            "alias",
-                            value="",
-                            key=_key,
-                            placeholder="alias",
-                            label_visibility="hidden",
-                        )
-                        # _key = options.create_key("save", f"{idx}_{field}")
-                        save = self._st.form_submit_button("Save")
-
-                    if save and alias:
-                        store_result = self.api.store_value(
-                            value=value, alias=alias, allow_overwrite=False
-                        )
-                        if store_result.error:
-                            right.error(store_result.error)
-                        else:
-                            right.success("Value saved")
-                            st.rerun()
+            self.render_field(tabs[idx], idx, field, _values[field], options=options)
 
         return _values
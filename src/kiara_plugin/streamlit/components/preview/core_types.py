@@ -1,20 +1,138 @@
 # -*- coding: utf-8 -*-
-from typing import TYPE_CHECKING, Any, Dict
+import math
+from typing import TYPE_CHECKING, Any, Dict, List, Union
 
 import humanfriendly
 import streamlit_scrollable_textbox as stx
+from pydantic import Field
 
+from kiara.api import Value
 from kiara.models.data_types import KiaraDict
 from kiara.models.filesystem import KiaraFile, KiaraFileBundle
 from kiara.utils.json import orjson_dumps
 from kiara_plugin.core_types.models import KiaraList
 from kiara_plugin.streamlit.components.preview import PreviewComponent, PreviewOptions
+from kiara_plugin.streamlit.defaults import (
+    DEFAULT_FILE_PREVIEW_MAX_BYTES,
+    DEFAULT_FILE_PREVIEW_MAX_LINES,
+    DEFAULT_LISTING_PAGE_SIZE,
+    DEFAULT_PREVIEW_CACHE_SIZE,
+    DEFAULT_TREE_PREVIEW_MAX_DEPTH,
+    DEFAULT_TREE_PREVIEW_MAX_ITEMS,
+    DEFAULT_TREE_PREVIEW_MAX_JSON_SIZE,
+    NO_VALUE_MARKER,
+)
+from kiara_plugin.streamlit.utils.caching import BoundedCache
+from kiara_plugin.streamlit.utils.files import (
+    aggregate_file_listing,
+    create_file_bundle_listing,
+    filter_file_listing,
+    is_binary_file,
+    read_file_preview,
+)
+from kiara_plugin.streamlit.utils.trees import (
+    create_tree_preview_json,
+    get_tree_node,
+    list_expandable_children,
+)
 
 if TYPE_CHECKING:
+    import pyarrow as pa
+
     from kiara_plugin.streamlit.api import KiaraStreamlitAPI
+    from kiara_plugin.streamlit.streamlit import KiaraStreamlit
+
+
+class NestedDataPreviewOptions(PreviewOptions):
+
+    max_depth: int = Field(
+        description="The number of nesting levels to render, deeper nodes can be expanded on demand.",
+        default=DEFAULT_TREE_PREVIEW_MAX_DEPTH,
+    )
+    max_items: int = Field(
+        description="The maximum number of items to render per container.",
+        default=DEFAULT_TREE_PREVIEW_MAX_ITEMS,
+    )
+    max_json_size: int = Field(
+        description="The maximum size (in characters) of the rendered json data.",
+        default=DEFAULT_TREE_PREVIEW_MAX_JSON_SIZE,
+    )
+
+
+class NestedDataPreview(PreviewComponent):
+    """Base class for previews of (potentially large) nested data structures.
 
+    Only the top levels of the data, and the first items of each container are rendered. Users can navigate into deeper nodes, which are then rendered the same way.
+    """
+
+    _options = NestedDataPreviewOptions  # type: ignore
+
+    def render_tree(
+        self,
+        st: "KiaraStreamlitAPI",
+        data: Any,
+        options: NestedDataPreviewOptions,
+        name: str,
+    ) -> None:
+
+        path: List[str] = self.get_session_var(
+            options, "tree", name, "path", default=[]
+        )
+        try:
+            node = get_tree_node(data, path)
+        except (KeyError, IndexError, ValueError):
+            path = []
+            node = data
+
+        if path:
+            path_col, up_col = st.columns([5, 1])
+
+            def _go_up():
+                self.set_session_var(options, "tree", name, "path", value=path[0:-1])
+
+            path_col.caption(" > ".join(["root", *(str(x) for x in path)]))
+            up_col.button(
+                "Up",
+                key=options.create_key("tree", name, "up"),
+                on_click=_go_up,
+                use_container_width=True,
+            )
 
-class DictPreview(PreviewComponent):
+        children = list_expandable_children(node, max_items=options.max_items)
+        if children:
+            select_key = options.create_key("tree", name, "expand")
+
+            def _expand():
+                selected = self._session_state[select_key]
+                if selected != NO_VALUE_MARKER:
+                    self.set_session_var(
+                        options, "tree", name, "path", value=[*path, selected]
+                    )
+                self._session_state[select_key] = NO_VALUE_MARKER
+
+            st.selectbox(
+                label="Expand node",
+                options=[NO_VALUE_MARKER, *(str(x) for x in children)],
+                key=select_key,
+                on_change=_expand,
+            )
+
+        try:
+            json_str, fits = create_tree_preview_json(
+                node,
+                max_depth=options.max_depth,
+                max_items=options.max_items,
+                max_json_size=options.max_json_size,
+            )
+        except Exception as e:
+            json_str, fits = orjson_dumps(f"Error parsing data: {e}"), True
+        st.json(json_str)
+
+        if not fits:
+            st.caption("Data too large to render, select a node to expand instead.")
+
+
+class DictPreview(NestedDataPreview):
     """Preview a value of type 'dict'."""
 
     _component_name = "preview_dict"
@@ -23,27 +141,20 @@ class DictPreview(PreviewComponent):
     def get_data_type(cls) -> str:
         return "dict"
 
-    def render_preview(self, st: "KiaraStreamlitAPI", options: PreviewOptions) -> None:
+    def render_preview(
+        self, st: "KiaraStreamlitAPI", options: NestedDataPreviewOptions
+    ) -> None:
 
         _value = self.api.get_value(options.value)
         dict_data: KiaraDict = _value.data
 
         data, schema = st.tabs(["Data", "Schema"])
 
-        try:
-            json_str = orjson_dumps(dict_data.dict_data)
-        except Exception as e:
-            json_str = f"Error parsing data: {e}"
-        data.json(json_str)
-
-        try:
-            json_str = orjson_dumps(dict_data.data_schema)
-        except Exception as e:
-            json_str = f"Error parsing schema: {e}"
-        schema.json(json_str)
+        self.render_tree(data, dict_data.dict_data, options=options, name="data")
+        self.render_tree(schema, dict_data.data_schema, options=options, name="schema")
 
 
-class ListPreview(PreviewComponent):
+class ListPreview(NestedDataPreview):
     """Preview a value of type 'list'."""
 
     _component_name = "preview_list"
@@ -52,87 +163,138 @@ class ListPreview(PreviewComponent):
     def get_data_type(cls) -> str:
         return "list"
 
-    def render_preview(self, st: "KiaraStreamlitAPI", options: PreviewOptions) -> None:
+    def render_preview(
+        self, st: "KiaraStreamlitAPI", options: NestedDataPreviewOptions
+    ) -> None:
 
         _value = self.api.get_value(options.value)
         list_data: KiaraList = _value.data
 
         data, schema = st.tabs(["Data", "Schema"])
 
-        try:
-            json_str = orjson_dumps(list_data.list_data)
-        except Exception as e:
-            json_str = f"Error parsing data: {e}"
-        data.json(json_str)
-
-        try:
-            json_str = orjson_dumps(list_data.item_schema)
-        except Exception as e:
-            json_str = f"Error parsing schema: {e}"
-        schema.json(json_str)
-
-
-class FileBundlePreview(PreviewComponent):
-    """Preview a value of type 'file_bundle'."""
-
-    _component_name = "preview_file_bundle"
-
-    @classmethod
-    def get_data_type(cls) -> str:
-        return "file_bundle"
+        self.render_tree(data, list_data.list_data, options=options, name="data")
+        self.render_tree(schema, list_data.item_schema, options=options, name="schema")
+
+
+def render_file_content(
+    st: "KiaraStreamlitAPI",
+    file_model: KiaraFile,
+    key: str,
+    max_bytes: int,
+    max_lines: int,
+    binary: Union[bool, None] = None,
+) -> None:
+    """Render a (paged) preview of the content of a file, only reading the parts that are displayed."""
+
+    if binary is None:
+        binary = is_binary_file(file_model.path)
+
+    section = st.radio(
+        label="Show",
+        options=["head", "tail", "range"],
+        key=f"{key}_section",
+        horizontal=True,
+        label_visibility="collapsed",
+    )
+
+    if section == "range":
+        if binary:
+            page_size = min(max_bytes, max_lines * 16)
+        else:
+            page_size = max_bytes
+        num_pages = max(1, math.ceil(file_model.size / page_size))
+        page = st.number_input(
+            label=f"Page (of {num_pages}, {humanfriendly.format_size(page_size)} each)",
+            min_value=1,
+            max_value=num_pages,
+            step=1,
+            key=f"{key}_page",
+        )
+        content, truncated = read_file_preview(
+            file_model.path,
+            section="range",
+            offset=(int(page) - 1) * page_size,
+            max_bytes=page_size,
+            max_lines=-1,
+            binary=binary,
+        )
+    else:
+        content, truncated = read_file_preview(
+            file_model.path,
+            section=section,  # type: ignore
+            max_bytes=max_bytes,
+            max_lines=max_lines,
+            binary=binary,
+        )
 
-    def render_preview(self, st: "KiaraStreamlitAPI", options: PreviewOptions) -> None:
+    stx.scrollableTextbox(content, height=150, fontFamily="monospace", key=key)
+    if binary:
+        st.caption(
+            f"Binary file ({humanfriendly.format_size(file_model.size)}), showing hex dump."
+        )
+    elif truncated:
+        st.caption(
+            f"Preview truncated, file size: {humanfriendly.format_size(file_model.size)}."
+        )
 
-        _value = self.api.get_value(options.value)
-        bundle: KiaraFileBundle = _value.data
 
-        table: Dict[str, Any] = {}
-        for file_path, file_info in bundle.included_files.items():
-            table.setdefault("path", []).append(file_path)
-            table.setdefault("size", []).append(file_info.size)
-            table.setdefault("mime-type", []).append(file_info.mime_type)
+class FilePreviewOptions(PreviewOptions):
 
-        st.dataframe(table, use_container_width=True, hide_index=True)
+    max_bytes: int = Field(
+        description="The maximum number of bytes to read from the file for the preview.",
+        default=DEFAULT_FILE_PREVIEW_MAX_BYTES,
+    )
+    max_lines: int = Field(
+        description="The maximum number of lines to display (rows of 16 bytes for binary files).",
+        default=DEFAULT_FILE_PREVIEW_MAX_LINES,
+    )
 
 
 class FilePreview(PreviewComponent):
-    """Preview a value of type 'file'."""
+    """Preview a value of type 'file'.
+
+    Only the parts of the file that are displayed are read (via a memory map), so this also works for very large files. Binary files are displayed as hex dump.
+    """
 
     _component_name = "preview_file"
+    _options = FilePreviewOptions  # type: ignore
     _examples = [{"doc": "A file preview.", "args": {"value": "nodes_file"}}]
 
     @classmethod
     def get_data_type(cls) -> str:
         return "file"
 
-    def render_preview(self, st: "KiaraStreamlitAPI", options: PreviewOptions) -> None:
+    def render_preview(
+        self, st: "KiaraStreamlitAPI", options: FilePreviewOptions
+    ) -> None:
 
         _value = self.api.get_value(options.value)
         file_model: KiaraFile = _value.data
 
         _key = options.create_key("file", "preview", file_model.path)
 
+        binary = is_binary_file(file_model.path)
+
         if options.display_style == "default":
-            # TODO: check if binary file?
-            max_lines = 100
-            with open(file_model.path, "rt") as f:
-                if max_lines <= 0:
-                    content = f.read()
-                else:
-                    lines = []
-                    idx = 0
-                    while idx < max_lines:
-                        lines.append(f.readline())
-                        idx += 1
-
-                    if idx >= max_lines:
-                        lines.append("...\n")
-                        lines.append("...")
-                    content = "".join(lines)
-            stx.scrollableTextbox(content, height=150, fontFamily="monospace", key=_key)
+            render_file_content(
+                st,
+                file_model=file_model,
+                key=_key,
+                max_bytes=options.max_bytes,
+                max_lines=options.max_lines,
+                binary=binary,
+            )
 
         elif options.display_style == "metadata":
 
+            content, _ = read_file_preview(
+                file_model.path,
+                section="head",
+                max_bytes=options.max_bytes,
+                max_lines=options.max_lines,
+                binary=binary,
+            )
+
             table: Dict[str, Any] = {"key": [], "value": []}
             table["key"].append("path")
             table["value"].append(file_model.path)
@@ -141,7 +303,7 @@ class FilePreview(PreviewComponent):
             table["key"].append("mime-type")
             table["value"].append(file_model.mime_type)
             table["key"].append("content")
-            table["value"].append(file_model.read_text())
+            table["value"].append(content)
             st.dataframe(table, hide_index=True)
         else:
             raise Exception(
@@ -150,6 +312,122 @@ class FilePreview(PreviewComponent):
         # st.table(table, use_container_width=True)
 
 
+class FileBundlePreviewOptions(FilePreviewOptions):
+
+    page_size: int = Field(
+        description="The number of files to list per page.",
+        default=DEFAULT_LISTING_PAGE_SIZE,
+    )
+
+
+class FileBundlePreview(PreviewComponent):
+    """Preview a value of type 'file_bundle'.
+
+    The file listing is created once per bundle (as an Arrow table), and can be filtered by path (substring, or glob pattern) and paged through. A summary per mime-type is computed from the filtered listing. The content of a single selected file can be previewed, only that file is read.
+    """
+
+    _component_name = "preview_file_bundle"
+    _options = FileBundlePreviewOptions  # type: ignore
+
+    def __init__(
+        self, kiara_streamlit: "KiaraStreamlit", component_name: str, doc: Any = None
+    ):
+
+        super().__init__(
+            kiara_streamlit=kiara_streamlit, component_name=component_name, doc=doc
+        )
+        self._listings: BoundedCache["pa.Table"] = BoundedCache(
+            max_items=DEFAULT_PREVIEW_CACHE_SIZE
+        )
+
+    @classmethod
+    def get_data_type(cls) -> str:
+        return "file_bundle"
+
+    def get_listing(self, value: Value) -> "pa.Table":
+        """Return the (cached) file listing for a file bundle value."""
+
+        listing = self._listings.get(value.value_id)
+        if listing is None:
+            bundle: KiaraFileBundle = value.data
+            listing = create_file_bundle_listing(bundle)
+            self._listings.set(value.value_id, listing)
+        return listing
+
+    def render_preview(
+        self, st: "KiaraStreamlitAPI", options: FileBundlePreviewOptions
+    ) -> None:
+
+        import pyarrow.compute as pc
+
+        _value = self.api.get_value(options.value)
+        listing = self.get_listing(_value)
+
+        _key = options.create_key("file_bundle", "preview", str(_value.value_id))
+
+        pattern = st.text_input(
+            label="Filter",
+            placeholder="Filter by path, e.g. 'data/' or '*.csv'",
+            key=f"{_key}_filter",
+            label_visibility="collapsed",
+        )
+        filtered = filter_file_listing(listing, pattern)
+
+        num_files = filtered.num_rows
+        page_size = max(1, options.page_size)
+        num_pages = max(1, math.ceil(num_files / page_size))
+        if num_pages > 1:
+            page = st.number_input(
+                label=f"Page (of {num_pages})",
+                min_value=1,
+                max_value=num_pages,
+                step=1,
+                key=f"{_key}_page",
+            )
+        else:
+            page = 1
+        page_listing = filtered.slice((int(page) - 1) * page_size, page_size)
+
+        st.dataframe(
+            page_listing.to_pydict(),
+            use_container_width=True,
+            hide_index=True,
+            height=options.height,
+        )
+        total_size = pc.sum(filtered.column("size")).as_py() or 0
+        st.caption(
+            f"{num_files} of {listing.num_rows} files, {humanfriendly.format_size(total_size)}"
+        )
+
+        with st.expander("Summary by mime-type"):
+            st.dataframe(
+                aggregate_file_listing(filtered)
+                .rename_columns(["mime-type", "files", "total size", "average size"])
+                .to_pydict(),
+                use_container_width=True,
+                hide_index=True,
+            )
+
+        file_paths = page_listing.column("path").to_pylist()
+        if not file_paths:
+            return
+
+        selected = st.selectbox(
+            label="Preview file",
+            options=[NO_VALUE_MARKER, *file_paths],
+            key=f"{_key}_selected",
+        )
+        if selected and selected != NO_VALUE_MARKER:
+            bundle: KiaraFileBundle = _value.data
+            render_file_content(
+                st,
+                file_model=bundle.included_files[selected],
+                key=f"{_key}_file_{selected}",
+                max_bytes=options.max_bytes,
+                max_lines=options.max_lines,
+            )
+
+
 class BooleanPreview(PreviewComponent):
     """Preview a value of type 'boolean'."""
 
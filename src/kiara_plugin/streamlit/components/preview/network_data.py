@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+from typing import TYPE_CHECKING, Any, Dict, Literal, Mapping, Union
+
+from pydantic import Field
+
+from kiara.api import Value
+from kiara_plugin.streamlit.components.preview import PreviewComponent, PreviewOptions
+from kiara_plugin.streamlit.defaults import (
+    DEFAULT_LISTING_PAGE_SIZE,
+    DEFAULT_NETWORK_SAMPLE_MAX_EDGES,
+    DEFAULT_NETWORK_SAMPLE_MAX_NODES,
+    DEFAULT_PREVIEW_CACHE_SIZE,
+)
+from kiara_plugin.streamlit.utils.caching import BoundedCache
+from kiara_plugin.streamlit.utils.networks import (
+    LABEL_COLUMN_NAMES,
+    NODE_ID_COLUMN_NAMES,
+    SAMPLE_STRATEGIES,
+    NetworkIndex,
+    NetworkSample,
+    create_dot_graph,
+    find_column,
+)
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+    from kiara_plugin.streamlit.api import KiaraStreamlitAPI
+    from kiara_plugin.streamlit.streamlit import KiaraStreamlit
+
+
+SAMPLE_STRATEGY_LABELS = {
+    "top_degree": "Top-degree nodes",
+    "k_hop": "K-hop neighborhood",
+    "random_walk": "Random walk",
+}
+
+
+class NetworkDataPreviewOptions(PreviewOptions):
+
+    sample_strategy: Literal["top_degree", "k_hop", "random_walk"] = Field(
+        description="The (initial) strategy to sample the rendered subgraph.",
+        default="top_degree",
+    )
+    max_nodes: int = Field(
+        description="The maximum number of nodes to render.",
+        default=DEFAULT_NETWORK_SAMPLE_MAX_NODES,
+    )
+    max_edges: int = Field(
+        description="The maximum number of edges to render.",
+        default=DEFAULT_NETWORK_SAMPLE_MAX_EDGES,
+    )
+    hops: int = Field(
+        description="The (initial) number of hops for the 'k_hop' sample strategy.",
+        default=2,
+    )
+
+
+class NetworkDataPreview(PreviewComponent):
+    """Preview a value of type 'network_data'.
+
+    Graph-level statistics are computed once per value. The rendered graph is a bounded sample of the network (the nodes with the highest degree, the k-hop neighborhood of a node, or the nodes visited by a random walk), so the preview stays fast independent of the network size.
+
+    This is registered as the 'sampled' preview: it is the default preview for 'network_data' values only if no other plugin (e.g. 'kiara_plugin.network_analysis') registers a 'default' one.
+    """
+
+    _component_name = "preview_network_data_sampled"
+    _options = NetworkDataPreviewOptions  # type: ignore
+
+    def __init__(
+        self, kiara_streamlit: "KiaraStreamlit", component_name: str, doc: Any = None
+    ):
+
+        super().__init__(
+            kiara_streamlit=kiara_streamlit, component_name=component_name, doc=doc
+        )
+        self._indexes: BoundedCache[NetworkIndex] = BoundedCache(
+            max_items=DEFAULT_PREVIEW_CACHE_SIZE
+        )
+        self._summaries: BoundedCache[Dict[str, Any]] = BoundedCache(
+            max_items=DEFAULT_PREVIEW_CACHE_SIZE
+        )
+
+    @classmethod
+    def get_data_type(cls) -> str:
+        return "network_data"
+
+    @classmethod
+    def get_preview_name(cls) -> str:
+        return "sampled"
+
+    def get_network_tables(self, value: Value) -> Mapping[str, "pa.Table"]:
+
+        network_data = value.data
+        result = {"edges": network_data.get_table("edges").arrow_table}
+        if "nodes" in network_data.table_names:
+            result["nodes"] = network_data.get_table("nodes").arrow_table
+        return result
+
+    def get_network_index(self, value: Value) -> NetworkIndex:
+        """Return the (cached) adjacency index for a network data value."""
+
+        index = self._indexes.get(value.value_id)
+        if index is None:
+            tables = self.get_network_tables(value)
+            index = NetworkIndex(edges=tables["edges"], nodes=tables.get("nodes"))
+            self._indexes.set(value.value_id, index)
+        return index
+
+    def get_network_summary(self, value: Value) -> Dict[str, Any]:
+        """Return the (cached) graph-level statistics for a network data value."""
+
+        summary = self._summaries.get(value.value_id)
+        if summary is None:
+            summary = self.get_network_index(value).create_summary()
+            self._summaries.set(value.value_id, summary)
+        return summary
+
+    def get_node_labels(
+        self, value: Value, sample: NetworkSample
+    ) -> Union[None, Dict[Any, str]]:
+
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        nodes = self.get_network_tables(value).get("nodes", None)
+        if nodes is None or not sample.nodes:
+            return None
+
+        id_column = find_column(nodes, NODE_ID_COLUMN_NAMES, required=False)
+        label_column = find_column(nodes, LABEL_COLUMN_NAMES, required=False)
+        if not id_column or not label_column:
+            return None
+
+        ids = nodes.column(id_column)
+        mask = pc.is_in(ids, value_set=pa.array(sample.nodes, type=ids.type))
+        matches = nodes.filter(mask).select([id_column, label_column])
+        return {
+            node_id: str(label)
+            for node_id, label in zip(
+                matches.column(id_column).to_pylist(),
+                matches.column(label_column).to_pylist(),
+            )
+            if label is not None
+        }
+
+    def render_summary(self, st: "KiaraStreamlitAPI", summary: Mapping[str, Any]):
+
+        stats: Dict[str, list] = {"statistic": [], "value": []}
+        for stat, stat_value in summary.items():
+            if stat == "top_degree_nodes":
+                continue
+            stats["statistic"].append(stat.replace("_", " "))
+            if isinstance(stat_value, float):
+                stats["value"].append(f"{stat_value:.4g}")
+            else:
+                stats["value"].append(str(stat_value))
+        st.dataframe(stats, use_container_width=True, hide_index=True)
+
+    def render_sample(
+        self,
+        st: "KiaraStreamlitAPI",
+        value: Value,
+        options: NetworkDataPreviewOptions,
+    ):
+
+        index = self.get_network_index(value)
+        summary = self.get_network_summary(value)
+        seed_candidates = summary["top_degree_nodes"]
+
+        _key = options.create_key("network_data", "sample", str(value.value_id))
+
+        strategy_col, seed_col, param_col = st.columns([2, 2, 1])
+        strategy = strategy_col.radio(
+            label="Sample",
+            options=SAMPLE_STRATEGIES,
+            index=SAMPLE_STRATEGIES.index(options.sample_strategy),
+            format_func=lambda x: SAMPLE_STRATEGY_LABELS[x],
+            horizontal=True,
+            key=f"{_key}_strategy",
+        )
+
+        if strategy == "top_degree":
+            sample = index.sample_top_degree(
+                max_nodes=options.max_nodes, max_edges=options.max_edges
+            )
+        elif not seed_candidates:
+            sample = NetworkSample(
+                nodes=[], edges=index.edges.slice(0, 0), truncated=False
+            )
+        else:
+            seed = seed_col.selectbox(
+                label="Start node (highest degree)",
+                options=seed_candidates,
+                key=f"{_key}_seed",
+            )
+            if strategy == "k_hop":
+                hops = param_col.number_input(
+                    label="Hops",
+                    min_value=1,
+                    max_value=10,
+                    value=options.hops,
+                    key=f"{_key}_hops",
+                )
+                sample = index.sample_k_hop(
+                    seed,
+                    hops=int(hops),
+                    max_nodes=options.max_nodes,
+                    max_edges=options.max_edges,
+                )
+            else:
+                walk = self.get_session_var(
+                    options, "network_data", str(value.value_id), "walk", default=0
+                )
+
+                def _resample():
+                    self.set_session_var(
+                        options,
+                        "network_data",
+                        str(value.value_id),
+                        "walk",
+                        value=walk + 1,
+                    )
+
+                param_col.button(
+                    "Resample",
+                    key=f"{_key}_resample",
+                    on_click=_resample,
+                    use_container_width=True,
+                )
+                sample = index.sample_random_walk(
+                    seed,
+                    max_nodes=options.max_nodes,
+                    max_edges=options.max_edges,
+                    random_seed=f"{value.value_id}_{seed}_{walk}",
+                )
+
+        if not sample.nodes:
+            st.write("No edges available.")
+            return
+
+        dot = create_dot_graph(
+            sample,
+            source_column=index.source_column,
+            target_column=index.target_column,
+            labels=self.get_node_labels(value, sample),
+        )
+        st.graphviz_chart(dot, use_container_width=True)
+
+        msg = f"Showing {len(sample.nodes)} of {summary['num_nodes']} nodes and {sample.edges.num_rows} of {summary['num_edges']} edges."
+        if sample.truncated:
+            msg = f"{msg} The sample was truncated (max. {options.max_nodes} nodes, {options.max_edges} edges)."
+        st.caption(msg)
+
+    def render_table_head(
+        self, st: "KiaraStreamlitAPI", table: "pa.Table", options: PreviewOptions
+    ):
+
+        head = table.slice(0, DEFAULT_LISTING_PAGE_SIZE)
+        st.dataframe(
+            head.to_pandas(),
+            use_container_width=True,
+            hide_index=True,
+            height=options.height,
+        )
+        if table.num_rows > head.num_rows:
+            st.caption(f"Showing the first {head.num_rows} of {table.num_rows} rows.")
+
+    def render_preview(
+        self, st: "KiaraStreamlitAPI", options: NetworkDataPreviewOptions
+    ) -> None:
+
+        _value = self.api.get_value(options.value)
+        tables = self.get_network_tables(_value)
+
+        tab_names = ["Graph", "Summary", "Edges"]
+        if "nodes" in tables.keys():
+            tab_names.append("Nodes")
+        tabs = st.tabs(tab_names)
+
+        with tabs[0]:
+            self.render_sample(tabs[0], value=_value, options=options)
+        with tabs[1]:
+            self.render_summary(tabs[1], self.get_network_summary(_value))
+        with tabs[2]:
+            self.render_table_head(tabs[2], tables["edges"], options=options)
+        if "nodes" in tables.keys():
+            with tabs[3]:
+                self.render_table_head(tabs[3], tables["nodes"], options=options)
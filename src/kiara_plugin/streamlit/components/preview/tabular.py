@@ -1,66 +1,507 @@
 # -*- coding: utf-8 -*-
-from typing import TYPE_CHECKING
+import math
+import uuid
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Tuple, Union
 
+from pydantic import Field
+
+from kiara.api import Value
+from kiara.exceptions import KiaraException
 from kiara_plugin.streamlit.components.preview import PreviewComponent, PreviewOptions
+from kiara_plugin.streamlit.defaults import (
+    DEFAULT_LISTING_PAGE_SIZE,
+    DEFAULT_PREVIEW_CACHE_SIZE,
+)
+from kiara_plugin.streamlit.utils.arrays import (
+    compute_numeric_summary,
+    get_array_window,
+    is_numeric_array,
+)
+from kiara_plugin.streamlit.utils.caching import BoundedCache
+from kiara_plugin.streamlit.utils.components import create_column_selector
+from kiara_plugin.streamlit.utils.databases import SQLiteReader, get_sqlite_reader
+from kiara_plugin.streamlit.utils.tables import (
+    FILTER_OPERATORS,
+    ColumnFilter,
+    create_filter_expression,
+    get_table_window,
+)
 from kiara_plugin.tabular.models.array import KiaraArray
 from kiara_plugin.tabular.models.db import KiaraDatabase
 from kiara_plugin.tabular.models.table import KiaraTable
 from kiara_plugin.tabular.models.tables import KiaraTables
 
 if TYPE_CHECKING:
+    import pyarrow as pa
+
     from kiara_plugin.streamlit.api import KiaraStreamlitAPI
+    from kiara_plugin.streamlit.streamlit import KiaraStreamlit
+
+NO_SORT_MARKER = "-- no sorting --"
+
+
+class ArrayPreviewOptions(PreviewOptions):
+
+    page_size: int = Field(
+        description="The number of array items to display per page.",
+        default=DEFAULT_LISTING_PAGE_SIZE,
+    )
+    num_bins: int = Field(
+        description="The number of histogram bins for numeric arrays.", default=20
+    )
 
 
 class ArrayPreview(PreviewComponent):
-    """Preview a value of type 'array'."""
+    """Preview a value of type 'array'.
+
+    Only the currently displayed window of the array is converted, (Arrow) chunks are never concatenated. Numeric arrays also get a summary with a histogram and (approximate) quantiles, computed chunk by chunk.
+    """
 
     _component_name = "preview_array"
+    _options = ArrayPreviewOptions  # type: ignore
+
+    def __init__(
+        self, kiara_streamlit: "KiaraStreamlit", component_name: str, doc: Any = None
+    ):
+
+        super().__init__(
+            kiara_streamlit=kiara_streamlit, component_name=component_name, doc=doc
+        )
+        self._summaries: BoundedCache[Dict[str, Any]] = BoundedCache(
+            max_items=DEFAULT_PREVIEW_CACHE_SIZE
+        )
 
     @classmethod
     def get_data_type(cls) -> str:
         return "array"
 
-    def render_preview(self, st: "KiaraStreamlitAPI", options: PreviewOptions):
+    def get_numeric_summary(self, value: Value, num_bins: int) -> Dict[str, Any]:
+
+        cache_key = (value.value_id, num_bins)
+        summary = self._summaries.get(cache_key)
+        if summary is None:
+            array: KiaraArray = value.data
+            summary = compute_numeric_summary(array.arrow_array, num_bins=num_bins)
+            self._summaries.set(cache_key, summary)
+        return summary
+
+    def render_summary(self, st: "KiaraStreamlitAPI", summary: Mapping[str, Any]):
+
+        stats_col, hist_col = st.columns([1, 2])
+
+        stats: Dict[str, List[Any]] = {"statistic": [], "value": []}
+        for stat in ["count", "null_count", "min", "max", "mean", "std"]:
+            stats["statistic"].append(stat)
+            stats["value"].append(summary[stat])
+        for quantile, quantile_value in summary["quantiles"].items():
+            stats["statistic"].append(f"{quantile:.0%} (approx.)")
+            stats["value"].append(quantile_value)
+        stats_col.dataframe(stats, use_container_width=True, hide_index=True)
+
+        histogram = summary["histogram"]
+        if histogram:
+            edges = histogram["bin_edges"]
+            hist_col.bar_chart(
+                {
+                    "bin": [f"{edges[idx]:.4g}" for idx in range(len(edges) - 1)],
+                    "count": histogram["counts"],
+                },
+                x="bin",
+                y="count",
+            )
+
+    def render_preview(
+        self, st: "KiaraStreamlitAPI", options: ArrayPreviewOptions
+    ) -> None:
 
         _value = self.api.get_value(options.value)
-        table: KiaraArray = _value.data
+        array: KiaraArray = _value.data
+        arrow_array = array.arrow_array
+
+        num_items = len(arrow_array)
+        page_size = max(1, options.page_size)
+        num_pages = max(1, math.ceil(num_items / page_size))
+
+        _key = options.create_key("array", "preview", str(_value.value_id))
+        if num_pages > 1:
+            page = st.number_input(
+                label=f"Page (of {num_pages})",
+                min_value=1,
+                max_value=num_pages,
+                step=1,
+                key=f"{_key}_page",
+            )
+        else:
+            page = 1
+
+        offset = (int(page) - 1) * page_size
+        values, chunk_indexes = get_array_window(
+            arrow_array, offset=offset, length=page_size
+        )
+        st.dataframe(
+            {"index": range(offset, offset + len(values)), "value": values},
+            use_container_width=True,
+            hide_index=True,
+            height=options.height,
+        )
+        if chunk_indexes:
+            chunks = ", ".join(str(x) for x in chunk_indexes)
+            st.caption(
+                f"{num_items} items of type '{arrow_array.type}' in {arrow_array.num_chunks} chunk(s), showing items from chunk(s): {chunks}"
+            )
+
+        if is_numeric_array(arrow_array):
+            with st.expander("Summary"):
+                summary = self.get_numeric_summary(_value, num_bins=options.num_bins)
+                self.render_summary(st, summary)
+
+
+class TabularPreviewOptions(PreviewOptions):
+
+    columns: Union[List[str], None] = Field(
+        description="The columns to display initially (all columns, if not specified).",
+        default=None,
+    )
 
-        st.dataframe(table.to_pandas(), use_container_width=True)
+
+class TablePreviewOptions(TabularPreviewOptions):
+
+    page_size: int = Field(
+        description="The number of rows to display per page.",
+        default=DEFAULT_LISTING_PAGE_SIZE,
+    )
 
 
 class TablePreview(PreviewComponent):
-    """Preview a value of type 'table'."""
+    """Preview a value of type 'table'.
+
+    Rows can be filtered and sorted, this happens on the underlying Arrow data, and only the displayed page of the result is converted.
+
+    Use the 'profile' display style to show per-column statistics instead of the table content. The profile is computed once per table (using the 'table.profile' module) and stored as a value in the kiara context, so it can be re-used later on.
+    """
 
     _component_name = "preview_table"
+    _options = TablePreviewOptions  # type: ignore
 
     _examples = [
         {"doc": "A table preview.", "args": {"value": "nodes_table"}},
+        {
+            "doc": "A table profile.",
+            "args": {"value": "nodes_table", "display_style": "profile"},
+        },
     ]
 
+    def __init__(
+        self, kiara_streamlit: "KiaraStreamlit", component_name: str, doc: Any = None
+    ):
+
+        super().__init__(
+            kiara_streamlit=kiara_streamlit, component_name=component_name, doc=doc
+        )
+        self._table_profiles: Dict[uuid.UUID, uuid.UUID] = {}
+
     @classmethod
     def get_data_type(cls) -> str:
         return "table"
 
-    def render_preview(self, st: "KiaraStreamlitAPI", options: PreviewOptions):
+    def get_table_profile(self, value: Value) -> Value:
+        """Return the profile value for a table value, computing (and storing) it if necessary."""
 
-        _value = self.api.get_value(options.value)
-        table: KiaraTable = _value.data
+        profile_value_id = self._table_profiles.get(value.value_id, None)
+        if profile_value_id is not None:
+            return self.api.get_value(profile_value_id)
+
+        job_id = self.api.queue_job(
+            operation="table.profile", inputs={"table": value.value_id}
+        )
+        result = self.api.context.job_registry.retrieve_result(job_id=job_id)
+        profile_value = result.get_value_obj("table_profile")
+
+        # profiles of unsaved tables are only kept in memory, so they don't end up as orphans in the data store
+        if value.is_stored:
+            store_result = self.api.store_value(profile_value, alias=None)
+            if store_result.error:
+                raise KiaraException(
+                    f"Could not store profile for table '{value.value_id}': {store_result.error}"
+                )
+            # this makes kiara find the profile for this table in future sessions
+            self.api.context.job_registry.store_job_record(job_id=job_id)
+
+        self._table_profiles[value.value_id] = profile_value.value_id
+        return profile_value
+
+    def render_profile(self, st: "KiaraStreamlitAPI", value: Value, key: str):
+
+        profile: Mapping[str, Any] = self.get_table_profile(
+            value
+        ).data.dict_data  # type: ignore
+        columns: Mapping[str, Mapping[str, Any]] = profile["columns"]
+
+        st.caption(
+            f"{profile['num_rows']} rows, {profile['num_columns']} columns",
+        )
 
-        if table:
-            st.dataframe(
-                table.to_pandas_dataframe(),
+        summary: Dict[str, Any] = {
+            "column": [],
+            "type": [],
+            "nulls": [],
+            "distinct": [],
+            "min": [],
+            "max": [],
+            "mean": [],
+            "std": [],
+        }
+        for column_name, column_profile in columns.items():
+            summary["column"].append(column_name)
+            summary["type"].append(column_profile["type"])
+            summary["nulls"].append(column_profile["null_count"])
+            summary["distinct"].append(column_profile["distinct_count"])
+            for stat in ["min", "max", "mean", "std"]:
+                stat_value = column_profile[stat]
+                summary[stat].append(None if stat_value is None else str(stat_value))
+        st.dataframe(summary, use_container_width=True, hide_index=True)
+
+        if not columns:
+            return
+
+        column_name = st.selectbox(
+            label="Column", options=list(columns.keys()), key=f"{key}_column"
+        )
+        column_profile = columns[column_name]
+
+        top_col, hist_col = st.columns([1, 1])
+        with top_col:
+            top_col.write("Most frequent values")
+            if column_profile.get("counts_truncated", False):
+                top_col.caption("Too many distinct values to count.")
+            top_values = column_profile["top_values"]
+            top_col.dataframe(
+                {
+                    "value": [str(v["value"]) for v in top_values],
+                    "count": [v["count"] for v in top_values],
+                },
                 use_container_width=True,
                 hide_index=True,
-                height=options.height,
             )
+        histogram = column_profile["histogram"]
+        if histogram:
+            with hist_col:
+                hist_col.write("Histogram")
+                edges = histogram["bin_edges"]
+                hist_col.bar_chart(
+                    {
+                        "bin": [f"{edges[idx]:.4g}" for idx in range(len(edges) - 1)],
+                        "count": histogram["counts"],
+                    },
+                    x="bin",
+                    y="count",
+                )
+
+    def render_filter_bar(
+        self,
+        st: "KiaraStreamlitAPI",
+        value: Value,
+        column_names: List[str],
+        options: TablePreviewOptions,
+    ) -> Tuple[List[ColumnFilter], Union[str, None], bool]:
+        """Render the filter & sort controls, and return the active filters and sort settings."""
+
+        session_key = ("table", str(value.value_id), "filters")
+        filters = [
+            ColumnFilter.from_dict(f)
+            for f in self.get_session_var(options, *session_key, default=[])
+        ]
+
+        _key = options.create_key("table", "filter", str(value.value_id))
+
+        def _add_filter():
+            new_filter = ColumnFilter(
+                column=self._session_state[f"{_key}_column"],
+                operator=self._session_state[f"{_key}_operator"],
+                value=self._session_state.get(f"{_key}_value", None),
+            )
+            self.set_session_var(
+                options,
+                *session_key,
+                value=[f.to_dict() for f in filters] + [new_filter.to_dict()],
+            )
+
+        def _remove_filter(idx: int):
+            remaining = [f.to_dict() for i, f in enumerate(filters) if i != idx]
+            self.set_session_var(options, *session_key, value=remaining)
+
+        column_col, operator_col, value_col, button_col = st.columns([3, 2, 3, 1])
+        column_col.selectbox("Column", column_names, key=f"{_key}_column")
+        operator_col.selectbox("Operator", FILTER_OPERATORS, key=f"{_key}_operator")
+        value_col.text_input("Value", key=f"{_key}_value")
+        button_col.button(
+            "Add",
+            key=f"{_key}_add",
+            on_click=_add_filter,
+            use_container_width=True,
+        )
+
+        for idx, column_filter in enumerate(filters):
+            filter_col, remove_col = st.columns([8, 1])
+            filter_col.write(f"`{column_filter}`")
+            remove_col.button(
+                "Remove",
+                key=f"{_key}_remove_{idx}",
+                on_click=_remove_filter,
+                args=(idx,),
+                use_container_width=True,
+            )
+
+        sort_col, order_col = st.columns([3, 1])
+        sort_column = sort_col.selectbox(
+            "Sort by",
+            [NO_SORT_MARKER, *column_names],
+            key=f"{_key}_sort",
+        )
+        descending = order_col.checkbox("Descending", key=f"{_key}_descending")
+        if sort_column == NO_SORT_MARKER:
+            sort_column = None
+
+        return filters, sort_column, descending
+
+    def render_page_selector(
+        self, st: "KiaraStreamlitAPI", key: str, num_rows: int, page_size: int
+    ) -> int:
+        """Render the page selector (if there is more than one page), and return the offset of the selected page."""
+
+        num_pages = max(1, math.ceil(num_rows / page_size))
+        if num_pages > 1:
+            page = st.number_input(
+                label=f"Page (of {num_pages})",
+                min_value=1,
+                max_value=num_pages,
+                step=1,
+                key=f"{key}_page",
+            )
+        else:
+            page = 1
+        return (int(page) - 1) * page_size
+
+    def render_table_window(
+        self, st: "KiaraStreamlitAPI", value: Value, options: TablePreviewOptions
+    ):
+
+        # a precomputed preview (if available) makes it unnecessary to load the table for the first page(s)
+        artifact = self.kiara_streamlit.get_preview_artifact(value.value_id)
+        table_head: Union[Mapping[str, Any], None] = None
+        if artifact is not None and artifact.artifact_type == "table_head":
+            table_head = artifact.data
+            column_names = list(table_head["schema"].keys())
+        else:
+            column_names = value.data.arrow_table.column_names
+
+        _key = options.create_key("table", "preview", str(value.value_id))
+        with st.expander("Columns, filter & sort"):
+            columns = create_column_selector(
+                st,
+                key=_key,
+                column_names=column_names,
+                default=options.columns,
+            )
+            filters, sort_column, descending = self.render_filter_bar(
+                st, value=value, column_names=column_names, options=options
+            )
+
+        page_size = max(1, options.page_size)
+        table: KiaraTable = value.data
+
+        arrow_table: Union["pa.Table", None] = None
+        if table_head is not None and not filters and not sort_column:
+            num_rows = table_head["num_rows"]
+        else:
+            arrow_table = table.arrow_table
+            try:
+                filter_expression = create_filter_expression(
+                    arrow_table.schema, filters
+                )
+            except ValueError as e:
+                st.error(str(e))
+                return
+
+            # only the displayed columns, and the ones needed to filter and sort are carried along
+            required_columns = set(columns)
+            required_columns.update(f.column for f in filters)
+            if sort_column:
+                required_columns.add(sort_column)
+            arrow_table = arrow_table.select(
+                [c for c in arrow_table.column_names if c in required_columns]
+            )
+
+            # only the number of matching rows is needed to render the page selector, so the filter is applied before
+            if filter_expression is not None:
+                arrow_table = arrow_table.filter(filter_expression)
+            num_rows = arrow_table.num_rows
+
+        offset = self.render_page_selector(
+            st, key=_key, num_rows=num_rows, page_size=page_size
+        )
+        end = min(offset + page_size, num_rows)
+
+        data: Any = None
+        if arrow_table is None:
+            head_rows: Mapping[str, List[Any]] = table_head["rows"]  # type: ignore
+            if end <= len(next(iter(head_rows.values()), [])):
+                data = {c: head_rows[c][offset:end] for c in columns}
+            else:
+                # the page is not part of the precomputed preview
+                arrow_table = table.arrow_table.select(columns)
+
+        if data is None:
+            window, _ = get_table_window(
+                arrow_table,  # type: ignore
+                offset=offset,
+                length=page_size,
+                sort_column=sort_column,
+                descending=descending,
+            )
+            data = window.select(columns).to_pandas()
+
+        st.dataframe(
+            data, use_container_width=True, hide_index=True, height=options.height
+        )
+
+        msg = f"Rows {offset + 1} - {end} of {num_rows}" if num_rows else "No rows."
+        if filters:
+            msg = f"{msg} (filtered from {table.arrow_table.num_rows} rows)"
+        st.caption(msg)
+
+    def render_preview(self, st: "KiaraStreamlitAPI", options: TablePreviewOptions):
+
+        _value = self.api.get_value(options.value)
+
+        if options.display_style == "profile":
+            self.render_profile(
+                st, value=_value, key=options.create_key("table", "profile")
+            )
+            return
+
+        if _value.is_set:
+            self.render_table_window(st, value=_value, options=options)
         else:
             st.write("No data available.")
 
 
+class DatabasePreviewOptions(TabularPreviewOptions):
+
+    page_size: int = Field(
+        description="The number of rows to display per page.",
+        default=DEFAULT_LISTING_PAGE_SIZE,
+    )
+
+
 class DatabasePreview(PreviewComponent):
-    """Preview a value of type 'database'."""
+    """Preview a value of type 'database'.
+
+    The database file is accessed read-only, and only the rows of the currently displayed page are queried.
+    """
 
     _component_name = "preview_database"
+    _options = DatabasePreviewOptions  # type: ignore
     _examples = [
         {"doc": "A database preview.", "args": {"value": "journals_database"}},
     ]
@@ -69,19 +510,68 @@ class DatabasePreview(PreviewComponent):
     def get_data_type(cls) -> str:
         return "database"
 
-    def render_preview(self, st: "KiaraStreamlitAPI", options: PreviewOptions):
+    def render_table_page(
+        self,
+        st: "KiaraStreamlitAPI",
+        reader: SQLiteReader,
+        table_name: str,
+        key: str,
+        options: DatabasePreviewOptions,
+    ):
+
+        columns = create_column_selector(
+            st,
+            key=key,
+            column_names=reader.get_column_names(table_name),
+            default=options.columns,
+        )
+
+        num_rows = reader.count_rows(table_name)
+        page_size = max(1, options.page_size)
+        num_pages = max(1, math.ceil(num_rows / page_size))
+
+        if num_pages > 1:
+            page = st.number_input(
+                label=f"Page (of {num_pages})",
+                min_value=1,
+                max_value=num_pages,
+                step=1,
+                key=f"{key}_page",
+            )
+        else:
+            page = 1
+
+        offset = (int(page) - 1) * page_size
+        rows = reader.read_rows(
+            table_name, offset=offset, limit=page_size, columns=columns
+        )
+        st.dataframe(
+            rows, use_container_width=True, hide_index=True, height=options.height
+        )
+        st.caption(
+            f"Rows {offset + 1} - {offset + len(rows)} of {num_rows}"
+            if num_rows
+            else "No rows."
+        )
+
+    def render_preview(self, st: "KiaraStreamlitAPI", options: DatabasePreviewOptions):
 
         _value = self.api.get_value(options.value)
         db: KiaraDatabase = _value.data
-        tabs = st.tabs(list(db.table_names))
+        reader = get_sqlite_reader(db.db_file_path)
 
-        for idx, table_name in enumerate(db.table_names):
-            # TODO: this is probably not ideal, as it always loads all tables because
-            # of how tabs are implemented in streamlit
-            # maybe there is an easy way to do this better, otherwise, maybe not use tabs
-            table = db.get_table_as_pandas_df(table_name)
-            tabs[idx].dataframe(
-                table, use_container_width=True, hide_index=True, height=options.height
+        table_names = reader.get_table_names()
+        tabs = st.tabs(table_names)
+
+        _key = options.create_key("database", "preview", str(_value.value_id))
+        for idx, table_name in enumerate(table_names):
+            # all tabs are rendered, but each only reads a single page of its table
+            self.render_table_page(
+                tabs[idx],
+                reader=reader,
+                table_name=table_name,
+                key=f"{_key}_{idx}",
+                options=options,
             )
 
 
@@ -89,6 +579,7 @@ class TablesPreview(PreviewComponent):
     """Preview a value of type 'tables'."""
 
     _component_name = "preview_tables"
+    _options = TabularPreviewOptions  # type: ignore
     _examples = [
         {"doc": "A tables preview.", "args": {"value": "journals_tables"}},
     ]
@@ -97,17 +588,27 @@ class TablesPreview(PreviewComponent):
     def get_data_type(cls) -> str:
         return "tables"
 
-    def render_preview(self, st: "KiaraStreamlitAPI", options: PreviewOptions):
+    def render_preview(self, st: "KiaraStreamlitAPI", options: TabularPreviewOptions):
 
         _value = self.api.get_value(options.value)
         tables: KiaraTables = _value.data
         tabs = st.tabs(tables.table_names)
 
+        _key = options.create_key("tables", "preview", str(_value.value_id))
         for idx, table_name in enumerate(tables.table_names):
             # TODO: this is probably not ideal, as it always loads all tables because
             # of how tabs are implemented in streamlit
             # maybe there is an easy way to do this better, otherwise, maybe not use tabs
-            table = tables.get_table(table_name).to_pandas_dataframe()
+            arrow_table = tables.get_table(table_name).arrow_table
+            columns = create_column_selector(
+                tabs[idx],
+                key=f"{_key}_{idx}",
+                column_names=arrow_table.column_names,
+                default=options.columns,
+            )
             tabs[idx].dataframe(
-                table, use_container_width=True, hide_index=True, height=options.height
+                arrow_table.select(columns).to_pandas(),
+                use_container_width=True,
+                hide_index=True,
+                height=options.height,
             )
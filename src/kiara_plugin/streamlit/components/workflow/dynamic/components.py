@@ -1,12 +1,12 @@
 # -*- coding: utf-8 -*-
-from typing import TYPE_CHECKING, Dict, Mapping, Tuple, TypeVar, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Tuple, TypeVar, Union
 
 from pydantic import ConfigDict, Field
 
 from kiara.api import Value
 from kiara.models.module.operation import Operation
 from kiara_plugin.streamlit.components import ComponentOptions, KiaraComponent
-from kiara_plugin.streamlit.components.preview import PreviewOptions
+from kiara_plugin.streamlit.components.preview import create_value_summary
 from kiara_plugin.streamlit.components.workflow.dynamic import WorkflowSessionDynamic
 from streamlit.delta_generator import DeltaGenerator
 
@@ -233,6 +233,10 @@ class CurrentValuesPreviewOptions(ComponentOptions):
         description="Whether to add the type of the value to the tab titles.",
         default=True,
     )
+    field_selector: str = Field(
+        description="How to select the field to preview: 'tabs' (renders the previews of all fields), or 'select' (only renders the preview of the selected field, and a metadata summary for all others).",
+        default="tabs",
+    )
 
 
 class CurrentValuesPreview(KiaraComponent[CurrentValuesPreviewOptions]):
@@ -240,6 +244,50 @@ class CurrentValuesPreview(KiaraComponent[CurrentValuesPreviewOptions]):
     _component_name = "current_values_preview"
     _options = CurrentValuesPreviewOptions
 
+    def render_field(
+        self,
+        st: "KiaraStreamlitAPI",
+        idx: int,
+        field: str,
+        value: Value,
+        options: CurrentValuesPreviewOptions,
+    ) -> bool:
+        """Render the preview and controls for a single field, returns whether it was selected for the next step."""
+
+        component = self.kiara_streamlit.get_preview_component(value.data_type_name)
+        if component is None:
+            component = self.kiara_streamlit.get_preview_component("any")
+        left, center, right = st.columns([1, 4, 1])
+
+        _key = options.create_key("select", f"{idx}_{field}")
+        select = left.button("Select for next step", key=_key)
+        _key = options.create_key("preview", f"{idx}_{field}")
+        component.render_func(center)(value=value, key=_key)  # type: ignore
+
+        right.write("Save value")
+        with right.form(key=options.create_key("save_form", f"{idx}_{field}")):
+            _key = options.create_key("alias", f"{idx}_{field}")
+            alias = self._st.text_input(
+                "alias",
+                value="",
+                key=_key,
+                placeholder="alias",
+                label_visibility="hidden",
+            )
+            _key = options.create_key("save", f"{idx}_{field}")
+            save = self._st.form_submit_button("Save")
+
+        if save and alias:
+            store_result = self.kiara_streamlit.store_value(
+                value=value, alias=alias, allow_overwrite=False
+            )
+            if store_result.error:
+                right.error(store_result.error)
+            else:
+                right.success("Value saved")
+
+        return select
+
     def _render(
         self,
         st: "KiaraStreamlitAPI",
@@ -251,6 +299,29 @@ class CurrentValuesPreview(KiaraComponent[CurrentValuesPreviewOptions]):
             return None
 
         field_names = sorted(options.values.keys())
+
+        if options.field_selector == "select":
+            summary: Dict[str, List[Any]] = {"field": []}
+            for field in field_names:
+                summary["field"].append(field)
+                for k, v in create_value_summary(options.values[field]).items():
+                    summary.setdefault(k, []).append(v)
+            st.dataframe(summary, use_container_width=True, hide_index=True)
+
+            selected_field = st.selectbox(
+                label="Field",
+                options=field_names,
+                key=options.create_key("selected_field"),
+            )
+            idx = field_names.index(selected_field)
+            if self.render_field(
+                st, idx, selected_field, options.values[selected_field], options
+            ):
+                return options.values[selected_field]
+            return None
+        elif options.field_selector != "tabs":
+            raise Exception(f"Invalid field selector: {options.field_selector}")
+
         if not options.add_value_types:
             tab_names = field_names
         else:
@@ -264,41 +335,7 @@ class CurrentValuesPreview(KiaraComponent[CurrentValuesPreviewOptions]):
         tabs = st.tabs(tab_names)
         selected = None
         for idx, field in enumerate(field_names):
-
-            value = options.values[field]
-            component = self.kiara_streamlit.get_preview_component(value.data_type_name)
-            if component is None:
-                component = self.kiara_streamlit.get_preview_component("any")
-            left, center, right = tabs[idx].columns([1, 4, 1])
-
-            _key = options.create_key("select", f"{idx}_{field}")
-            select = left.button("Select for next step", key=_key)
-            _key = options.create_key("preview", f"{idx}_{field}")
-            preview_opts = PreviewOptions(key=_key, value=value)
-            component.render_preview(st=center, options=preview_opts)  # type: ignore
-
-            right.write("Save value")
-            with right.form(key=options.create_key("save_form", f"{idx}_{field}")):
-                _key = options.create_key("alias", f"{idx}_{field}")
-                alias = self._st.text_input(
-                    "alias",
-                    value="",
-                    key=_key,
-                    placeholder="alias",
-                    label_visibility="hidden",
-                )
-                _key = options.create_key("save", f"{idx}_{field}")
-                save = self._st.form_submit_button("Save")
-
-            if save and alias:
-                store_result = self.api.store_value(
-                    value=value, alias=alias, allow_overwrite=False
-                )
-                if store_result.error:
-                    right.error(store_result.error)
-                else:
-                    right.success("Value saved")
-            if select:
+            if self.render_field(tabs[idx], idx, field, options.values[field], options):
                 selected = field
 
         if selected:
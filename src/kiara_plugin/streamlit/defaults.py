@@ -11,9 +11,95 @@ KIARA_STREAMLIT_RESOURCES_FOLDER = importlib_resources.files(  # type: ignore
 """Default resources folder for this package."""
 
 WANTS_MODAL_MARKER_KEY = "__WANTS_MODAL__"
+ACTIVE_FORM_MARKER_KEY = "__ACTIVE_FORM__"
+"""The session state key that holds the key of the form input widgets are currently rendered in (if any)."""
 
 NO_VALUE_MARKER = "-- no value --"
 
 NO_LABEL_MARKER = "-- no label --"
 
 AUTO_GEN_MARKER = "-- generated --"
+
+DEFAULT_FILE_PREVIEW_MAX_BYTES = 64 * 1024
+"""The default maximum number of bytes that are read from a file for a preview."""
+
+DEFAULT_FILE_PREVIEW_MAX_LINES = 100
+"""The default maximum number of lines that are displayed in a file preview."""
+
+DEFAULT_TREE_PREVIEW_MAX_DEPTH = 2
+"""The default number of nesting levels that are rendered in a dict/list preview."""
+
+DEFAULT_TREE_PREVIEW_MAX_ITEMS = 50
+"""The default maximum number of items per container that are rendered in a dict/list preview."""
+
+DEFAULT_TREE_PREVIEW_MAX_JSON_SIZE = 256 * 1024
+"""The default maximum size of the json data that is rendered in a dict/list preview."""
+
+DEFAULT_LISTING_PAGE_SIZE = 100
+"""The default number of rows per page for paginated listings."""
+
+DEFAULT_TEXT_PREVIEW_MAX_LINES = 200
+"""The default number of lines of a rendered value that are displayed at once."""
+
+DEFAULT_TEXT_PREVIEW_MAX_CHARS = 20000
+"""The default number of characters of a rendered value that are displayed at once."""
+
+DEFAULT_PREVIEW_CACHE_SIZE = 32
+"""The default number of values for which rendered previews are kept in memory."""
+
+DEFAULT_PREVIEW_ARTIFACT_ROWS = 100
+"""The default number of table rows that are included in a precomputed preview."""
+
+DEFAULT_PREVIEW_ARTIFACT_STORE_SIZE = 256 * 1024 * 1024
+"""The default number of bytes the precomputed previews may occupy on disk, before the least recently used ones are deleted."""
+
+DEFAULT_PREVIEW_ARTIFACT_MAX_AGE = 30 * 24 * 60 * 60.0
+"""The default number of seconds after which an unused precomputed preview is deleted."""
+
+DEFAULT_NETWORK_SAMPLE_MAX_NODES = 100
+"""The default maximum number of nodes that are rendered in a network data preview."""
+
+DEFAULT_NETWORK_SAMPLE_MAX_EDGES = 500
+"""The default maximum number of edges that are rendered in a network data preview."""
+
+DEFAULT_EXPLORER_CACHE_SIZE = 8
+"""The default number of generated (multi-MB) explorer html documents that are kept in memory."""
+
+DEFAULT_QUERY_TIMEOUT = 30.0
+"""The default maximum number of seconds a (user provided) SQL query is allowed to run."""
+
+DEFAULT_ALIAS_INDEX_CHECK_INTERVAL = 2.0
+"""The default minimum number of seconds between two checks whether the alias archives of a context changed on disk."""
+
+DEFAULT_UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+"""The default number of bytes that are read (and hashed, or written) at once when an uploaded file is processed."""
+
+DEFAULT_UPLOAD_STAGING_QUOTA = 2 * 1024 * 1024 * 1024
+"""The default number of bytes the staged uploads of an app may occupy, before files that are already persisted in kiara are released."""
+
+DEFAULT_UPLOAD_STAGING_CLEANUP_INTERVAL = 600.0
+"""The default minimum number of seconds between two cleanups of the upload staging area (quota enforcement, and removal of orphaned files)."""
+
+DEFAULT_UPLOAD_STAGING_ORPHAN_MAX_AGE = 24 * 60 * 60.0
+"""The default number of seconds after which staging files without a (living) owner process are considered orphaned."""
+
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+"""The default number of bytes that are read (and written) at once when a file is downloaded."""
+
+DEFAULT_DOWNLOAD_MAX_RETRIES = 3
+"""The default number of times an interrupted download is resumed, before it is considered failed."""
+
+DEFAULT_DOWNLOAD_RETRY_WAIT = 1.0
+"""The default number of seconds to wait before the first retry of an interrupted download (doubled for every further retry)."""
+
+DEFAULT_DOWNLOAD_TIMEOUT = 30.0
+"""The default number of seconds a download may wait for the remote server (to connect, or to send more data)."""
+
+DEFAULT_DOWNLOAD_WORKERS = 2
+"""The default number of downloads that run in parallel (in background threads)."""
+
+DEFAULT_DOWNLOAD_PROGRESS_INTERVAL = 0.5
+"""The default number of seconds between two updates of a download progress bar."""
+
+DEFAULT_UPLOAD_WORKERS = 8
+"""The default number of threads that hash and stage the files of a multi-file upload in parallel."""
@@ -8,3 +8,35 @@ other type of models -- that is attached to data, as well as *kiara* modules.
 Metadata models must be a sub-class of [kiara.metadata.MetadataModel][kiara.metadata.MetadataModel]. Other models usually
 sub-class a pydantic BaseModel or implement custom base classes.
 """
+import datetime
+import uuid
+from typing import Any, ClassVar, Dict
+
+from pydantic import Field
+
+from kiara.models import KiaraModel
+
+
+class PreviewArtifact(KiaraModel):
+    """A small, precomputed preview of a stored value, so a preview can be displayed without loading the (full) value data."""
+
+    _kiara_model_id: ClassVar = "instance.preview_artifact"
+
+    value_id: uuid.UUID = Field(description="The id of the value this preview is for.")
+    data_type: str = Field(description="The data type of the value.")
+    artifact_type: str = Field(
+        description="The type of the preview (currently only 'table_head')."
+    )
+    data: Dict[str, Any] = Field(
+        description="The preview data, content depends on the artifact type."
+    )
+    created: datetime.datetime = Field(
+        description="The time the preview was created.",
+        default_factory=datetime.datetime.now,
+    )
+
+    def _retrieve_id(self) -> str:
+        return f"{self.value_id}.{self.artifact_type}"
+
+    def _retrieve_data_to_hash(self) -> Any:
+        return {"value_id": str(self.value_id), "artifact_type": self.artifact_type}
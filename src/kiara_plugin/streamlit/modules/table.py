@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+import math
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Union
+
+from pydantic import Field
+
+from kiara.api import KiaraModule, KiaraModuleConfig, ValueMap, ValueMapSchema
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pyarrow as pa
+
+    from kiara_plugin.tabular.models.table import KiaraTable
+
+# the number of per-batch value counts that are collected before they get merged
+COUNTS_MERGE_INTERVAL = 16
+
+# the number of (fine-grained) bins of the histogram sketch of a numeric column
+HISTOGRAM_SKETCH_BINS = 1000
+
+
+def _to_json_value(value: Any) -> Any:
+    """Convert a python scalar (as returned by pyarrow's 'as_py') into something json-serializable."""
+
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, float):
+        if math.isnan(value) or math.isinf(value):
+            return None
+        return value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _rebin(
+    lower: float,
+    upper: float,
+    counts: "np.ndarray",
+    new_lower: float,
+    new_upper: float,
+    num_bins: int,
+) -> "np.ndarray":
+    """Distribute the counts of equal-width bins over a range to 'num_bins' equal-width bins over another (enclosing) range, by the bin centers."""
+
+    import numpy as np
+
+    if upper == lower:
+        centers = np.full(len(counts), lower)
+    else:
+        width = (upper - lower) / len(counts)
+        centers = lower + (np.arange(len(counts)) + 0.5) * width
+
+    if new_upper == new_lower:
+        idx = np.zeros(len(counts), dtype=np.int64)
+    else:
+        new_width = (new_upper - new_lower) / num_bins
+        idx = np.floor((centers - new_lower) / new_width).astype(np.int64)
+        idx = np.clip(idx, 0, num_bins - 1)
+
+    return np.bincount(idx, weights=counts, minlength=num_bins)
+
+
+class HistogramSketch(object):
+    """A mergeable, fixed-size histogram of numeric values whose range is not known in advance.
+
+    Every batch of values is binned over its own min/max, and merged into the sketch by re-binning both onto the combined range. The final histogram is accurate up to the width of one sketch bin.
+    """
+
+    def __init__(self, num_bins: int = HISTOGRAM_SKETCH_BINS):
+
+        self._num_bins: int = num_bins
+        self._lower: float = 0.0
+        self._upper: float = 0.0
+        self._counts: Union["np.ndarray", None] = None
+
+    def add(self, values: "np.ndarray") -> None:
+
+        import numpy as np
+
+        if len(values) == 0:
+            return
+
+        lower = float(values.min())
+        upper = float(values.max())
+        if lower == upper:
+            counts = np.zeros(self._num_bins)
+            counts[0] = len(values)
+        else:
+            counts, _ = np.histogram(values, bins=self._num_bins, range=(lower, upper))
+            counts = counts.astype(np.float64)
+
+        if self._counts is None:
+            self._lower, self._upper, self._counts = lower, upper, counts
+            return
+
+        new_lower = min(lower, self._lower)
+        new_upper = max(upper, self._upper)
+        self._counts = _rebin(
+            self._lower, self._upper, self._counts, new_lower, new_upper, self._num_bins
+        ) + _rebin(lower, upper, counts, new_lower, new_upper, self._num_bins)
+        self._lower, self._upper = new_lower, new_upper
+
+    def create_histogram(self, num_bins: int) -> Union[None, Dict[str, List[Any]]]:
+
+        if self._counts is None or num_bins < 1:
+            return None
+
+        lower, upper = self._lower, self._upper
+        if lower == upper:
+            return {"bin_edges": [lower, upper], "counts": [int(self._counts.sum())]}
+
+        counts = _rebin(lower, upper, self._counts, lower, upper, num_bins)
+        width = (upper - lower) / num_bins
+        return {
+            "bin_edges": [lower + idx * width for idx in range(num_bins)] + [upper],
+            "counts": [int(round(c)) for c in counts],
+        }
+
+
+class ColumnProfiler(object):
+    """Collects (mergeable) statistics for a single column, one record batch at a time.
+
+    The values are counted exactly as long as there are at most 'max_distinct_values' distinct ones. Beyond that, counting stops, and the distinct count and most frequent values are not reported. The histogram of a numeric column is then created from a (per-batch min/max binned) histogram sketch instead of the value counts.
+    """
+
+    def __init__(
+        self, data_type: "pa.DataType", num_top_values: int, max_distinct_values: int
+    ):
+
+        import pyarrow as pa
+
+        self._data_type: pa.DataType = data_type
+        if pa.types.is_dictionary(data_type):
+            self._value_type: pa.DataType = data_type.value_type
+        else:
+            self._value_type = data_type
+
+        self._num_top_values: int = num_top_values
+        self._max_distinct_values: int = max_distinct_values
+
+        self._is_numeric: bool = (
+            pa.types.is_integer(self._value_type)
+            or pa.types.is_floating(self._value_type)
+            or pa.types.is_decimal(self._value_type)
+        )
+        self._is_nested: bool = pa.types.is_nested(self._value_type)
+
+        self._num_values: int = 0
+        self._null_count: int = 0
+        self._min: Any = None
+        self._max: Any = None
+
+        # count/mean/sum of squared differences, merged per batch (Chan et al.)
+        self._count: int = 0
+        self._mean: float = 0.0
+        self._m2: float = 0.0
+
+        self._counts_parts: List["pa.Table"] = []
+        # whether the column has too many distinct values to count them
+        self._counts_truncated: bool = False
+        self._histogram_sketch: HistogramSketch = HistogramSketch()
+
+    def add(self, array: "pa.Array") -> None:
+
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if pa.types.is_dictionary(array.type):
+            array = array.cast(self._value_type)
+
+        self._num_values += len(array)
+        self._null_count += array.null_count
+
+        if self._is_nested or len(array) == array.null_count:
+            return
+
+        try:
+            min_max = pc.min_max(array)
+            _min = min_max["min"].as_py()
+            _max = min_max["max"].as_py()
+            if _min is not None and (self._min is None or _min < self._min):
+                self._min = _min
+            if _max is not None and (self._max is None or _max > self._max):
+                self._max = _max
+        except (pa.ArrowNotImplementedError, pa.ArrowTypeError, TypeError):
+            pass
+
+        if self._is_numeric:
+            float_array = pc.cast(array, pa.float64()).drop_null()
+            # NaN values are counted as distinct values, but are ignored for the numeric statistics
+            float_array = float_array.filter(pc.invert(pc.is_nan(float_array)))
+            count = len(float_array)
+        else:
+            count = 0
+
+        if count > 0:
+            mean = pc.mean(float_array).as_py()
+            m2 = pc.variance(float_array, ddof=0).as_py() * count
+
+            total = self._count + count
+            delta = mean - self._mean
+            self._mean = self._mean + delta * count / total
+            self._m2 = self._m2 + m2 + delta * delta * self._count * count / total
+            self._count = total
+            self._histogram_sketch.add(float_array.to_numpy(zero_copy_only=False))
+
+        if self._counts_truncated:
+            return
+
+        value_counts = pc.value_counts(array.drop_null())
+        counts_table = pa.table(
+            {
+                "values": value_counts.field("values"),
+                "counts": value_counts.field("counts"),
+            }
+        )
+        self._counts_parts.append(counts_table)
+
+        # merge the partial counts regularly, so memory usage stays bounded by the maximum number of distinct values
+        if (
+            len(self._counts_parts) >= COUNTS_MERGE_INTERVAL
+            or len(counts_table) > self._max_distinct_values
+        ):
+            self._compact_counts()
+
+    def _compact_counts(self) -> Union["pa.Table", None]:
+
+        import pyarrow as pa
+
+        if not self._counts_parts:
+            return None
+
+        if len(self._counts_parts) == 1:
+            merged = self._counts_parts[0]
+        else:
+            merged = (
+                pa.concat_tables(self._counts_parts)
+                .group_by("values")
+                .aggregate([("counts", "sum")])
+                .rename_columns(["values", "counts"])
+            )
+
+        if len(merged) > self._max_distinct_values:
+            # the counts of a subset of the values would be meaningless, so counting stops altogether
+            self._counts_truncated = True
+            self._counts_parts = []
+            return None
+
+        self._counts_parts = [merged]
+        return merged
+
+    def _create_histogram(
+        self, counts: "pa.Table", num_bins: int
+    ) -> Union[None, Dict[str, List[Any]]]:
+
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if not self._is_numeric or self._min is None or num_bins < 1:
+            return None
+
+        _min = float(self._min)
+        _max = float(self._max)
+        if _min == _max:
+            return {"bin_edges": [_min, _max], "counts": [self._count]}
+
+        width = (_max - _min) / num_bins
+        counts = counts.filter(
+            pc.invert(pc.is_nan(pc.cast(counts.column("values"), pa.float64())))
+        )
+        values = pc.cast(counts.column("values"), pa.float64())
+        bins = pc.cast(
+            pc.floor(pc.divide(pc.subtract(values, _min), width)), pa.int64()
+        )
+        # the maximum value belongs to the last bin
+        bins = pc.min_element_wise(bins, num_bins - 1)
+
+        binned = (
+            pa.table({"bin": bins, "counts": counts.column("counts")})
+            .group_by("bin")
+            .aggregate([("counts", "sum")])
+        )
+        bin_counts = [0] * num_bins
+        for bin_idx, count in zip(
+            binned.column("bin").to_pylist(), binned.column("counts_sum").to_pylist()
+        ):
+            if bin_idx is not None:
+                bin_counts[bin_idx] = count
+
+        return {
+            "bin_edges": [_min + idx * width for idx in range(num_bins)] + [_max],
+            "counts": bin_counts,
+        }
+
+    def create_profile(self, num_histogram_bins: int) -> Dict[str, Any]:
+
+        import pyarrow.compute as pc
+
+        profile: Dict[str, Any] = {
+            "type": str(self._data_type),
+            "null_count": self._null_count,
+            "distinct_count": None,
+            "counts_truncated": False,
+            "min": _to_json_value(self._min),
+            "max": _to_json_value(self._max),
+            "mean": None,
+            "std": None,
+            "top_values": [],
+            "histogram": None,
+        }
+
+        if self._is_numeric and self._count > 0:
+            profile["mean"] = _to_json_value(self._mean)
+            profile["std"] = _to_json_value(math.sqrt(self._m2 / self._count))
+
+        if self._is_nested:
+            return profile
+
+        counts = self._compact_counts()
+        if self._counts_truncated:
+            profile["counts_truncated"] = True
+            if self._is_numeric:
+                profile["histogram"] = self._histogram_sketch.create_histogram(
+                    num_bins=num_histogram_bins
+                )
+            return profile
+
+        if counts is None:
+            profile["distinct_count"] = 0
+            return profile
+
+        profile["distinct_count"] = len(counts)
+
+        top_idx = pc.select_k_unstable(
+            counts,
+            k=min(self._num_top_values, len(counts)),
+            sort_keys=[("counts", "descending")],
+        )
+        top = counts.take(top_idx)
+        profile["top_values"] = [
+            {"value": _to_json_value(v), "count": c}
+            for v, c in zip(
+                top.column("values").to_pylist(), top.column("counts").to_pylist()
+            )
+        ]
+        profile["histogram"] = self._create_histogram(
+            counts, num_bins=num_histogram_bins
+        )
+
+        return profile
+
+
+def create_table_profile(
+    table: "pa.Table",
+    num_top_values: int = 10,
+    num_histogram_bins: int = 20,
+    max_distinct_values: int = 100000,
+) -> Mapping[str, Any]:
+    """Compute per-column statistics for an Arrow table, in a single pass over its record batches."""
+
+    profilers = {
+        field.name: ColumnProfiler(
+            field.type,
+            num_top_values=num_top_values,
+            max_distinct_values=max_distinct_values,
+        )
+        for field in table.schema
+    }
+
+    for batch in table.to_batches():
+        for field_name, column in zip(batch.schema.names, batch.columns):
+            profilers[field_name].add(column)
+
+    return {
+        "num_rows": table.num_rows,
+        "num_columns": table.num_columns,
+        "columns": {
+            column_name: profiler.create_profile(num_histogram_bins=num_histogram_bins)
+            for column_name, profiler in profilers.items()
+        },
+    }
+
+
+class ProfileTableModuleConfig(KiaraModuleConfig):
+
+    num_top_values: int = Field(
+        description="The number of most frequent values to record per column.",
+        default=10,
+    )
+    num_histogram_bins: int = Field(
+        description="The number of histogram bins for numeric columns.", default=20
+    )
+    max_distinct_values: int = Field(
+        description="The maximum number of distinct values that are counted exactly per column. For columns with more distinct values, the distinct count and the most frequent values are not reported.",
+        default=100000,
+    )
+
+
+class ProfileTableModule(KiaraModule):
+    """Compute summary statistics for every column of a table.
+
+    The statistics (null count, number of distinct values, min/max, mean/std, most frequent values, and a histogram for numeric columns) are computed with Arrow compute kernels, in a single pass over the record batches of the table, without converting it to a dataframe.
+    """
+
+    _module_type_name = "table.profile"
+    _config_cls = ProfileTableModuleConfig
+
+    def create_inputs_schema(
+        self,
+    ) -> ValueMapSchema:
+
+        return {"table": {"type": "table", "doc": "The table to profile."}}
+
+    def create_outputs_schema(
+        self,
+    ) -> ValueMapSchema:
+
+        return {
+            "table_profile": {
+                "type": "dict",
+                "doc": "The table profile, containing the statistics for each column under the 'columns' key.",
+            }
+        }
+
+    def process(self, inputs: ValueMap, outputs: ValueMap) -> None:
+
+        table: KiaraTable = inputs.get_value_data("table")
+
+        profile = create_table_profile(
+            table.arrow_table,
+            num_top_values=self.get_config_value("num_top_values"),
+            num_histogram_bins=self.get_config_value("num_histogram_bins"),
+            max_distinct_values=self.get_config_value("max_distinct_values"),
+        )
+        outputs.set_value("table_profile", profile)
@@ -2,26 +2,42 @@
 import atexit
 import os
 import shutil
+import time
 import uuid
 from pathlib import Path
-from typing import Dict, Mapping, Union
+from typing import BinaryIO, Dict, Iterable, Mapping, Sequence, Tuple, Union
 
 import streamlit as st
-from kiara.api import KiaraAPI
+from kiara.api import KiaraAPI, Value
 from kiara.context import KiaraConfig, KiaraContextConfig, KiaraRuntimeConfig
-from kiara.interfaces.python_api import JobDesc
+from kiara.exceptions import KiaraException
+from kiara.interfaces.python_api import JobDesc, StoreValueResult
+from kiara.models.filesystem import KiaraFile, KiaraFileBundle
 from kiara.models.values.value import ValueMapReadOnly
+from kiara.utils.json import orjson_dumps
+from kiara_plugin.onboarding.utils.download import DownloadMetadata
 from kiara_plugin.streamlit.components import KiaraComponent
 from kiara_plugin.streamlit.components.data_import import DataImportComponent
 from kiara_plugin.streamlit.components.input import InputComponent
 from kiara_plugin.streamlit.components.preview import PreviewComponent
 from kiara_plugin.streamlit.defaults import (
+    DEFAULT_UPLOAD_STAGING_CLEANUP_INTERVAL,
     WANTS_MODAL_MARKER_KEY,
     kiara_stremalit_app_dirs,
 )
+from kiara_plugin.streamlit.models import PreviewArtifact
+from kiara_plugin.streamlit.utils.aliases import AliasEntry, AliasIndex
+from kiara_plugin.streamlit.utils.artifacts import PreviewArtifactStore
 from kiara_plugin.streamlit.utils.class_loading import (
     find_all_kiara_streamlit_components,
 )
+from kiara_plugin.streamlit.utils.downloads import DownloadManager, DownloadStatus
+from kiara_plugin.streamlit.utils.staging import (
+    StagingArea,
+    StagingStats,
+    cleanup_orphaned_dirs,
+    write_owner_marker,
+)
 from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 
@@ -54,13 +70,13 @@ class ComponentMgmt(object):
 
     def get_preview_component(
         self, data_type: str, preview_name: Union[str, None] = None
-    ) -> PreviewComponent:
+    ) -> Union[PreviewComponent, None]:
 
         all_previews = self.preview_components.get(data_type, None)
         if not all_previews:
-            raise Exception(f"No preview component found for data type: '{data_type}'")
+            return None
         if preview_name and preview_name not in all_previews.keys():
-            raise Exception(f"No preview component found for data type: '{data_type}'")
+            return None
 
         if not preview_name:
             if len(all_previews) > 1:
@@ -72,12 +88,7 @@ class ComponentMgmt(object):
                     preview_name = "default"
             else:
                 preview_name = next(iter(all_previews.keys()))
-        result = all_previews.get(preview_name, None)
-
-        if not result:
-            raise Exception(f"No preview component found for data type: '{data_type}'")
-        else:
-            return result
+        return all_previews.get(preview_name, None)
 
     def get_input_component(self, data_type: str) -> InputComponent:
         result = self.input_components.get(data_type, None)
@@ -111,10 +122,7 @@ class ComponentMgmt(object):
             if issubclass(cls, PreviewComponent):
                 data_type: Union[None, str] = cls.get_data_type()
                 preview_name = cls.get_preview_name()
-                if (
-                    preview_components.get("data_type", {}).get("preview_name", None)
-                    is not None
-                ):
+                if preview_name in preview_components.get(data_type, {}).keys():  # type: ignore
                     raise ValueError(
                         f"Can't register component for data type '{data_type}' and preview name '{preview_name}': more than one component registered."
                     )
@@ -191,10 +199,12 @@ class KiaraStreamlit(object):
         self,
         context_config: Union[None, KiaraContextConfig] = None,
         runtime_config: Union[None, KiaraRuntimeConfig] = None,
+        precompute_previews: bool = False,
     ):
 
         self._context_config: Union[None, KiaraContextConfig] = context_config
         self._runtime_config: Union[None, KiaraRuntimeConfig] = runtime_config
+        self._precompute_previews: bool = precompute_previews
 
         self._api_outside_streamlit: Union[None, KiaraAPI] = None
 
@@ -222,6 +232,37 @@ class KiaraStreamlit(object):
 
         self._job_cache: Dict[str, ValueMapReadOnly] = {}
 
+        self._alias_index: AliasIndex = AliasIndex()
+
+        self._staging_area: StagingArea = StagingArea(
+            base_path=os.path.join(self._temp_dir, "uploads"),
+            get_persisted_path=self._get_persisted_upload_path,
+        )
+        # (context id, content digest, file name) -> id of the registered file value
+        self._uploaded_files: Dict[Tuple[uuid.UUID, str, str], uuid.UUID] = {}
+        # (context id, content digests and file names) -> id of the registered file bundle value
+        self._uploaded_bundles: Dict[
+            Tuple[uuid.UUID, str, Tuple[Tuple[str, str], ...]], uuid.UUID
+        ] = {}
+        # staged path -> (context id, id of the registered value, name of the file within the value)
+        self._staged_values: Dict[str, Tuple[uuid.UUID, uuid.UUID, str]] = {}
+        self._last_staging_cleanup: Union[float, None] = None
+
+        self._downloads: DownloadManager = DownloadManager(
+            base_path=os.path.join(self._temp_dir, "downloads")
+        )
+        # (context id, download id) -> id of the registered file value
+        self._downloaded_files: Dict[Tuple[uuid.UUID, str], uuid.UUID] = {}
+        # download id -> path of the staged file
+        self._downloaded_paths: Dict[str, str] = {}
+        write_owner_marker(self._temp_dir)
+
+        self._preview_artifacts: PreviewArtifactStore = PreviewArtifactStore(
+            base_path=os.path.join(
+                kiara_stremalit_app_dirs.user_cache_dir, "preview_artifacts"
+            )
+        )
+
         def del_temp_dir():
             shutil.rmtree(self._temp_dir, ignore_errors=True)
 
@@ -259,7 +300,7 @@ class KiaraStreamlit(object):
 
     def get_preview_component(
         self, data_type: str, preview_name: Union[str, None] = None
-    ) -> PreviewComponent:
+    ) -> Union[PreviewComponent, None]:
         return self._component_mgmt.get_preview_component(
             data_type=data_type, preview_name=preview_name
         )
@@ -305,6 +346,278 @@ class KiaraStreamlit(object):
             self._job_cache[job_cache_key] = result
         return result
 
+    def store_value(
+        self,
+        value: Union[str, uuid.UUID, Value],
+        alias: Union[str, Iterable[str], None],
+        allow_overwrite: bool = True,
+    ) -> StoreValueResult:
+        """Store a value in the kiara context.
+
+        If preview precomputation is enabled, a small preview for the value is created in the background after it was stored.
+
+        Arguments:
+            value: the value (or a reference to it)
+            alias: (Optional) aliases for the value
+            allow_overwrite: whether to allow overwriting existing aliases
+        """
+
+        result = self._api.store_value(
+            value=value, alias=alias, allow_overwrite=allow_overwrite
+        )
+        if not result.error and result.value.data_type_name == "file":
+            self._alias_index.register_file(result.value)
+        if alias:
+            self._alias_index.invalidate(self._api.context.id)
+        if not result.error and any(
+            value_id == result.value.value_id
+            for _, value_id, _ in self._staged_values.values()
+        ):
+            # the staged copy of the uploaded file can be released now, if space is needed
+            self._staging_area.enforce_quota()
+        if self._precompute_previews and not result.error:
+            self._preview_artifacts.submit(result.value)
+        return result
+
+    def list_aliases(
+        self, data_types: Union[Iterable[str], None] = None
+    ) -> Mapping[str, AliasEntry]:
+        """List the aliased values of the current context, optionally filtered by data type.
+
+        The result comes from an in-memory index, which is updated when values are stored via this object, the context is switched, or the alias archives change on disk. It only contains lightweight entries (alias, value id, data type, size, and file extension and mime type), use the value id to load the value itself.
+
+        Arguments:
+            data_types: (Optional) only return values of those data types
+        """
+
+        return self._alias_index.get_aliases(self._api, data_types=data_types)
+
+    def list_file_aliases(
+        self,
+        extensions: Union[Iterable[str], None] = None,
+        mime_types: Union[Iterable[str], None] = None,
+    ) -> Mapping[str, AliasEntry]:
+        """List the aliased 'file' values of the current context, optionally filtered by file extension and/or mime type.
+
+        Like 'list_aliases', this is a lookup in an in-memory index, no file value is loaded.
+
+        Arguments:
+            extensions: (Optional) only return files with one of those extensions (case-insensitive, with or without leading '.')
+            mime_types: (Optional) only return files with one of those mime types
+        """
+
+        return self._alias_index.get_file_aliases(
+            self._api, extensions=extensions, mime_types=mime_types
+        )
+
+    def set_active_context(self, context_name: str, create: bool = False) -> None:
+        """Switch the active kiara context.
+
+        Arguments:
+            context_name: the name of the context
+            create: whether to create the context if it does not exist yet
+        """
+
+        self._api.set_active_context(context_name, create=create)
+        self._alias_index.invalidate(self._api.context.id)
+
+    def import_file_obj(self, file_obj: BinaryIO, file_name: str) -> Value:
+        """Register the content of a (seekable) file object, e.g. an uploaded file, as a 'file' value.
+
+        The content is hashed first: if the same content was already imported under the same name, the existing value is returned, without copying or registering anything. Otherwise the content is streamed into the staging area (in chunks), and registered from there.
+
+        Arguments:
+            file_obj: the file object
+            file_name: the name of the file
+        """
+
+        digest = self._staging_area.hash_file_obj(file_obj)
+        key = (self._api.context.id, digest, file_name)
+        value_id = self._uploaded_files.get(key, None)
+        if value_id is not None:
+            return self._api.get_value(value_id)
+
+        self.cleanup_staging_area()
+        path = self._staging_area.stage(file_obj, file_name=file_name, digest=digest)
+        kiara_file = KiaraFile.load_file(path, file_name=file_name)
+        value = self._api.register_data(
+            kiara_file, data_type="file", reuse_existing=True
+        )
+        self._uploaded_files[key] = value.value_id
+        self._alias_index.register_file(value)
+        self._staged_values.setdefault(
+            path, (self._api.context.id, value.value_id, file_name)
+        )
+        return value
+
+    def import_file_bundle(
+        self, file_objs: Sequence[Tuple[BinaryIO, str]], bundle_name: str
+    ) -> Value:
+        """Register the content of multiple (seekable) file objects, e.g. uploaded files, as a single 'file_bundle' value.
+
+        The files are hashed and streamed into the staging area in parallel, files with identical content are only included once. If the same set of files was already imported under the same bundle name, the existing value is returned.
+
+        Arguments:
+            file_objs: tuples of file object and file name
+            bundle_name: the name of the bundle
+        """
+
+        staged = self._staging_area.stage_all(file_objs)
+        key = (
+            self._api.context.id,
+            bundle_name,
+            tuple((digest, file_name) for digest, (file_name, _) in staged.items()),
+        )
+        value_id = self._uploaded_bundles.get(key, None)
+        if value_id is not None:
+            return self._api.get_value(value_id)
+
+        self.cleanup_staging_area()
+        files: Dict[str, KiaraFile] = {}
+        for file_name, path in staged.values():
+            rel_path = file_name
+            stem, ext = os.path.splitext(file_name)
+            index = 1
+            while rel_path in files.keys():
+                # different content under the same name
+                rel_path = f"{stem}_{index}{ext}"
+                index += 1
+            files[rel_path] = KiaraFile.load_file(path, file_name=rel_path)
+
+        bundle = KiaraFileBundle.create_from_file_models(
+            files=files, bundle_name=bundle_name
+        )
+        value = self._api.register_data(
+            bundle, data_type="file_bundle", reuse_existing=True
+        )
+        self._uploaded_bundles[key] = value.value_id
+        for rel_path, kiara_file in files.items():
+            self._staged_values.setdefault(
+                kiara_file.path, (self._api.context.id, value.value_id, rel_path)
+            )
+        return value
+
+    def start_download(self, url: str) -> str:
+        """Start downloading a file in the background, and return the id of the download.
+
+        Use 'get_download_status' to follow its progress, and 'import_download' to register the file once it is finished.
+        """
+
+        return self._downloads.start(url)
+
+    def get_download_status(self, download_id: str) -> DownloadStatus:
+        """Return the progress of a download."""
+
+        return self._downloads.get_status(download_id)
+
+    def import_download(self, download_id: str) -> Value:
+        """Register a finished download as a 'file' value.
+
+        The downloaded file is moved into the staging area (once), and the download details (url, response headers) are attached as file metadata.
+        """
+
+        status = self._downloads.get_status(download_id)
+        if status.state != "finished":
+            raise KiaraException(
+                f"Can't import download '{download_id}': download is {status.state}."
+            )
+
+        # if the download was repeated (because its staged file was gone), the new file has to be imported
+        path = self._downloaded_paths.get(download_id, None)
+        key = (self._api.context.id, download_id)
+        value_id = self._downloaded_files.get(key, None)
+        if value_id is not None and path == status.path:
+            return self._api.get_value(value_id)
+
+        if path != status.path:
+            self.cleanup_staging_area()
+            path = self._staging_area.stage_file(
+                status.path, file_name=status.file_name
+            )
+            # so starting the download of the same url again re-uses the staged file
+            self._downloads.set_path(download_id, path)
+            self._downloaded_paths[download_id] = path
+        kiara_file = KiaraFile.load_file(path, file_name=status.file_name)
+
+        download_metadata = DownloadMetadata(
+            url=status.url,
+            response_headers=status.response_headers or [],
+            request_time=status.request_time,
+        )
+        kiara_file.metadata["download_info"] = download_metadata.model_dump()
+        kiara_file.metadata_schemas["download_info"] = orjson_dumps(
+            DownloadMetadata.model_json_schema()
+        )
+
+        value = self._api.register_data(
+            kiara_file, data_type="file", reuse_existing=True
+        )
+        self._downloaded_files[key] = value.value_id
+        self._alias_index.register_file(value)
+        self._staged_values.setdefault(
+            path, (self._api.context.id, value.value_id, status.file_name)
+        )
+        return value
+
+    def _get_persisted_upload_path(self, path: str) -> Union[str, None]:
+        """Return the path of the copy of a staged file in the data store of its value, if the value was stored already."""
+
+        context_id, value_id, chunk_key = self._staged_values.get(
+            path, (None, None, None)
+        )
+        if value_id is None or context_id != self._api.context.id:
+            return None
+
+        data_registry = self._api.context.data_registry
+        store_id = data_registry.find_store_id_for_value(value_id)
+        if store_id is None:
+            return None
+
+        archive = data_registry.get_archive(store_id)
+        persisted_data = archive.retrieve_serialized_value(value_id)
+        chunks = persisted_data.chunk_id_map.get(chunk_key, None)  # type: ignore
+        if chunks is None or len(chunks.chunk_id_list) != 1:
+            return None
+        persisted_path = archive.retrieve_chunk(
+            chunks.chunk_id_list[0], as_file=True, symlink_ok=True
+        )
+        if not isinstance(persisted_path, str) or not os.path.isfile(persisted_path):
+            return None
+        if os.path.getsize(persisted_path) != os.path.getsize(path):
+            return None
+        return persisted_path
+
+    def cleanup_staging_area(self, force: bool = False) -> None:
+        """Release staged uploads that are persisted in kiara (if the staging quota is exceeded), and delete files and directories left behind by interrupted uploads or dead app processes.
+
+        Unless 'force' is set, this runs at most once per cleanup interval.
+        """
+
+        now = time.monotonic()
+        if (
+            not force
+            and self._last_staging_cleanup is not None
+            and now - self._last_staging_cleanup
+            < DEFAULT_UPLOAD_STAGING_CLEANUP_INTERVAL
+        ):
+            return
+        self._last_staging_cleanup = now
+
+        self._staging_area.cleanup()
+        cleanup_orphaned_dirs(
+            kiara_stremalit_app_dirs.user_cache_dir, exclude=[self._temp_dir]
+        )
+
+    def get_staging_stats(self) -> StagingStats:
+        """Return the number of staged uploads, and the number of bytes they occupy."""
+
+        return self._staging_area.get_stats()
+
+    def get_preview_artifact(self, value_id: uuid.UUID) -> Union[PreviewArtifact, None]:
+        """Return the precomputed preview for a value, if available."""
+
+        return self._preview_artifacts.get_artifact(value_id)
+
     def has_job_result(self, job: JobDesc) -> bool:
         """Check if a job has already been run and has a result available.
 
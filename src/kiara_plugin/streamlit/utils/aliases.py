@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+import time
+import uuid
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Tuple,
+    Union,
+)
+
+from kiara_plugin.streamlit.defaults import DEFAULT_ALIAS_INDEX_CHECK_INTERVAL
+
+if TYPE_CHECKING:
+    from kiara.api import KiaraAPI, Value
+    from kiara.context import Kiara
+    from kiara.registries.aliases import AliasRegistry
+
+
+class AliasEntry(NamedTuple):
+    """A lightweight description of an aliased value, so value pickers can be rendered without loading the values."""
+
+    alias: str
+    value_id: uuid.UUID
+    data_type: str
+    size: int
+    extension: Union[str, None] = None
+    mime_type: Union[str, None] = None
+
+
+class FileIndex(NamedTuple):
+    """The aliased 'file' values of a context, by (lower-case) file extension and by mime type."""
+
+    by_extension: Mapping[str, Mapping[str, AliasEntry]]
+    by_mime_type: Mapping[str, Mapping[str, AliasEntry]]
+
+
+def normalize_file_extension(extension: str) -> str:
+    """Normalize a file extension for lookups ('.CSV' -> 'csv')."""
+
+    return extension.lstrip(".").lower()
+
+
+def get_file_extension(file_name: str) -> Union[str, None]:
+    """Return the extension of a file name (without the leading '.'), or 'None' if it has none."""
+
+    _, extension = os.path.splitext(file_name)
+    return extension[1:] if extension else None
+
+
+def get_data_type_name(value: Union["Value", AliasEntry]) -> str:
+    """Return the data type name of a value, or of the value an alias entry refers to."""
+
+    if isinstance(value, AliasEntry):
+        return value.data_type
+    return value.data_type_name
+
+
+def retrieve_value_details(kiara: "Kiara", value_id: uuid.UUID) -> Mapping[str, Any]:
+    """Retrieve the stored metadata of a value (data type, size, property links, ...), without creating a 'Value' object.
+
+    This uses the private details lookup of the data archive, which is checked in the tests ('test_kiara_private_attributes').
+    """
+
+    data_registry = kiara.data_registry
+    store_id = data_registry.find_store_id_for_value(value_id)
+    if store_id is None:
+        value = data_registry.get_value(value_id)
+        return {
+            "value_schema": {"type": value.data_type_name},
+            "value_size": value.value_size,
+            "property_links": value.property_links,
+        }
+    archive = data_registry.get_archive(store_id)
+    return archive._retrieve_value_details(value_id=value_id)
+
+
+def _get_file_metadata(
+    kiara: "Kiara", details: Mapping[str, Any]
+) -> Tuple[Union[str, None], Union[str, None]]:
+    """Return the file extension and mime type of a 'file' value, using its (small) file metadata property."""
+
+    file_metadata_id = details.get("property_links", {}).get("metadata.file", None)
+    if file_metadata_id is None:
+        return None, None
+    file_metadata = kiara.data_registry.get_value(uuid.UUID(str(file_metadata_id))).data
+    return (
+        get_file_extension(file_metadata.file.file_name),
+        file_metadata.file.mime_type,
+    )
+
+
+def _get_directory_fingerprint(path: str) -> Tuple[int, int]:
+    """Return the number of (sub-)directories below a path, and their latest modification time.
+
+    Adding, replacing or removing a file changes the modification time of its parent directory, so files don't need to be visited.
+    """
+
+    num_dirs = 0
+    latest_mtime = 0
+    pending = [path]
+    while pending:
+        current = pending.pop()
+        try:
+            stat = os.stat(current)
+            with os.scandir(current) as entries:
+                subdirs = [e.path for e in entries if e.is_dir(follow_symlinks=False)]
+        except FileNotFoundError:
+            continue
+        num_dirs += 1
+        latest_mtime = max(latest_mtime, stat.st_mtime_ns)
+        pending.extend(subdirs)
+
+    return num_dirs, latest_mtime
+
+
+def get_alias_archives_fingerprint(api: "KiaraAPI") -> Tuple[Tuple[int, int], ...]:
+    """Return a fingerprint of the on-disk state of all (filesystem based) alias archives of the current context."""
+
+    fingerprint: List[Tuple[int, int]] = []
+    for archive in api.context.alias_registry.alias_archives.values():
+        archive_path = getattr(archive.config, "archive_path", None)
+        if not archive_path:
+            continue
+        aliases_path = os.path.join(archive_path, "aliases")
+        if not os.path.isdir(aliases_path):
+            aliases_path = archive_path
+        fingerprint.append(_get_directory_fingerprint(aliases_path))
+    return tuple(fingerprint)
+
+
+def read_all_aliases(alias_registry: "AliasRegistry") -> Dict[str, uuid.UUID]:
+    """Read the aliases (and the ids of the values they refer to) of a kiara alias registry from its archives.
+
+    This bypasses the alias cache of the registry, which is never invalidated if another process changes the archives.
+    """
+
+    aliases: Dict[str, uuid.UUID] = {}
+    default_alias_store = alias_registry.default_alias_store
+    for archive_alias, archive in alias_registry.alias_archives.items():
+        alias_map = archive.retrieve_all_aliases()
+        if alias_map is None:
+            continue
+        for alias, value_id in alias_map.items():
+            if archive_alias == default_alias_store:
+                aliases[alias] = value_id
+            else:
+                aliases[f"{archive_alias}.{alias}"] = value_id
+    return aliases
+
+
+class AliasIndex(object):
+    """An in-memory index of the aliased values of every kiara context, grouped by data type.
+
+    The index of a context is (re-)built on first access, after it was invalidated, or if the alias archives of the context changed on disk (which is checked at most every 'check_interval' seconds).
+    """
+
+    def __init__(self, check_interval: float = DEFAULT_ALIAS_INDEX_CHECK_INTERVAL):
+
+        self._check_interval: float = check_interval
+        self._lock = threading.Lock()
+        self._aliases: Dict[uuid.UUID, Dict[str, Dict[str, AliasEntry]]] = {}
+        self._files: Dict[uuid.UUID, FileIndex] = {}
+        # values are immutable, so their details don't have to be retrieved again when an index is re-built
+        self._value_details: Dict[
+            uuid.UUID, Tuple[str, int, Union[str, None], Union[str, None]]
+        ] = {}
+        self._fingerprints: Dict[uuid.UUID, Tuple[Tuple[int, int], ...]] = {}
+        self._last_checked: Dict[uuid.UUID, float] = {}
+
+    def invalidate(self, context_id: Union[uuid.UUID, None] = None) -> None:
+        """Invalidate the index of one context, or of all contexts if no context id is provided."""
+
+        with self._lock:
+            if context_id is None:
+                self._aliases.clear()
+                self._files.clear()
+                self._fingerprints.clear()
+                self._last_checked.clear()
+            else:
+                self._aliases.pop(context_id, None)
+                self._files.pop(context_id, None)
+                self._fingerprints.pop(context_id, None)
+                self._last_checked.pop(context_id, None)
+
+    def register_file(self, value: "Value") -> None:
+        """Record the details of a newly registered 'file' value, so they don't have to be retrieved from its metadata when it gets an alias."""
+
+        kiara_file = value.data
+        self._value_details[value.value_id] = (
+            value.data_type_name,
+            value.value_size,
+            get_file_extension(kiara_file.file_name),
+            kiara_file.mime_type,
+        )
+
+    def _get_value_details(
+        self, kiara: "Kiara", value_id: uuid.UUID
+    ) -> Tuple[str, int, Union[str, None], Union[str, None]]:
+
+        value_details = self._value_details.get(value_id, None)
+        if value_details is None:
+            details = retrieve_value_details(kiara, value_id)
+            data_type = details["value_schema"]["type"]
+            extension, mime_type = _get_file_metadata(kiara, details)
+            value_details = (data_type, details["value_size"], extension, mime_type)
+            self._value_details[value_id] = value_details
+        return value_details
+
+    def _create_index(
+        self, api: "KiaraAPI"
+    ) -> Tuple[Dict[str, Dict[str, AliasEntry]], FileIndex]:
+
+        kiara = api.context
+        aliases = read_all_aliases(kiara.alias_registry)
+
+        index: Dict[str, Dict[str, AliasEntry]] = {}
+        by_extension: Dict[str, Dict[str, AliasEntry]] = {}
+        by_mime_type: Dict[str, Dict[str, AliasEntry]] = {}
+        for alias in sorted(aliases.keys()):
+            value_id = aliases[alias]
+            data_type, size, extension, mime_type = self._get_value_details(
+                kiara, value_id
+            )
+            if kiara.type_registry.is_internal_type(data_type_name=data_type):
+                continue
+            entry = AliasEntry(
+                alias=alias,
+                value_id=value_id,
+                data_type=data_type,
+                size=size,
+                extension=extension,
+                mime_type=mime_type,
+            )
+            index.setdefault(data_type, {})[alias] = entry
+            if data_type != "file":
+                continue
+            if extension:
+                key = normalize_file_extension(extension)
+                by_extension.setdefault(key, {})[alias] = entry
+            if mime_type:
+                by_mime_type.setdefault(mime_type, {})[alias] = entry
+
+        return index, FileIndex(by_extension=by_extension, by_mime_type=by_mime_type)
+
+    def _get_indexes(
+        self, api: "KiaraAPI"
+    ) -> Tuple[Dict[str, Dict[str, AliasEntry]], FileIndex]:
+
+        context_id = api.context.id
+        with self._lock:
+            index = self._aliases.get(context_id, None)
+            now = time.monotonic()
+            if (
+                index is not None
+                and now - self._last_checked.get(context_id, 0.0) < self._check_interval
+            ):
+                return index, self._files[context_id]
+
+            fingerprint = get_alias_archives_fingerprint(api)
+            self._last_checked[context_id] = now
+            if index is not None and fingerprint == self._fingerprints.get(context_id):
+                return index, self._files[context_id]
+
+            if index is not None:
+                # the archives were changed by another process, so the alias cache of the kiara registry (which is used to resolve the selected aliases) is stale too
+                # this relies on private attributes of the registry, which are checked in the tests ('test_kiara_private_attributes')
+                alias_registry = api.context.alias_registry
+                alias_registry._cached_aliases = None
+                alias_registry._cached_aliases_by_id = None
+
+            index, file_index = self._create_index(api)
+            self._aliases[context_id] = index
+            self._files[context_id] = file_index
+            self._fingerprints[context_id] = fingerprint
+            return index, file_index
+
+    def get_index(self, api: "KiaraAPI") -> Mapping[str, Mapping[str, AliasEntry]]:
+        """Return the index (data type -> alias -> entry) for the current context of the api."""
+
+        return self._get_indexes(api)[0]
+
+    def get_file_index(self, api: "KiaraAPI") -> FileIndex:
+        """Return the index of the aliased 'file' values (by extension and mime type) for the current context of the api."""
+
+        return self._get_indexes(api)[1]
+
+    def get_file_aliases(
+        self,
+        api: "KiaraAPI",
+        extensions: Union[Iterable[str], None] = None,
+        mime_types: Union[Iterable[str], None] = None,
+    ) -> Dict[str, AliasEntry]:
+        """Return the entries (sorted by alias) of the aliased 'file' values of the current context, optionally only those with one of the provided extensions and/or mime types."""
+
+        if not extensions and not mime_types:
+            return self.get_aliases(api, data_types=["file"])
+
+        file_index = self.get_file_index(api)
+        result: Dict[str, AliasEntry] = {}
+        if extensions:
+            for extension in extensions:
+                result.update(
+                    file_index.by_extension.get(normalize_file_extension(extension), {})
+                )
+        if mime_types:
+            by_mime_type: Dict[str, AliasEntry] = {}
+            for mime_type in mime_types:
+                by_mime_type.update(file_index.by_mime_type.get(mime_type, {}))
+            if extensions:
+                result = {k: v for k, v in result.items() if k in by_mime_type}
+            else:
+                result = by_mime_type
+
+        return {k: result[k] for k in sorted(result.keys())}
+
+    def get_aliases(
+        self, api: "KiaraAPI", data_types: Union[Iterable[str], None] = None
+    ) -> Dict[str, AliasEntry]:
+        """Return the entries (sorted by alias) of the aliased values of the current context, optionally only those of the provided data types (or their sub types)."""
+
+        index = self.get_index(api)
+        if data_types:
+            type_registry = api.context.type_registry
+            matching_types = set()
+            for data_type in data_types:
+                matching_types.add(data_type)
+                if data_type in type_registry.data_type_classes.keys():
+                    matching_types.update(type_registry.get_sub_types(data_type))
+        else:
+            matching_types = set(index.keys())
+
+        result: Dict[str, AliasEntry] = {}
+        for data_type in matching_types:
+            result.update(index.get(data_type, {}))
+        return {k: result[k] for k in sorted(result.keys())}
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+import math
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+DEFAULT_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+def get_array_window(
+    array: "pa.ChunkedArray", offset: int, length: int
+) -> Tuple[List[Any], List[int]]:
+    """Return the python values of a window of a chunked array, without concatenating its chunks.
+
+    Returns:
+        a tuple containing the values, and the indexes of the chunks the window covers
+    """
+
+    values: List[Any] = []
+    chunk_indexes: List[int] = []
+
+    end = offset + length
+    chunk_start = 0
+    for idx, chunk in enumerate(array.iterchunks()):
+        chunk_end = chunk_start + len(chunk)
+        if chunk_end > offset and chunk_start < end:
+            start_in_chunk = max(0, offset - chunk_start)
+            stop_in_chunk = min(len(chunk), end - chunk_start)
+            values.extend(
+                chunk.slice(start_in_chunk, stop_in_chunk - start_in_chunk).to_pylist()
+            )
+            chunk_indexes.append(idx)
+        if chunk_end >= end:
+            break
+        chunk_start = chunk_end
+
+    return values, chunk_indexes
+
+
+def is_numeric_array(array: "pa.ChunkedArray") -> bool:
+
+    import pyarrow as pa
+
+    return pa.types.is_integer(array.type) or pa.types.is_floating(array.type)
+
+
+def _iter_float_chunks(array: "pa.ChunkedArray") -> Iterator["pa.Array"]:
+    """Iterate over the chunks of a numeric array as float arrays, without null and NaN values."""
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    for chunk in array.iterchunks():
+        values = pc.cast(chunk, pa.float64()).drop_null()
+        if pa.types.is_floating(chunk.type):
+            values = values.filter(pc.invert(pc.is_nan(values)))
+        if len(values):
+            yield values
+
+
+def compute_numeric_summary(
+    array: "pa.ChunkedArray",
+    num_bins: int = 20,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+) -> Dict[str, Any]:
+    """Compute summary statistics, (approximate) quantiles and a histogram for a numeric array.
+
+    All statistics are computed with Arrow kernels, chunk by chunk, so memory usage does not depend on
+    the size of the array. Quantiles are approximated with the t-digest algorithm, NaN values are ignored.
+    """
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    min_max = pc.min_max(array)
+    _min = min_max["min"].as_py()
+    _max = min_max["max"].as_py()
+
+    # mean and variance are merged over chunks (Chan et al.)
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for values in _iter_float_chunks(array):
+        chunk_count = len(values)
+        chunk_mean = pc.mean(values).as_py()
+        chunk_m2 = pc.variance(values, ddof=0).as_py() * chunk_count
+        total = count + chunk_count
+        delta = chunk_mean - mean
+        mean = mean + delta * chunk_count / total
+        m2 = m2 + chunk_m2 + delta * delta * count * chunk_count / total
+        count = total
+
+    summary: Dict[str, Any] = {
+        "count": count,
+        "null_count": array.null_count,
+        "min": _min,
+        "max": _max,
+        "mean": mean if count else None,
+        "std": math.sqrt(m2 / count) if count else None,
+        "quantiles": {},
+        "histogram": None,
+    }
+
+    if not count:
+        return summary
+
+    summary["quantiles"] = dict(
+        zip(quantiles, pc.tdigest(array, q=list(quantiles)).to_pylist())
+    )
+
+    _min = float(_min)
+    _max = float(_max)
+    if _min == _max:
+        summary["histogram"] = {"bin_edges": [_min, _max], "counts": [count]}
+        return summary
+
+    width = (_max - _min) / num_bins
+    counts = [0] * num_bins
+    for values in _iter_float_chunks(array):
+        bins = pc.cast(
+            pc.floor(pc.divide(pc.subtract(values, _min), width)), pa.int64()
+        )
+        # the maximum value belongs to the last bin
+        bins = pc.min_element_wise(bins, num_bins - 1)
+        bin_counts = pc.value_counts(bins)
+        for bin_idx, bin_count in zip(
+            bin_counts.field("values").to_pylist(),
+            bin_counts.field("counts").to_pylist(),
+        ):
+            counts[bin_idx] += bin_count
+
+    summary["histogram"] = {
+        "bin_edges": [_min + idx * width for idx in range(num_bins)] + [_max],
+        "counts": counts,
+    }
+    return summary
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Union
+
+import orjson
+
+from kiara_plugin.streamlit.defaults import (
+    DEFAULT_PREVIEW_ARTIFACT_MAX_AGE,
+    DEFAULT_PREVIEW_ARTIFACT_ROWS,
+    DEFAULT_PREVIEW_ARTIFACT_STORE_SIZE,
+    DEFAULT_PREVIEW_CACHE_SIZE,
+)
+from kiara_plugin.streamlit.models import PreviewArtifact
+from kiara_plugin.streamlit.utils.caching import BoundedCache
+
+if TYPE_CHECKING:
+    from kiara.api import Value
+
+
+def _to_json_data(data: Any) -> Any:
+    """Convert (nested) python data into something that only contains json types."""
+
+    return orjson.loads(orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS))
+
+
+def create_preview_artifact(
+    value: "Value",
+    max_rows: int = DEFAULT_PREVIEW_ARTIFACT_ROWS,
+) -> Union[PreviewArtifact, None]:
+    """Create a small preview for a value, returns 'None' if there is no preview type for its data type.
+
+    Only tables get a ('table_head') preview (schema, row count and first rows): files are previewed by reading their first bytes, and strings are small enough to be previewed directly.
+    """
+
+    if not value.is_set or value.data_type_name != "table":
+        return None
+
+    arrow_table = value.data.arrow_table
+    head = arrow_table.slice(0, max_rows)
+    data: Dict[str, Any] = {
+        "num_rows": arrow_table.num_rows,
+        "schema": {field.name: str(field.type) for field in arrow_table.schema},
+        "rows": _to_json_data(head.to_pydict()),
+    }
+
+    return PreviewArtifact(
+        value_id=value.value_id,
+        data_type=value.data_type_name,
+        artifact_type="table_head",
+        data=data,
+    )
+
+
+class PreviewArtifactStore(object):
+    """Stores precomputed previews as json files (one per value), and computes them in a background thread.
+
+    After an artifact was stored, artifacts that were not used for 'max_age' seconds are deleted, as well as the least recently used ones while all artifacts together are larger than 'max_size' bytes.
+
+    Loaded artifacts are kept in memory (up to 'max_cached' of them), so reruns don't read and parse their files again (and only their first use in a process counts for pruning).
+    """
+
+    def __init__(
+        self,
+        base_path: str,
+        max_workers: int = 1,
+        max_size: int = DEFAULT_PREVIEW_ARTIFACT_STORE_SIZE,
+        max_age: float = DEFAULT_PREVIEW_ARTIFACT_MAX_AGE,
+        max_cached: int = DEFAULT_PREVIEW_CACHE_SIZE,
+    ):
+
+        self._base_path: str = base_path
+        self._executor: Union[ThreadPoolExecutor, None] = None
+        self._max_workers: int = max_workers
+        self._max_size: int = max_size
+        self._max_age: float = max_age
+        self._lock = threading.Lock()
+        self._artifacts: BoundedCache[PreviewArtifact] = BoundedCache(
+            max_items=max_cached
+        )
+
+    @property
+    def base_path(self) -> str:
+        return self._base_path
+
+    def _get_path(self, value_id: uuid.UUID) -> str:
+        return os.path.join(self._base_path, f"{value_id}.json")
+
+    def has_artifact(self, value_id: uuid.UUID) -> bool:
+        return os.path.exists(self._get_path(value_id))
+
+    def get_artifact(self, value_id: uuid.UUID) -> Union[PreviewArtifact, None]:
+
+        # values are immutable, so a loaded artifact stays valid (even if its file gets pruned)
+        artifact = self._artifacts.get(value_id)
+        if artifact is not None:
+            return artifact
+
+        path = self._get_path(value_id)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                artifact = PreviewArtifact.model_validate_json(f.read())
+            # the modification time marks the last use, for pruning
+            os.utime(path)
+        except Exception:
+            # an invalid (e.g. outdated) artifact is treated as not available
+            return None
+
+        self._artifacts.set(value_id, artifact)
+        return artifact
+
+    def store_artifact(self, artifact: PreviewArtifact) -> None:
+
+        os.makedirs(self._base_path, exist_ok=True)
+        path = self._get_path(artifact.value_id)
+        tmp_path = f"{path}.{uuid.uuid4()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(artifact.model_dump_json().encode("utf-8"))
+        os.replace(tmp_path, path)
+        self.prune()
+
+    def prune(self) -> int:
+        """Delete artifacts that are too old, or the least recently used ones if the store is too large.
+
+        Returns:
+            the number of deleted artifacts
+        """
+
+        try:
+            with os.scandir(self._base_path) as entries:
+                files = [
+                    (e.stat().st_mtime, e.stat().st_size, e.path)
+                    for e in entries
+                    if e.is_file() and e.name.endswith(".json")
+                ]
+        except FileNotFoundError:
+            return 0
+
+        files.sort()
+        total_size = sum(size for _, size, _ in files)
+        min_mtime = time.time() - self._max_age
+
+        deleted = 0
+        for mtime, size, path in files:
+            if mtime >= min_mtime and total_size <= self._max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+            deleted += 1
+        return deleted
+
+    def create_artifact(self, value: "Value") -> Union[PreviewArtifact, None]:
+        """Create and store the preview artifact for a value, if none exists yet."""
+
+        existing = self.get_artifact(value.value_id)
+        if existing is not None:
+            return existing
+
+        artifact = create_preview_artifact(value)
+        if artifact is not None:
+            self.store_artifact(artifact)
+        return artifact
+
+    def submit(self, value: "Value") -> "Future[Union[PreviewArtifact, None]]":
+        """Create the preview artifact for a value in a background thread."""
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="kiara_preview_artifacts",
+                )
+            return self._executor.submit(self.create_artifact, value)
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import threading
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar, Union
+
+CACHE_VALUE_TYPE = TypeVar("CACHE_VALUE_TYPE")
+
+
+class BoundedCache(Generic[CACHE_VALUE_TYPE]):
+    """A thread-safe, in-memory cache that evicts the least recently used items once it holds 'max_items' items."""
+
+    def __init__(self, max_items: int):
+
+        self._max_items: int = max_items
+        self._items: OrderedDict[Hashable, CACHE_VALUE_TYPE] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Union[CACHE_VALUE_TYPE, None]:
+
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def set(self, key: Hashable, value: CACHE_VALUE_TYPE) -> None:
+
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self._max_items:
+                self._items.popitem(last=False)
+
+    def remove(self, key: Hashable) -> None:
+
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+
+        with self._lock:
+            self._items.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
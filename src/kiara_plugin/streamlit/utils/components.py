@@ -50,3 +50,29 @@ def create_list_component(
                 selected_item = method_list.selected_rows[0][title]
 
     return selected_item
+
+
+def create_column_selector(
+    st: DeltaGenerator,
+    key: str,
+    column_names: List[str],
+    default: Union[None, List[str]] = None,
+) -> List[str]:
+    """Render a multiselect for the columns of a table, and return the selected column names (in table order).
+
+    If no column is selected, all columns are returned.
+    """
+
+    if default:
+        default = [c for c in default if c in column_names]
+
+    selected = st.multiselect(
+        "Columns",
+        column_names,
+        default=default or None,
+        help="Only the selected columns are loaded and displayed (all columns, if none is selected).",
+        key=f"{key}_columns",
+    )
+    if not selected:
+        return list(column_names)
+    return [c for c in column_names if c in selected]
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+import os
+import queue
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator, List, Sequence, Union
+from urllib.parse import quote
+
+from kiara_plugin.streamlit.defaults import (
+    DEFAULT_PREVIEW_CACHE_SIZE,
+    DEFAULT_QUERY_TIMEOUT,
+)
+from kiara_plugin.streamlit.utils.caching import BoundedCache
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# the number of sqlite virtual machine instructions between two checks of the query timeout
+PROGRESS_HANDLER_INTERVAL = 10000
+
+
+def quote_identifier(identifier: str) -> str:
+    """Quote a table or column name for use in a sqlite query."""
+
+    escaped = identifier.replace('"', '""')
+    return f'"{escaped}"'
+
+
+class SQLiteReader(object):
+    """Read-only, pooled access to a sqlite database file.
+
+    Connections are opened in read-only mode, and every query is interrupted (via a sqlite progress handler) if it runs longer than the timeout.
+    """
+
+    def __init__(
+        self,
+        db_file_path: str,
+        pool_size: int = 4,
+        timeout: Union[float, None] = DEFAULT_QUERY_TIMEOUT,
+    ):
+
+        self._db_file_path: str = os.path.abspath(db_file_path)
+        self._timeout: Union[float, None] = timeout
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=pool_size)
+        self._table_columns: BoundedCache[List[str]] = BoundedCache(
+            max_items=DEFAULT_PREVIEW_CACHE_SIZE
+        )
+        self._row_counts: BoundedCache[int] = BoundedCache(
+            max_items=DEFAULT_PREVIEW_CACHE_SIZE
+        )
+
+    @property
+    def db_file_path(self) -> str:
+        return self._db_file_path
+
+    def _connect(self) -> sqlite3.Connection:
+
+        uri = f"file:{quote(self._db_file_path)}?mode=ro"
+        return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    @contextmanager
+    def connection(
+        self, timeout: Union[float, None] = None
+    ) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection from the pool, with the query timeout enforced while it is in use."""
+
+        if timeout is None:
+            timeout = self._timeout
+
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+
+        if timeout:
+            deadline = time.monotonic() + timeout
+
+            def _check_deadline() -> int:
+                # a non-zero return value interrupts the running query
+                return 1 if time.monotonic() > deadline else 0
+
+            conn.set_progress_handler(_check_deadline, PROGRESS_HANDLER_INTERVAL)
+
+        try:
+            yield conn
+        except sqlite3.OperationalError as e:
+            if timeout and "interrupted" in str(e):
+                raise TimeoutError(f"Query did not finish within {timeout} seconds.")
+            raise e
+        finally:
+            conn.set_progress_handler(None, 0)
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def _execute(
+        self,
+        sql: str,
+        parameters: Sequence[Any] = (),
+        timeout: Union[float, None] = None,
+    ) -> List[Any]:
+
+        with self.connection(timeout=timeout) as conn:
+            return conn.execute(sql, parameters).fetchall()
+
+    def get_table_names(self) -> List[str]:
+
+        rows = self._execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        )
+        return [row[0] for row in rows]
+
+    def get_column_names(self, table_name: str) -> List[str]:
+
+        columns = self._table_columns.get(table_name)
+        if columns is None:
+            rows = self._execute(f"PRAGMA table_info({quote_identifier(table_name)})")
+            columns = [row[1] for row in rows]
+            if not columns:
+                raise ValueError(f"No table with name '{table_name}' in database.")
+            self._table_columns.set(table_name, columns)
+        return columns
+
+    def count_rows(self, table_name: str, timeout: Union[float, None] = None) -> int:
+        """Return the number of rows of a table.
+
+        The database file is opened read-only, so the count is only computed once per table.
+        """
+
+        num_rows = self._row_counts.get(table_name)
+        if num_rows is None:
+            self.get_column_names(table_name)
+            sql = f"SELECT COUNT(*) FROM {quote_identifier(table_name)}"  # noqa
+            rows = self._execute(sql, timeout=timeout)
+            num_rows = rows[0][0]
+            self._row_counts.set(table_name, num_rows)
+        return num_rows
+
+    def read_rows(
+        self,
+        table_name: str,
+        offset: int = 0,
+        limit: Union[int, None] = None,
+        columns: Union[Sequence[str], None] = None,
+        timeout: Union[float, None] = None,
+    ) -> "pd.DataFrame":
+        """Read a page of rows (and optionally only a subset of the columns) of a table."""
+
+        import pandas as pd
+
+        all_columns = self.get_column_names(table_name)
+        if columns:
+            invalid = [c for c in columns if c not in all_columns]
+            if invalid:
+                raise ValueError(
+                    f"Invalid column name(s) for table '{table_name}': {', '.join(invalid)}."
+                )
+            selected = list(columns)
+        else:
+            selected = all_columns
+
+        column_list = ", ".join(quote_identifier(c) for c in selected)
+        sql = f"SELECT {column_list} FROM {quote_identifier(table_name)} LIMIT ? OFFSET ?"  # noqa
+        rows = self._execute(
+            sql, (-1 if limit is None else limit, offset), timeout=timeout
+        )
+        return pd.DataFrame.from_records(rows, columns=selected)
+
+    def close(self):
+
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+
+_READERS: BoundedCache[SQLiteReader] = BoundedCache(
+    max_items=DEFAULT_PREVIEW_CACHE_SIZE
+)
+
+
+def get_sqlite_reader(db_file_path: str) -> SQLiteReader:
+    """Return the (shared) reader for a sqlite database file."""
+
+    db_file_path = os.path.abspath(db_file_path)
+    reader = _READERS.get(db_file_path)
+    if reader is None:
+        reader = SQLiteReader(db_file_path)
+        _READERS.set(db_file_path, reader)
+    return reader
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Literal, NamedTuple, Union
+from urllib.parse import unquote, urlparse
+
+from kiara.exceptions import KiaraException
+from kiara_plugin.streamlit.defaults import (
+    DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    DEFAULT_DOWNLOAD_MAX_RETRIES,
+    DEFAULT_DOWNLOAD_RETRY_WAIT,
+    DEFAULT_DOWNLOAD_TIMEOUT,
+    DEFAULT_DOWNLOAD_WORKERS,
+)
+
+DOWNLOAD_STATE = Literal["pending", "running", "finished", "failed"]
+
+# status codes of responses that might succeed if the request is retried
+RETRY_STATUS_CODES = [408, 425, 429, 500, 502, 503, 504]
+
+
+class IncompleteDownloadError(Exception):
+    """Raised if the remote server closed a response before all content was sent."""
+
+
+def get_file_name_from_url(url: str) -> str:
+    """Return the file name for a download, i.e. the last segment of the url path."""
+
+    file_name = os.path.basename(unquote(urlparse(url).path))
+    if not file_name or file_name in [".", ".."]:
+        return "download"
+    return file_name
+
+
+def _get_total_size(headers: Dict[str, str], offset: int) -> Union[int, None]:
+
+    content_range = headers.get("content-range", None)
+    if content_range:
+        match = re.match(r"bytes \d+-\d+/(\d+)", content_range)
+        if match:
+            return int(match.group(1))
+        return None
+
+    content_length = headers.get("content-length", None)
+    if content_length is None or headers.get("content-encoding", None):
+        # the length of encoded content is not the length of the file
+        return None
+    return offset + int(content_length)
+
+
+def _get_validator(headers: Dict[str, str]) -> Union[str, None]:
+    """Return the (strong) ETag or the last modification date of a response, to make sure a resumed download continues the same file."""
+
+    etag = headers.get("etag", None)
+    if etag and not etag.startswith("W/"):
+        # weak ETags can't be used in 'If-Range' headers
+        return etag
+    return headers.get("last-modified", None)
+
+
+def download_to_file(
+    url: str,
+    path: str,
+    chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    max_retries: int = DEFAULT_DOWNLOAD_MAX_RETRIES,
+    retry_wait: float = DEFAULT_DOWNLOAD_RETRY_WAIT,
+    timeout: float = DEFAULT_DOWNLOAD_TIMEOUT,
+    on_progress: Union[Callable[[int, Union[int, None]], None], None] = None,
+) -> List[Dict[str, str]]:
+    """Download the content of an url to a file, chunk by chunk.
+
+    The content is written to '<path>.partial' first. If the connection is interrupted (or the server responds with a temporary error), the download is retried up to 'max_retries' times, resuming from the already downloaded bytes via a HTTP range request if the server supports it. A partial file left behind by an earlier (failed) call is resumed as well.
+
+    Range requests are made conditional (via 'If-Range') on the ETag or modification date of the first response, which is kept in '<path>.partial.validator'. If the remote file changed in the meantime, the server sends the whole file again, and the download starts over. Without such a validator, downloads are never resumed.
+
+    Arguments:
+        url: the url of the file
+        path: the path of the downloaded file
+        chunk_size: the number of bytes that are buffered before they are written
+        max_retries: the maximum number of retries
+        retry_wait: the number of seconds to wait before the first retry (doubled for every further retry)
+        timeout: the number of seconds to wait for the remote server
+        on_progress: a callback that is called with the number of downloaded bytes, and the total number of bytes (if known)
+
+    Returns:
+        the response headers of the (last) request, and of the redirects that lead to it
+    """
+
+    import httpx
+
+    partial_path = f"{path}.partial"
+    validator_path = f"{partial_path}.validator"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    attempt = 0
+    while True:
+        validator = None
+        if os.path.exists(partial_path) and os.path.exists(validator_path):
+            with open(validator_path) as f:
+                validator = f.read().strip() or None
+        offset = os.path.getsize(partial_path) if validator else 0
+        request_headers = (
+            {"Range": f"bytes={offset}-", "If-Range": validator} if offset else {}
+        )
+        try:
+            with httpx.stream(
+                "GET",
+                url,
+                headers=request_headers,
+                follow_redirects=True,
+                timeout=timeout,
+            ) as response:
+                if offset and response.status_code == 416:
+                    # the partial file does not match the remote file (anymore)
+                    os.remove(partial_path)
+                    os.remove(validator_path)
+                    raise IncompleteDownloadError(
+                        "Requested range not satisfiable, restarting download."
+                    )
+                if response.status_code in RETRY_STATUS_CODES:
+                    raise IncompleteDownloadError(
+                        f"Server responded with status code {response.status_code}."
+                    )
+                if response.status_code < 200 or response.status_code >= 400:
+                    raise KiaraException(
+                        f"Could not download file from {url}: status code {response.status_code}."
+                    )
+
+                if response.status_code != 206:
+                    # the server does not support range requests (or the remote file changed), so the download starts over
+                    offset = 0
+                    validator = _get_validator(dict(response.headers))
+                    if validator:
+                        with open(validator_path, "w") as f:
+                            f.write(validator)
+                    elif os.path.exists(validator_path):
+                        os.remove(validator_path)
+                total = _get_total_size(dict(response.headers), offset)
+                if on_progress is not None:
+                    on_progress(offset, total)
+
+                # chunks are written as they arrive (and buffered by the file), so an interrupted response loses no data
+                with open(
+                    partial_path, "ab" if offset else "wb", buffering=chunk_size
+                ) as f:
+                    for chunk in response.iter_bytes():
+                        f.write(chunk)
+                        offset += len(chunk)
+                        if on_progress is not None:
+                            on_progress(offset, total)
+
+                if total is not None and offset < total:
+                    raise IncompleteDownloadError(
+                        f"Received {offset} of {total} bytes."
+                    )
+
+                headers = [dict(response.headers)]
+                headers.extend(dict(r.headers) for r in response.history)
+
+            os.replace(partial_path, path)
+            if os.path.exists(validator_path):
+                os.remove(validator_path)
+            return headers
+
+        except (httpx.TransportError, IncompleteDownloadError) as e:
+            attempt += 1
+            if attempt > max_retries:
+                raise KiaraException(
+                    f"Could not download file from {url} (after {max_retries} retries): {e}"
+                )
+            time.sleep(retry_wait * 2 ** (attempt - 1))
+
+
+class DownloadStatus(NamedTuple):
+    """The state of a (background) download."""
+
+    download_id: str
+    url: str
+    file_name: str
+    path: str
+    state: DOWNLOAD_STATE
+    num_bytes: int = 0
+    total_bytes: Union[int, None] = None
+    error: Union[str, None] = None
+    request_time: Union[str, None] = None
+    response_headers: Union[List[Dict[str, str]], None] = None
+
+    @property
+    def fraction(self) -> Union[float, None]:
+        """The downloaded fraction of the file, if its size is known."""
+
+        if not self.total_bytes:
+            return None
+        return min(1.0, self.num_bytes / self.total_bytes)
+
+
+class DownloadManager(object):
+    """Runs downloads in background threads, and keeps track of their progress.
+
+    Downloads are identified by their url: starting the download of an url that is already downloading (or downloaded, and its file still exists) returns the existing download, starting a failed download again resumes it from the already downloaded bytes.
+    """
+
+    def __init__(
+        self,
+        base_path: str,
+        max_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+        chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+        max_retries: int = DEFAULT_DOWNLOAD_MAX_RETRIES,
+        retry_wait: float = DEFAULT_DOWNLOAD_RETRY_WAIT,
+        timeout: float = DEFAULT_DOWNLOAD_TIMEOUT,
+    ):
+
+        self._base_path: str = os.path.abspath(base_path)
+        self._max_workers: int = max_workers
+        self._chunk_size: int = chunk_size
+        self._max_retries: int = max_retries
+        self._retry_wait: float = retry_wait
+        self._timeout: float = timeout
+        self._executor: Union[ThreadPoolExecutor, None] = None
+        self._lock = threading.Lock()
+        self._downloads: Dict[str, DownloadStatus] = {}
+        self._download_ids: Dict[str, str] = {}
+
+    @property
+    def base_path(self) -> str:
+        return self._base_path
+
+    def _update(self, download_id: str, **kwargs) -> None:
+
+        with self._lock:
+            self._downloads[download_id] = self._downloads[download_id]._replace(
+                **kwargs
+            )
+
+    def _run(self, download_id: str) -> None:
+
+        status = self._downloads[download_id]
+        self._update(download_id, state="running", error=None)
+
+        def on_progress(num_bytes: int, total_bytes: Union[int, None]):
+            self._update(download_id, num_bytes=num_bytes, total_bytes=total_bytes)
+
+        try:
+            headers = download_to_file(
+                status.url,
+                status.path,
+                chunk_size=self._chunk_size,
+                max_retries=self._max_retries,
+                retry_wait=self._retry_wait,
+                timeout=self._timeout,
+                on_progress=on_progress,
+            )
+        except Exception as e:
+            error = KiaraException.get_root_details(e) or str(e)
+            self._update(download_id, state="failed", error=error)
+            return
+
+        self._update(download_id, state="finished", response_headers=headers)
+
+    def start(self, url: str) -> str:
+        """Start downloading an url in the background (unless it is already downloading, or downloaded), and return the id of the download."""
+
+        with self._lock:
+            download_id = self._download_ids.get(url, None)
+            if download_id is not None:
+                status = self._downloads[download_id]
+                if status.state != "failed" and (
+                    status.state != "finished" or os.path.isfile(status.path)
+                ):
+                    return download_id
+            else:
+                download_id = uuid.uuid4().hex
+                self._download_ids[url] = download_id
+
+            file_name = get_file_name_from_url(url)
+            self._downloads[download_id] = DownloadStatus(
+                download_id=download_id,
+                url=url,
+                file_name=file_name,
+                path=os.path.join(self._base_path, download_id, file_name),
+                state="pending",
+                request_time=datetime.now(timezone.utc).isoformat(),
+            )
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="kiara_downloads",
+                )
+            self._executor.submit(self._run, download_id)
+
+        return download_id
+
+    def set_path(self, download_id: str, path: str) -> None:
+        """Record that the file of a finished download was moved (e.g. into a staging area).
+
+        The download is not repeated when it is started again, as long as the file exists at its new path.
+        """
+
+        self._update(download_id, path=path)
+
+    def get_status(self, download_id: str) -> DownloadStatus:
+        """Return the current state of a download."""
+
+        with self._lock:
+            status = self._downloads.get(download_id, None)
+        if status is None:
+            raise KiaraException(f"No download with id: {download_id}")
+        return status
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+import fnmatch
+import mmap
+import os
+from typing import TYPE_CHECKING, List, Tuple, Union
+
+from kiara_plugin.streamlit.defaults import (
+    DEFAULT_FILE_PREVIEW_MAX_BYTES,
+    DEFAULT_FILE_PREVIEW_MAX_LINES,
+)
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+    from kiara.models.filesystem import KiaraFileBundle
+
+# the number of bytes that are inspected to decide whether a file is binary
+BINARY_DETECTION_SAMPLE_SIZE = 8192
+
+_TEXT_CHARS = bytes({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7F})
+
+
+def is_binary_content(sample: bytes) -> bool:
+    """Guess whether the provided bytes are (the start of) binary content.
+
+    Any NUL byte marks the content as binary, otherwise the share of control characters decides. Bytes
+    outside the ascii range count as text, so utf-8 and latin-1 encoded text is recognized as such.
+    """
+
+    if not sample:
+        return False
+
+    if b"\x00" in sample:
+        return True
+
+    non_text = sample.translate(None, _TEXT_CHARS)
+    return len(non_text) / len(sample) > 0.3
+
+
+def read_file_range(path: str, offset: int, length: int) -> bytes:
+    """Read a byte range from a file, using a memory map so the file is never loaded as a whole.
+
+    Arguments:
+        path: the path to the file
+        offset: the start of the range (clamped to the file size)
+        length: the maximum number of bytes to read
+    """
+
+    size = os.path.getsize(path)
+    if size == 0 or length <= 0:
+        return b""
+
+    offset = max(0, min(offset, size))
+    end = min(size, offset + length)
+    if offset >= end:
+        return b""
+
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[offset:end]
+
+
+def is_binary_file(path: str) -> bool:
+    """Check whether a file is binary, by only looking at its first few kilobytes."""
+
+    sample = read_file_range(path, 0, BINARY_DETECTION_SAMPLE_SIZE)
+    return is_binary_content(sample)
+
+
+def read_file_head(path: str, max_bytes: int, max_lines: int = -1) -> Tuple[str, bool]:
+    """Read text from the start of a file.
+
+    Arguments:
+        path: the path to the file
+        max_bytes: the maximum number of bytes to read
+        max_lines: the maximum number of lines to return, no limit if smaller than 1
+
+    Returns:
+        a tuple containing the text, and whether there is more content after it
+    """
+
+    size = os.path.getsize(path)
+    data = read_file_range(path, 0, max_bytes)
+    truncated = len(data) < size
+
+    text = data.decode("utf-8", errors="replace")
+    if max_lines > 0:
+        lines = text.splitlines(keepends=True)
+        if len(lines) > max_lines:
+            lines = lines[0:max_lines]
+            truncated = True
+        text = "".join(lines)
+
+    return text, truncated
+
+
+def read_file_tail(path: str, max_bytes: int, max_lines: int = -1) -> Tuple[str, bool]:
+    """Read text from the end of a file.
+
+    Arguments:
+        path: the path to the file
+        max_bytes: the maximum number of bytes to read
+        max_lines: the maximum number of lines to return, no limit if smaller than 1
+
+    Returns:
+        a tuple containing the text, and whether there is more content before it
+    """
+
+    size = os.path.getsize(path)
+    offset = max(0, size - max_bytes)
+    data = read_file_range(path, offset, max_bytes)
+    truncated = offset > 0
+
+    text = data.decode("utf-8", errors="replace")
+    lines = text.splitlines(keepends=True)
+    if truncated and len(lines) > 1:
+        # the first line is most likely incomplete
+        lines = lines[1:]
+    if max_lines > 0 and len(lines) > max_lines:
+        lines = lines[-max_lines:]
+        truncated = True
+
+    return "".join(lines), truncated
+
+
+def format_hex_dump(data: bytes, offset: int = 0, bytes_per_line: int = 16) -> str:
+    """Format bytes as a classic hex dump (offset, hex values, printable characters)."""
+
+    result: List[str] = []
+    for idx in range(0, len(data), bytes_per_line):
+        chunk = data[idx : idx + bytes_per_line]
+        hex_part = " ".join(f"{b:02x}" for b in chunk)
+        text_part = "".join(chr(b) if 0x20 <= b < 0x7F else "." for b in chunk)
+        result.append(
+            f"{offset + idx:08x}  {hex_part:<{bytes_per_line * 3 - 1}}  |{text_part}|"
+        )
+
+    return "\n".join(result)
+
+
+def read_file_preview(
+    path: str,
+    section: str = "head",
+    offset: int = 0,
+    max_bytes: int = DEFAULT_FILE_PREVIEW_MAX_BYTES,
+    max_lines: int = DEFAULT_FILE_PREVIEW_MAX_LINES,
+    binary: Union[bool, None] = None,
+) -> Tuple[str, bool]:
+    """Create a (text) preview of a part of a file, without reading the whole file.
+
+    Binary files are rendered as hex dump, with 'max_lines' rows of 16 bytes each.
+
+    Arguments:
+        path: the path to the file
+        section: the part of the file to preview, either 'head', 'tail' or 'range' (starting at 'offset')
+        offset: the byte offset to start reading from, only used for the 'range' section
+        max_bytes: the maximum number of bytes to read
+        max_lines: the maximum number of lines to return, no limit if smaller than 1
+        binary: whether the file is binary, will be auto-detected if not provided
+
+    Returns:
+        a tuple containing the preview text, and whether the preview is truncated
+    """
+
+    if binary is None:
+        binary = is_binary_file(path)
+
+    size = os.path.getsize(path)
+
+    if binary:
+        length = max_bytes
+        if max_lines > 0:
+            length = min(length, max_lines * 16)
+        if section == "head":
+            offset = 0
+        elif section == "tail":
+            offset = max(0, size - length)
+            # align to the hex dump rows
+            offset = offset - (offset % 16)
+            length = size - offset
+        elif section != "range":
+            raise ValueError(f"Invalid file preview section: {section}")
+        data = read_file_range(path, offset, length)
+        truncated = offset > 0 or offset + len(data) < size
+        return format_hex_dump(data, offset=offset), truncated
+
+    if section == "head":
+        return read_file_head(path, max_bytes=max_bytes, max_lines=max_lines)
+    elif section == "tail":
+        return read_file_tail(path, max_bytes=max_bytes, max_lines=max_lines)
+    elif section == "range":
+        data = read_file_range(path, offset, max_bytes)
+        truncated = offset > 0 or offset + len(data) < size
+        text = data.decode("utf-8", errors="replace")
+        if max_lines > 0:
+            lines = text.splitlines(keepends=True)
+            if len(lines) > max_lines:
+                text = "".join(lines[0:max_lines])
+                truncated = True
+        return text, truncated
+    else:
+        raise ValueError(f"Invalid file preview section: {section}")
+
+
+def create_file_bundle_listing(bundle: "KiaraFileBundle") -> "pa.Table":
+    """Create an Arrow table with the path, size and mime-type of every file in a file bundle."""
+
+    import pyarrow as pa
+
+    paths = list(bundle.included_files.keys())
+    files = bundle.included_files.values()
+    return pa.table(
+        {
+            "path": pa.array(paths, type=pa.string()),
+            "size": pa.array((f.size for f in files), type=pa.int64()),
+            "mime_type": pa.array((f.mime_type for f in files), type=pa.string()),
+        }
+    )
+
+
+def filter_file_listing(listing: "pa.Table", pattern: str) -> "pa.Table":
+    """Filter a file listing by path.
+
+    If the pattern contains a glob wildcard ('*', '?', '['), paths need to match it as a whole, otherwise
+    all paths that contain the pattern are returned.
+    """
+
+    import pyarrow.compute as pc
+
+    pattern = pattern.strip()
+    if not pattern:
+        return listing
+
+    if any(c in pattern for c in "*?["):
+        regex = fnmatch.translate(pattern)
+        # Arrow uses RE2, which does not support python's end-of-string anchor
+        if regex.endswith("\\Z"):
+            regex = f"{regex[0:-2]}$"
+        mask = pc.match_substring_regex(listing.column("path"), pattern=f"^{regex}")
+    else:
+        mask = pc.match_substring(listing.column("path"), pattern=pattern)
+
+    return listing.filter(mask)
+
+
+def aggregate_file_listing(listing: "pa.Table") -> "pa.Table":
+    """Compute the number of files and their total/average size per mime-type for a file listing."""
+
+    aggregated = listing.group_by("mime_type").aggregate(
+        [("path", "count"), ("size", "sum"), ("size", "mean")]
+    )
+    return aggregated.select(["mime_type", "path_count", "size_sum", "size_mean"])
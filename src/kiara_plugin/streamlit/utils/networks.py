@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+import random
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Sequence, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pyarrow as pa
+
+SOURCE_COLUMN_NAMES = ("_source", "source")
+TARGET_COLUMN_NAMES = ("_target", "target")
+NODE_ID_COLUMN_NAMES = ("_node_id", "id")
+LABEL_COLUMN_NAMES = ("_label", "label")
+
+SAMPLE_STRATEGIES = ("top_degree", "k_hop", "random_walk")
+
+
+def find_column(
+    table: "pa.Table", candidates: Iterable[str], required: bool = True
+) -> Union[str, None]:
+    """Return the name of the first column of the table that is in the list of candidates."""
+
+    for candidate in candidates:
+        if candidate in table.column_names:
+            return candidate
+
+    if required:
+        raise ValueError(
+            f"Can't find column in table, none of these exist: {', '.join(candidates)}."
+        )
+    return None
+
+
+class NetworkSample(NamedTuple):
+    """A bounded sample of a network."""
+
+    nodes: List[Any]
+    edges: "pa.Table"
+    truncated: bool
+
+
+class NetworkIndex(object):
+    """An (undirected) adjacency index over the edges table of a network.
+
+    Both edge directions are sorted by node id once (on first use), after that the neighbors of a node can be looked up via binary search, so sampling a bounded subgraph does not depend on the size of the network.
+    """
+
+    def __init__(self, edges: "pa.Table", nodes: Union["pa.Table", None] = None):
+
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        self._edges: pa.Table = edges
+        self._nodes: Union[pa.Table, None] = nodes
+
+        self._source_column: str = find_column(edges, SOURCE_COLUMN_NAMES)  # type: ignore
+        self._target_column: str = find_column(edges, TARGET_COLUMN_NAMES)  # type: ignore
+
+        source = edges.column(self._source_column)
+        target = edges.column(self._target_column)
+        if source.type != target.type:
+            target = target.cast(source.type)
+
+        ends = pa.chunked_array(source.chunks + target.chunks, type=source.type)
+        value_counts = pc.value_counts(ends)
+        self._degrees: pa.Table = pa.table(
+            {
+                "node": value_counts.field("values"),
+                "degree": value_counts.field("counts"),
+            }
+        ).filter(pc.is_valid(value_counts.field("values")))
+
+        # the sorted adjacency lists are only created once a sample strategy needs them
+        self._ends: Union["np.ndarray", None] = None
+        self._others: Union["np.ndarray", None] = None
+
+    def _create_adjacency(self) -> None:
+
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        source = self._edges.column(self._source_column)
+        target = self._edges.column(self._target_column)
+        if source.type != target.type:
+            target = target.cast(source.type)
+
+        ends = pa.chunked_array(source.chunks + target.chunks, type=source.type)
+        others = pa.chunked_array(target.chunks + source.chunks, type=source.type)
+
+        valid = pc.and_(pc.is_valid(ends), pc.is_valid(others))
+        ends = ends.filter(valid)
+        others = others.filter(valid)
+
+        order = pc.sort_indices(ends)
+        self._ends = ends.take(order).to_numpy()
+        self._others = others.take(order).to_numpy()
+
+    @property
+    def edges(self) -> "pa.Table":
+        return self._edges
+
+    @property
+    def source_column(self) -> str:
+        return self._source_column
+
+    @property
+    def target_column(self) -> str:
+        return self._target_column
+
+    @property
+    def degrees(self) -> "pa.Table":
+        """A table with the (undirected) degree of every node that has at least one edge."""
+        return self._degrees
+
+    def get_neighbors(self, node: Any) -> "np.ndarray":
+        """Return the ids of all nodes that share an edge with the provided node (incl. duplicates)."""
+
+        if self._ends is None or self._others is None:
+            self._create_adjacency()
+
+        start = self._ends.searchsorted(node, side="left")  # type: ignore
+        end = self._ends.searchsorted(node, side="right")  # type: ignore
+        return self._others[start:end]  # type: ignore
+
+    def get_top_degree_nodes(self, num_nodes: int) -> List[Any]:
+
+        import pyarrow.compute as pc
+
+        num_nodes = min(num_nodes, self._degrees.num_rows)
+        if num_nodes <= 0:
+            return []
+        idx = pc.select_k_unstable(
+            self._degrees, k=num_nodes, sort_keys=[("degree", "descending")]
+        )
+        top = self._degrees.take(idx).sort_by([("degree", "descending")])
+        return top.column("node").to_pylist()
+
+    def create_summary(self, num_top_nodes: int = 10) -> Dict[str, Any]:
+        """Compute graph-level statistics for the network."""
+
+        import pyarrow.compute as pc
+
+        num_edges = self._edges.num_rows
+        connected_nodes = self._degrees.num_rows
+        if self._nodes is not None:
+            num_nodes = max(self._nodes.num_rows, connected_nodes)
+        else:
+            num_nodes = connected_nodes
+
+        source = self._edges.column(self._source_column)
+        target = self._edges.column(self._target_column)
+        if source.type != target.type:
+            target = target.cast(source.type)
+        num_self_loops = pc.sum(pc.equal(source, target)).as_py() or 0
+
+        distinct_pairs = (
+            self._edges.select([self._source_column, self._target_column])
+            .group_by([self._source_column, self._target_column])
+            .aggregate([])
+            .num_rows
+        )
+
+        degrees = self._degrees.column("degree")
+        if connected_nodes:
+            min_max = pc.min_max(degrees)
+            min_degree = min_max["min"].as_py()
+            max_degree = min_max["max"].as_py()
+        else:
+            min_degree = max_degree = None
+        if num_nodes > connected_nodes:
+            min_degree = 0
+
+        if num_nodes > 1:
+            density = (
+                2 * (distinct_pairs - num_self_loops) / (num_nodes * (num_nodes - 1))
+            )
+        else:
+            density = None
+
+        top_nodes = self.get_top_degree_nodes(num_top_nodes)
+        return {
+            "num_nodes": num_nodes,
+            "num_edges": num_edges,
+            "num_isolated_nodes": num_nodes - connected_nodes,
+            "num_self_loops": num_self_loops,
+            "num_parallel_edges": num_edges - distinct_pairs,
+            "density": density,
+            "min_degree": min_degree,
+            "max_degree": max_degree,
+            "mean_degree": (2 * num_edges / num_nodes) if num_nodes else None,
+            "top_degree_nodes": top_nodes,
+        }
+
+    def get_subgraph_edges(self, nodes: Sequence[Any], max_edges: int) -> NetworkSample:
+        """Return (at most 'max_edges') edges whose source and target are both in the provided set of nodes."""
+
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        node_type = self._edges.column(self._source_column).type
+        value_set = pa.array(list(nodes), type=node_type)
+        mask = pc.and_(
+            pc.is_in(self._edges.column(self._source_column), value_set=value_set),
+            pc.is_in(
+                self._edges.column(self._target_column).cast(node_type),
+                value_set=value_set,
+            ),
+        )
+        edges = self._edges.filter(mask)
+        truncated = edges.num_rows > max_edges
+        if truncated:
+            edges = edges.slice(0, max_edges)
+        return NetworkSample(nodes=list(nodes), edges=edges, truncated=truncated)
+
+    def sample_top_degree(self, max_nodes: int, max_edges: int) -> NetworkSample:
+        """Sample the subgraph induced by the nodes with the highest degree."""
+
+        nodes = self.get_top_degree_nodes(max_nodes)
+        sample = self.get_subgraph_edges(nodes, max_edges=max_edges)
+        truncated = sample.truncated or self._degrees.num_rows > max_nodes
+        return sample._replace(truncated=truncated)
+
+    def sample_k_hop(
+        self, seed: Any, hops: int, max_nodes: int, max_edges: int
+    ) -> NetworkSample:
+        """Sample the k-hop neighborhood of a node (breadth first, until the node budget is used up)."""
+
+        visited: Dict[Any, None] = {seed: None}
+        frontier = [seed]
+        truncated = False
+        for _ in range(hops):
+            next_frontier = []
+            for node in frontier:
+                for neighbor in self.get_neighbors(node).tolist():
+                    if neighbor in visited:
+                        continue
+                    if len(visited) >= max_nodes:
+                        truncated = True
+                        break
+                    visited[neighbor] = None
+                    next_frontier.append(neighbor)
+                if truncated:
+                    break
+            if truncated or not next_frontier:
+                break
+            frontier = next_frontier
+
+        sample = self.get_subgraph_edges(list(visited.keys()), max_edges=max_edges)
+        return sample._replace(truncated=truncated or sample.truncated)
+
+    def sample_random_walk(
+        self,
+        seed: Any,
+        max_nodes: int,
+        max_edges: int,
+        restart_probability: float = 0.15,
+        max_steps: Union[int, None] = None,
+        random_seed: Any = None,
+    ) -> NetworkSample:
+        """Sample the nodes visited by a random walk (with restarts) that starts at the seed node."""
+
+        rng = random.Random(random_seed)
+        if max_steps is None:
+            max_steps = max_nodes * 50
+
+        visited: Dict[Any, None] = {seed: None}
+        current = seed
+        for _ in range(max_steps):
+            if len(visited) >= max_nodes:
+                break
+            neighbors = self.get_neighbors(current)
+            if len(neighbors) == 0 or rng.random() < restart_probability:
+                current = seed
+                continue
+            current = neighbors[rng.randrange(len(neighbors))]
+            if hasattr(current, "item"):
+                # numpy scalar
+                current = current.item()
+            visited[current] = None
+
+        sample = self.get_subgraph_edges(list(visited.keys()), max_edges=max_edges)
+        return sample._replace(truncated=len(visited) >= max_nodes or sample.truncated)
+
+
+def create_dot_graph(
+    sample: NetworkSample,
+    source_column: str,
+    target_column: str,
+    labels: Union[None, Dict[Any, str]] = None,
+    directed: bool = False,
+) -> str:
+    """Create a graphviz 'dot' string for a network sample."""
+
+    def _quote(item: Any) -> str:
+        text = str(item).replace("\\", "\\\\").replace('"', '\\"')
+        return f'"{text}"'
+
+    connector = "->" if directed else "--"
+    lines = ["digraph {" if directed else "graph {"]
+    for node in sample.nodes:
+        if labels and node in labels:
+            lines.append(f"  {_quote(node)} [label={_quote(labels[node])}];")
+        else:
+            lines.append(f"  {_quote(node)};")
+    for source, target in zip(
+        sample.edges.column(source_column).to_pylist(),
+        sample.edges.column(target_column).to_pylist(),
+    ):
+        lines.append(f"  {_quote(source)} {connector} {_quote(target)};")
+    lines.append("}")
+    return "\n".join(lines)
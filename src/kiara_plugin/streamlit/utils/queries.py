@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Mapping, NamedTuple, TypeVar, Union
+
+if TYPE_CHECKING:
+    import duckdb
+    import pyarrow as pa
+
+T = TypeVar("T")
+
+
+class QueryResultPage(NamedTuple):
+    """A page of a query result."""
+
+    table: "pa.Table"
+    offset: int
+    has_more: bool
+
+
+def create_query_connection(
+    tables: Mapping[str, "pa.Table"]
+) -> "duckdb.DuckDBPyConnection":
+    """Create an in-memory DuckDB connection with the provided Arrow tables registered as views (zero-copy).
+
+    Access to the filesystem and other external resources is disabled for the connection.
+    """
+
+    import duckdb
+
+    con = duckdb.connect(":memory:")
+    con.execute("SET enable_external_access=false")
+    for table_name, table in tables.items():
+        con.register(table_name, table)
+    return con
+
+
+def run_with_timeout(
+    con: "duckdb.DuckDBPyConnection",
+    func: Callable[["duckdb.DuckDBPyConnection"], T],
+    timeout: Union[float, None],
+) -> T:
+    """Run a function against a DuckDB connection, interrupting the connection if it does not finish within 'timeout' seconds."""
+
+    import duckdb
+
+    if not timeout or timeout <= 0:
+        return func(con)
+
+    timer = threading.Timer(timeout, con.interrupt)
+    timer.start()
+    try:
+        return func(con)
+    except duckdb.InterruptException:
+        raise TimeoutError(f"Query did not finish within {timeout} seconds.")
+    finally:
+        timer.cancel()
+
+
+def _strip_query(query: str) -> str:
+    return query.strip().rstrip(";").strip()
+
+
+def query_tables(
+    tables: Mapping[str, "pa.Table"],
+    query: str,
+    timeout: Union[float, None] = None,
+) -> "pa.Table":
+    """Run a SQL query against a set of Arrow tables, and return the full result."""
+
+    con = create_query_connection(tables)
+    try:
+        return run_with_timeout(
+            con,
+            lambda c: c.execute(_strip_query(query)).fetch_arrow_table(),
+            timeout=timeout,
+        )
+    finally:
+        con.close()
+
+
+def query_tables_page(
+    tables: Mapping[str, "pa.Table"],
+    query: str,
+    offset: int,
+    limit: int,
+    timeout: Union[float, None] = None,
+) -> QueryResultPage:
+    """Run a SQL query against a set of Arrow tables, and return one page of the result.
+
+    The limit is pushed down into the query, so DuckDB stops processing once the page (plus one row, to determine whether there is more) is complete.
+    """
+
+    # the query is wrapped on its own lines, so a trailing '-- comment' can't comment out the rest of the wrapper
+    sql = (
+        f"SELECT * FROM (\n{_strip_query(query)}\n) AS __query LIMIT ? OFFSET ?"  # noqa
+    )
+
+    def _run(c: "duckdb.DuckDBPyConnection") -> Any:
+        return c.execute(sql, [limit + 1, offset]).fetch_arrow_table()
+
+    con = create_query_connection(tables)
+    try:
+        result = run_with_timeout(con, _run, timeout=timeout)
+    finally:
+        con.close()
+
+    has_more = result.num_rows > limit
+    if has_more:
+        result = result.slice(0, limit)
+    return QueryResultPage(table=result, offset=offset, has_more=has_more)
@@ -0,0 +1,430 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+import shutil
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    NamedTuple,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from kiara_plugin.streamlit.defaults import (
+    DEFAULT_UPLOAD_CHUNK_SIZE,
+    DEFAULT_UPLOAD_STAGING_ORPHAN_MAX_AGE,
+    DEFAULT_UPLOAD_STAGING_QUOTA,
+    DEFAULT_UPLOAD_WORKERS,
+)
+
+OWNER_MARKER_FILE_NAME = "owner.pid"
+"""The name of the file that contains the id (and host, and boot id) of the process that owns a staging directory."""
+
+BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+"""The file that contains an id that changes with every reboot (on linux)."""
+
+
+def hash_file_obj(
+    file_obj: BinaryIO, chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE
+) -> str:
+    """Compute the sha256 hex digest of the content of a (seekable) file object, reading it in chunks.
+
+    The position of the file object is reset to the start afterwards.
+    """
+
+    digest = hashlib.sha256()
+    file_obj.seek(0)
+    while True:
+        chunk = file_obj.read(chunk_size)
+        if not chunk:
+            break
+        digest.update(chunk)
+    file_obj.seek(0)
+    return digest.hexdigest()
+
+
+def copy_file_obj(
+    file_obj: BinaryIO, path: str, chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE
+) -> int:
+    """Stream the content of a (seekable) file object to a file, chunk by chunk.
+
+    The content is written to a temporary file next to the target first, so the target path never contains a partial file.
+
+    Returns:
+        the number of bytes written
+    """
+
+    temp_path = f"{path}.{uuid.uuid4().hex}.partial"
+    size = 0
+    file_obj.seek(0)
+    try:
+        with open(temp_path, "wb") as f:
+            while True:
+                chunk = file_obj.read(chunk_size)
+                if not chunk:
+                    break
+                f.write(chunk)
+                size += len(chunk)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    finally:
+        file_obj.seek(0)
+    return size
+
+
+def _get_boot_id() -> str:
+
+    try:
+        with open(BOOT_ID_PATH) as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def write_owner_marker(path: str) -> None:
+    """Mark a directory as owned by the current process.
+
+    Process ids are only meaningful on the same host and since the same boot, so both are recorded alongside the pid.
+    """
+
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, OWNER_MARKER_FILE_NAME), "w") as f:
+        f.write(f"{os.getpid()}\n{socket.gethostname()}\n{_get_boot_id()}\n")
+
+
+def _is_process_alive(pid: int) -> bool:
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # the process exists, but belongs to another user
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def is_orphaned_dir(
+    path: str, max_age: float = DEFAULT_UPLOAD_STAGING_ORPHAN_MAX_AGE
+) -> bool:
+    """Check whether a staging directory was left behind by a process that does not exist anymore.
+
+    The owner process is only looked up if the directory was marked on this host, since the current boot. Directories marked before a reboot are orphaned, directories without (or with a foreign) owner marker are considered orphaned once they were not modified for 'max_age' seconds.
+    """
+
+    try:
+        with open(os.path.join(path, OWNER_MARKER_FILE_NAME)) as f:
+            pid_str, hostname, boot_id = [*f.read().splitlines(), "", ""][:3]
+        pid = int(pid_str)
+    except (OSError, ValueError):
+        pid = None
+        hostname = boot_id = ""
+
+    if pid is not None and hostname == socket.gethostname():
+        if boot_id != _get_boot_id():
+            return True
+        return not _is_process_alive(pid)
+
+    try:
+        return time.time() - os.stat(path).st_mtime > max_age
+    except FileNotFoundError:
+        return False
+
+
+def cleanup_orphaned_dirs(
+    base_path: str,
+    exclude: Iterable[str] = (),
+    max_age: float = DEFAULT_UPLOAD_STAGING_ORPHAN_MAX_AGE,
+) -> int:
+    """Delete the (uuid-named) staging directories below a path whose owner process does not exist anymore.
+
+    Arguments:
+        base_path: the parent directory of the staging directories
+        exclude: paths of directories that must not be deleted
+        max_age: the number of seconds after which a directory without owner marker is considered orphaned
+
+    Returns:
+        the number of deleted directories
+    """
+
+    excluded = {os.path.abspath(p) for p in exclude}
+    try:
+        with os.scandir(base_path) as entries:
+            candidates = [e.path for e in entries if e.is_dir(follow_symlinks=False)]
+    except FileNotFoundError:
+        return 0
+
+    deleted = 0
+    for path in candidates:
+        if os.path.abspath(path) in excluded:
+            continue
+        try:
+            uuid.UUID(os.path.basename(path))
+        except ValueError:
+            # not a staging directory (e.g. the preview artifacts)
+            continue
+        if is_orphaned_dir(path, max_age=max_age):
+            shutil.rmtree(path, ignore_errors=True)
+            deleted += 1
+    return deleted
+
+
+def _replace_with_link(path: str, target: str) -> bool:
+    """Replace a file with a (hard, or if that is not possible, symbolic) link to a file with the same content."""
+
+    temp_path = f"{path}.{uuid.uuid4().hex}.link"
+    for create_link in (os.link, os.symlink):
+        try:
+            create_link(target, temp_path)
+        except OSError:
+            continue
+        os.replace(temp_path, path)
+        return True
+    return False
+
+
+class StagingStats(NamedTuple):
+    """The state of an upload staging area."""
+
+    num_files: int
+    """The number of staged files that occupy space in the staging area."""
+    num_bytes: int
+    """The number of bytes those files occupy."""
+    num_released: int
+    """The number of staged files that were released, because their content is persisted elsewhere."""
+    quota: int
+    """The number of bytes the staged files may occupy, before files are released."""
+
+
+class StagingArea(object):
+    """A content-addressed directory for uploaded files, before (and while) they are registered in kiara.
+
+    Files are stored as '<base_path>/<sha256 digest>/<file name>', so identical content under the same name is only written once.
+
+    Once the staged files occupy more than 'quota' bytes, the least recently staged files whose content is persisted somewhere else (as reported by the 'get_persisted_path' callback, e.g. in a kiara data store) are released: they are replaced by links to the persisted copy, so their path stays valid for values that refer to it. Files without persisted copy are never released, so the quota is a soft limit.
+    """
+
+    def __init__(
+        self,
+        base_path: str,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+        quota: int = DEFAULT_UPLOAD_STAGING_QUOTA,
+        get_persisted_path: Union[Callable[[str], Union[str, None]], None] = None,
+    ) -> None:
+
+        self._base_path: str = os.path.abspath(base_path)
+        self._chunk_size: int = chunk_size
+        self._quota: int = quota
+        self._get_persisted_path: Union[
+            Callable[[str], Union[str, None]], None
+        ] = get_persisted_path
+        self._lock = threading.Lock()
+        # path -> size of the staged files that occupy space, least recently staged first
+        self._files: OrderedDict[str, int] = OrderedDict()
+        self._num_bytes: int = 0
+        self._num_released: int = 0
+
+    @property
+    def base_path(self) -> str:
+        return self._base_path
+
+    @property
+    def quota(self) -> int:
+        return self._quota
+
+    def get_stats(self) -> StagingStats:
+        """Return the number of staged files, and the number of bytes they occupy."""
+
+        with self._lock:
+            return StagingStats(
+                num_files=len(self._files),
+                num_bytes=self._num_bytes,
+                num_released=self._num_released,
+                quota=self._quota,
+            )
+
+    def get_path(self, digest: str, file_name: str) -> str:
+
+        file_name = os.path.basename(file_name)
+        if not file_name or file_name in [".", ".."]:
+            raise ValueError(f"Invalid file name: '{file_name}'.")
+        return os.path.join(self._base_path, digest, file_name)
+
+    def hash_file_obj(self, file_obj: BinaryIO) -> str:
+        return hash_file_obj(file_obj, chunk_size=self._chunk_size)
+
+    def stage(
+        self, file_obj: BinaryIO, file_name: str, digest: Union[str, None] = None
+    ) -> str:
+        """Stage the content of a file object, and return the path of the staged file.
+
+        If the content was already staged under the same name, nothing is written.
+
+        Arguments:
+            file_obj: the (seekable) file object
+            file_name: the name of the file
+            digest: the sha256 hex digest of the content, if already known
+        """
+
+        if digest is None:
+            digest = self.hash_file_obj(file_obj)
+
+        path = self._write(file_obj, file_name=file_name, digest=digest)
+        self.enforce_quota()
+        return path
+
+    def _write(self, file_obj: BinaryIO, file_name: str, digest: str) -> str:
+
+        path = self.get_path(digest, file_name)
+        with self._lock:
+            if os.path.isfile(path):
+                if path in self._files:
+                    self._files.move_to_end(path)
+                return path
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        size = copy_file_obj(file_obj, path, chunk_size=self._chunk_size)
+        with self._lock:
+            if path not in self._files:
+                self._files[path] = size
+                self._num_bytes += size
+        return path
+
+    def stage_file(
+        self, source_path: str, file_name: str, digest: Union[str, None] = None
+    ) -> str:
+        """Move an (e.g. downloaded) file into the staging area, and return the path of the staged file.
+
+        If the content was already staged under the same name, the source file is removed.
+        """
+
+        if digest is None:
+            with open(source_path, "rb") as f:
+                digest = self.hash_file_obj(f)  # type: ignore
+
+        path = self.get_path(digest, file_name)
+        with self._lock:
+            if os.path.isfile(path):
+                os.remove(source_path)
+                if path in self._files:
+                    self._files.move_to_end(path)
+                return path
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            shutil.move(source_path, path)
+            size = os.path.getsize(path)
+            self._files[path] = size
+            self._num_bytes += size
+
+        self.enforce_quota()
+        return path
+
+    def stage_all(
+        self,
+        file_objs: Sequence[Tuple[BinaryIO, str]],
+        max_workers: int = DEFAULT_UPLOAD_WORKERS,
+    ) -> Dict[str, Tuple[str, str]]:
+        """Stage the content of multiple file objects, using a thread pool to hash and write them in parallel.
+
+        Files with identical content are only staged once (under the name of the first of them).
+
+        Arguments:
+            file_objs: tuples of (seekable) file object and file name
+            max_workers: the maximum number of threads
+
+        Returns:
+            a map of content digest to file name and path of the staged file, in the order of the file objects
+        """
+
+        if not file_objs:
+            return {}
+
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(file_objs)),
+            thread_name_prefix="kiara_staging",
+        ) as executor:
+            digests = list(
+                executor.map(lambda item: self.hash_file_obj(item[0]), file_objs)
+            )
+
+            unique: Dict[str, Tuple[BinaryIO, str]] = {}
+            for digest, item in zip(digests, file_objs):
+                unique.setdefault(digest, item)
+
+            paths = executor.map(
+                lambda digest: self._write(
+                    unique[digest][0], file_name=unique[digest][1], digest=digest
+                ),
+                unique.keys(),
+            )
+            result = {
+                digest: (unique[digest][1], path)
+                for digest, path in zip(unique.keys(), paths)
+            }
+
+        # the quota callback is only called from the calling thread
+        self.enforce_quota()
+        return result
+
+    def enforce_quota(self) -> int:
+        """Release the least recently staged files with a persisted copy, until the staged files fit into the quota.
+
+        Returns:
+            the number of released files
+        """
+
+        if self._get_persisted_path is None:
+            return 0
+
+        released = 0
+        with self._lock:
+            for path, size in list(self._files.items()):
+                if self._num_bytes <= self._quota:
+                    break
+                persisted_path = self._get_persisted_path(path)
+                if persisted_path is None or not _replace_with_link(
+                    path, persisted_path
+                ):
+                    continue
+                del self._files[path]
+                self._num_bytes -= size
+                self._num_released += 1
+                released += 1
+        return released
+
+    def cleanup(self, max_age: float = DEFAULT_UPLOAD_STAGING_ORPHAN_MAX_AGE) -> int:
+        """Enforce the quota, and delete partially written files that were left behind (e.g. by interrupted uploads).
+
+        Returns:
+            the number of deleted files
+        """
+
+        self.enforce_quota()
+
+        deleted = 0
+        now = time.time()
+        for root, _, file_names in os.walk(self._base_path):
+            for file_name in file_names:
+                if not file_name.endswith((".partial", ".link")):
+                    continue
+                path = os.path.join(root, file_name)
+                try:
+                    if now - os.stat(path).st_mtime > max_age:
+                        os.remove(path)
+                        deleted += 1
+                except FileNotFoundError:
+                    continue
+        return deleted
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, NamedTuple, Tuple, Union
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+FILTER_OPERATORS = (
+    "==",
+    "!=",
+    ">",
+    ">=",
+    "<",
+    "<=",
+    "contains",
+    "starts with",
+    "is null",
+    "is not null",
+)
+"""The operators that can be used in a column filter."""
+
+UNARY_FILTER_OPERATORS = ("is null", "is not null")
+
+
+class ColumnFilter(NamedTuple):
+    """A predicate on a single table column, the value is parsed according to the column type."""
+
+    column: str
+    operator: str
+    value: Union[str, None] = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "ColumnFilter":
+        return cls(
+            column=data["column"], operator=data["operator"], value=data.get("value")
+        )
+
+    def to_dict(self) -> Mapping[str, Any]:
+        return {"column": self.column, "operator": self.operator, "value": self.value}
+
+    def __str__(self) -> str:
+        if self.operator in UNARY_FILTER_OPERATORS:
+            return f"{self.column} {self.operator}"
+        return f"{self.column} {self.operator} '{self.value}'"
+
+
+def create_filter_expression(
+    schema: "pa.Schema", filters: Iterable[ColumnFilter]
+) -> Union["pc.Expression", None]:
+    """Compile a set of column filters into a single (conjunctive) Arrow compute expression.
+
+    Raises:
+        ValueError: if a filter references an unknown column, uses an unknown operator, or its value can't be parsed for the column type
+    """
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    expression = None
+    for column_filter in filters:
+
+        if column_filter.column not in schema.names:
+            raise ValueError(f"Unknown column: {column_filter.column}")
+        if column_filter.operator not in FILTER_OPERATORS:
+            raise ValueError(f"Unknown filter operator: {column_filter.operator}")
+
+        field = pc.field(column_filter.column)
+        column_type = schema.field(column_filter.column).type
+
+        if column_filter.operator == "is null":
+            predicate = field.is_null()
+        elif column_filter.operator == "is not null":
+            predicate = field.is_valid()
+        elif column_filter.operator in ["contains", "starts with"]:
+            if not (
+                pa.types.is_string(column_type) or pa.types.is_large_string(column_type)
+            ):
+                raise ValueError(
+                    f"Operator '{column_filter.operator}' is only supported for text columns."
+                )
+            if column_filter.operator == "contains":
+                predicate = pc.match_substring(field, column_filter.value or "")
+            else:
+                predicate = pc.starts_with(field, column_filter.value or "")
+        else:
+            try:
+                value = pa.scalar(column_filter.value).cast(column_type)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+                raise ValueError(
+                    f"Invalid value for column '{column_filter.column}' (type: {column_type}): {column_filter.value}"
+                )
+            if column_filter.operator == "==":
+                predicate = field == value
+            elif column_filter.operator == "!=":
+                predicate = field != value
+            elif column_filter.operator == ">":
+                predicate = field > value
+            elif column_filter.operator == ">=":
+                predicate = field >= value
+            elif column_filter.operator == "<":
+                predicate = field < value
+            else:
+                predicate = field <= value
+
+        expression = predicate if expression is None else expression & predicate
+
+    return expression
+
+
+def get_table_window(
+    table: "pa.Table",
+    offset: int,
+    length: int,
+    filter_expression: Union["pc.Expression", None] = None,
+    sort_column: Union[str, None] = None,
+    descending: bool = False,
+) -> Tuple["pa.Table", int]:
+    """Filter and sort an Arrow table, and return a window of the result.
+
+    Sorting only selects the top 'offset + length' rows (using 'select_k_unstable'), instead of sorting the whole (filtered) table. The result is still an Arrow table, so only the window needs to be converted for display.
+
+    Returns:
+        a tuple containing the window, and the number of rows that match the filter
+    """
+
+    import pyarrow.compute as pc
+
+    if filter_expression is not None:
+        table = table.filter(filter_expression)
+    num_rows = table.num_rows
+
+    if sort_column is not None and num_rows:
+        order = "descending" if descending else "ascending"
+        k = min(offset + length, num_rows)
+        indices = pc.select_k_unstable(table, k=k, sort_keys=[(sort_column, order)])
+        # 'select_k_unstable' does not guarantee the order of the selected rows
+        table = table.take(indices).sort_by([(sort_column, order)])
+
+    return table.slice(offset, length), num_rows
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from typing import List
+
+
+def split_text_chunks(text: str, max_lines: int, max_chars: int) -> List[str]:
+    """Split a text into chunks of at most 'max_lines' lines and 'max_chars' characters each.
+
+    Lines that are longer than 'max_chars' are split over several chunks. Limits smaller than 1 are ignored.
+    """
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_chars = 0
+
+    for text_line in text.splitlines(keepends=True):
+        line = text_line
+        while max_chars > 0 and len(line) > max_chars - current_chars:
+            if current_chars < max_chars:
+                split_at = max_chars - current_chars
+                current.append(line[0:split_at])
+                line = line[split_at:]
+            chunks.append("".join(current))
+            current = []
+            current_chars = 0
+
+        if not line:
+            continue
+
+        current.append(line)
+        current_chars += len(line)
+        if max_lines > 0 and len(current) >= max_lines:
+            chunks.append("".join(current))
+            current = []
+            current_chars = 0
+
+    if current:
+        chunks.append("".join(current))
+
+    return chunks
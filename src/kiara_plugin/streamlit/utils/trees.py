@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+from typing import Any, List, Mapping, Sequence, Tuple, Union
+
+from kiara.utils.json import orjson_dumps
+from kiara_plugin.streamlit.defaults import (
+    DEFAULT_TREE_PREVIEW_MAX_DEPTH,
+    DEFAULT_TREE_PREVIEW_MAX_ITEMS,
+    DEFAULT_TREE_PREVIEW_MAX_JSON_SIZE,
+)
+
+TREE_PATH_TYPE = Sequence[Union[str, int]]
+
+
+def _is_container(data: Any) -> bool:
+    return isinstance(data, (Mapping, list, tuple))
+
+
+def _summarize_container(data: Any) -> str:
+
+    if isinstance(data, Mapping):
+        return f"{{…}} ({len(data)} items)"
+    else:
+        return f"[…] ({len(data)} items)"
+
+
+def _preview_leaf(data: Any, max_string_length: int) -> Any:
+
+    if data is None or isinstance(data, (bool, int, float)):
+        return data
+
+    if not isinstance(data, str):
+        data = str(data)
+
+    if max_string_length > 0 and len(data) > max_string_length:
+        return f"{data[0:max_string_length]}… ({len(data)} characters)"
+    return data
+
+
+def create_tree_preview(
+    data: Any,
+    max_depth: int = DEFAULT_TREE_PREVIEW_MAX_DEPTH,
+    max_items: int = DEFAULT_TREE_PREVIEW_MAX_ITEMS,
+    max_string_length: int = 200,
+    max_nodes: int = 2000,
+) -> Any:
+    """Create a json-serializable, truncated copy of a nested dict/list structure.
+
+    Only the top 'max_depth' levels and the first 'max_items' items of each container are included, deeper
+    containers and the remaining items are replaced by short summary strings. The total number of included
+    nodes is capped by 'max_nodes', so the result size stays bounded independent of the size of the input.
+
+    Arguments:
+        data: the data to create the preview for
+        max_depth: the number of nesting levels to include
+        max_items: the maximum number of items per container
+        max_string_length: the maximum length of string values
+        max_nodes: the maximum number of nodes to include in total
+    """
+
+    budget = [max_nodes]
+
+    def _preview(node: Any, depth: int) -> Any:
+
+        if not _is_container(node):
+            return _preview_leaf(node, max_string_length=max_string_length)
+
+        if depth >= max_depth:
+            return _summarize_container(node)
+
+        if isinstance(node, Mapping):
+            result_dict = {}
+            for idx, (k, v) in enumerate(node.items()):
+                if idx >= max_items or budget[0] <= 0:
+                    result_dict["…"] = f"{len(node) - idx} more items"
+                    break
+                budget[0] -= 1
+                key = _preview_leaf(str(k), max_string_length=max_string_length)
+                result_dict[key] = _preview(v, depth + 1)
+            return result_dict
+        else:
+            result_list = []
+            for idx, v in enumerate(node):
+                if idx >= max_items or budget[0] <= 0:
+                    result_list.append(f"… {len(node) - idx} more items")
+                    break
+                budget[0] -= 1
+                result_list.append(_preview(v, depth + 1))
+            return result_list
+
+    return _preview(data, 0)
+
+
+def create_tree_preview_json(
+    data: Any,
+    max_depth: int = DEFAULT_TREE_PREVIEW_MAX_DEPTH,
+    max_items: int = DEFAULT_TREE_PREVIEW_MAX_ITEMS,
+    max_string_length: int = 200,
+    max_json_size: int = DEFAULT_TREE_PREVIEW_MAX_JSON_SIZE,
+) -> Tuple[str, bool]:
+    """Create the json string for a truncated preview of a nested data structure.
+
+    If the serialized preview exceeds 'max_json_size', the number of items per container is reduced until
+    it fits. If that is not possible, only a summary of the root node is returned.
+
+    Returns:
+        a tuple containing the json string, and whether it fits into the size limit
+    """
+
+    while True:
+        tree = create_tree_preview(
+            data,
+            max_depth=max_depth,
+            max_items=max_items,
+            max_string_length=max_string_length,
+        )
+        json_str = orjson_dumps(tree)
+        if len(json_str) <= max_json_size:
+            return json_str, True
+        if max_items <= 1:
+            return orjson_dumps(_summarize_container(data)), False
+        max_items = max_items // 2
+
+
+def get_tree_node(data: Any, path: TREE_PATH_TYPE) -> Any:
+    """Return the node that can be found under the provided path in a nested dict/list structure."""
+
+    node = data
+    for token in path:
+        if isinstance(node, Mapping):
+            if token in node.keys():
+                node = node[token]
+            else:
+                # tree previews use string keys
+                matches = [k for k in node.keys() if str(k) == str(token)]
+                if not matches:
+                    raise KeyError(f"No item with key '{token}'.")
+                node = node[matches[0]]
+        elif isinstance(node, (list, tuple)):
+            node = node[int(token)]
+        else:
+            raise KeyError(f"Can't retrieve item '{token}': not a container.")
+    return node
+
+
+def list_expandable_children(
+    data: Any, max_items: int = DEFAULT_TREE_PREVIEW_MAX_ITEMS
+) -> List[Union[str, int]]:
+    """List the keys (or indexes) of the first 'max_items' children of a node that are containers themselves."""
+
+    result: List[Union[str, int]] = []
+    if isinstance(data, Mapping):
+        for idx, (k, v) in enumerate(data.items()):
+            if idx >= max_items:
+                break
+            if _is_container(v):
+                result.append(k)
+    elif isinstance(data, (list, tuple)):
+        for idx, v in enumerate(data):
+            if idx >= max_items:
+                break
+            if _is_container(v):
+                result.append(idx)
+    return result
@@ -21,6 +21,7 @@ from kiara.context import KiaraConfig
 from kiara.interfaces.python_api import KiaraAPI
 from kiara.interfaces.python_api.models.job import JobTest
 from kiara.utils.testing import get_tests_for_job, list_job_descs
+from kiara_plugin.streamlit.streamlit import KiaraStreamlit
 
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 JOBS_FOLDER = Path(os.path.join(ROOT_DIR, "examples", "jobs"))
@@ -45,6 +46,14 @@ def kiara_api() -> KiaraAPI:
     return api
 
 
+@pytest.fixture
+def kiara_streamlit(kiara_api: KiaraAPI) -> KiaraStreamlit:
+
+    kiara_streamlit = KiaraStreamlit()
+    kiara_streamlit._api = kiara_api
+    return kiara_streamlit
+
+
 @pytest.fixture(params=list_job_descs(JOBS_FOLDER))
 def example_job_test(request, kiara_api) -> JobTest:
 
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the alias index in `kiara_plugin.streamlit.utils.aliases`."""
+
+from kiara.interfaces.python_api import KiaraAPI
+from kiara.models.filesystem import KiaraFile
+from kiara_plugin.streamlit.utils.aliases import AliasIndex, retrieve_value_details
+
+
+def test_alias_index(kiara_api: KiaraAPI):
+
+    index = AliasIndex(check_interval=3600)
+
+    string_value = kiara_api.register_data("x", data_type="string")
+    kiara_api.store_value(string_value, alias="my_string")
+    assert list(index.get_aliases(kiara_api)) == ["my_string"]
+
+    # the index is only re-built after it was invalidated
+    integer_value = kiara_api.register_data(1, data_type="integer")
+    kiara_api.store_value(integer_value, alias="my_integer")
+    assert list(index.get_aliases(kiara_api)) == ["my_string"]
+
+    index.invalidate(kiara_api.context.id)
+    assert list(index.get_aliases(kiara_api)) == ["my_integer", "my_string"]
+    aliases = index.get_aliases(kiara_api, data_types=["integer"])
+    assert list(aliases) == ["my_integer"]
+    assert aliases["my_integer"].value_id == integer_value.value_id
+    assert aliases["my_integer"].data_type == "integer"
+    assert aliases["my_integer"].size == integer_value.value_size
+
+    # values of sub types are included
+    html_value = kiara_api.register_data("<p>x</p>", data_type="html")
+    kiara_api.store_value(html_value, alias="my_html")
+    index.invalidate()
+    aliases = index.get_aliases(kiara_api, data_types=["string"])
+    assert list(aliases) == ["my_html", "my_string"]
+
+
+def test_alias_index_detects_changes_on_disk(kiara_api: KiaraAPI):
+
+    index = AliasIndex(check_interval=0)
+
+    value = kiara_api.register_data("x", data_type="string")
+    kiara_api.store_value(value, alias="first")
+    assert list(index.get_aliases(kiara_api)) == ["first"]
+
+    # register an alias directly in the archive, as another process would
+    alias_registry = kiara_api.context.alias_registry
+    alias_store = alias_registry.get_archive()
+    alias_store.register_aliases(value.value_id, "second")  # type: ignore
+
+    assert list(index.get_aliases(kiara_api)) == ["first", "second"]
+    assert "second" in alias_registry.all_aliases
+
+
+def test_kiara_private_attributes(kiara_api: KiaraAPI):
+    """The alias index relies on private attributes of kiara, this fails if they change."""
+
+    alias_registry = kiara_api.context.alias_registry
+    assert hasattr(alias_registry, "_cached_aliases")
+    assert hasattr(alias_registry, "_cached_aliases_by_id")
+
+    data_archive = kiara_api.context.data_registry.get_archive()
+    assert callable(getattr(data_archive, "_retrieve_value_details", None))
+
+
+def test_retrieve_value_details(kiara_api: KiaraAPI):
+
+    value = kiara_api.register_data("x", data_type="string")
+    kiara = kiara_api.context
+
+    # values that are not stored yet are loaded
+    details = retrieve_value_details(kiara, value.value_id)
+    assert details["value_schema"]["type"] == "string"
+
+    kiara_api.store_value(value, alias="my_string")
+    details = retrieve_value_details(kiara, value.value_id)
+    assert details["value_schema"]["type"] == "string"
+    assert details["value_size"] == value.value_size
+
+
+def test_alias_index_file_extension(kiara_api: KiaraAPI, tmp_path):
+
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,2\n")
+    value = kiara_api.register_data(KiaraFile.load_file(str(path)), data_type="file")
+    kiara_api.store_value(value, alias="my_file")
+
+    entry = AliasIndex().get_aliases(kiara_api, data_types=["file"])["my_file"]
+    assert entry.value_id == value.value_id
+    assert entry.extension == "csv"
+
+
+def test_alias_index_files(kiara_api: KiaraAPI, tmp_path):
+
+    index = AliasIndex(check_interval=3600)
+    for file_name, content in [
+        ("a.csv", "a,b\n1,2\n"),
+        ("b.CSV", "a,b\n3,4\n"),
+        ("c.txt", "text"),
+    ]:
+        path = tmp_path / file_name
+        path.write_text(content)
+        value = kiara_api.register_data(
+            KiaraFile.load_file(str(path)), data_type="file"
+        )
+        # files registered via the index don't need their metadata to be retrieved
+        index.register_file(value)
+        kiara_api.store_value(value, alias=file_name.split(".")[0])
+
+    assert list(index.get_file_aliases(kiara_api)) == ["a", "b", "c"]
+    assert list(index.get_file_aliases(kiara_api, extensions=["csv"])) == ["a", "b"]
+    assert list(index.get_file_aliases(kiara_api, extensions=[".TXT", "json"])) == ["c"]
+    assert list(index.get_file_aliases(kiara_api, mime_types=["text/plain"])) == ["c"]
+    assert (
+        index.get_file_aliases(kiara_api, extensions=["csv"], mime_types=["text/plain"])
+        == {}
+    )
+    assert index.get_file_index(kiara_api).by_extension["csv"]["b"].extension == "CSV"
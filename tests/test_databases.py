@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the read-only sqlite access layer in `kiara_plugin.streamlit.utils.databases`."""
+
+import sqlite3
+from typing import List
+
+import pytest
+
+from kiara_plugin.streamlit.utils.databases import SQLiteReader
+
+
+@pytest.fixture
+def db_file(tmp_path):
+
+    path = tmp_path / "test.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE "my table" (a INTEGER, b TEXT, c REAL)')
+    conn.executemany(
+        'INSERT INTO "my table" VALUES (?, ?, ?)',
+        [(i, f"row {i}", i / 2) for i in range(250)],
+    )
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+def test_sqlite_reader_pages(db_file):
+
+    reader = SQLiteReader(db_file, pool_size=1)
+    queries: List[str] = []
+
+    assert reader.get_table_names() == ["my table"]
+    assert reader.get_column_names("my table") == ["a", "b", "c"]
+    assert reader.count_rows("my table") == 250
+
+    # the row count is cached, and not queried again
+    with reader.connection() as conn:
+        conn.set_trace_callback(queries.append)
+    assert reader.count_rows("my table") == 250
+    assert queries == []
+
+    page = reader.read_rows("my table", offset=240, limit=100, columns=["b", "a"])
+    assert list(page.columns) == ["b", "a"]
+    assert page["a"].tolist() == list(range(240, 250))
+
+    with pytest.raises(ValueError):
+        reader.read_rows("my table", columns=["x"])
+
+
+def test_sqlite_reader_read_only_and_timeout(db_file):
+
+    reader = SQLiteReader(db_file)
+
+    with pytest.raises(sqlite3.OperationalError):
+        with reader.connection() as conn:
+            conn.execute('DELETE FROM "my table"')
+    assert reader.count_rows("my table") == 250
+
+    with pytest.raises(TimeoutError):
+        with reader.connection(timeout=0.1) as conn:
+            conn.execute(
+                "WITH RECURSIVE r(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM r) SELECT count(*) FROM r"
+            ).fetchall()
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the background downloads in `kiara_plugin.streamlit.utils.downloads`."""
+
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Union
+
+import pytest
+
+from kiara.exceptions import KiaraException
+from kiara_plugin.streamlit.streamlit import KiaraStreamlit
+from kiara_plugin.streamlit.utils.downloads import (
+    DownloadManager,
+    download_to_file,
+    get_file_name_from_url,
+)
+
+CONTENT = os.urandom(100000)
+CHANGED_CONTENT = os.urandom(80000)
+
+
+def wait(manager: Union[DownloadManager, KiaraStreamlit], download_id: str):
+
+    get_status = (
+        manager.get_status
+        if isinstance(manager, DownloadManager)
+        else manager.get_download_status
+    )
+    status = get_status(download_id)
+    while status.state in ["pending", "running"]:
+        time.sleep(0.01)
+        status = get_status(download_id)
+    return status
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    """Serves 'CONTENT', supports (conditional) range requests, and drops the connection halfway through the first 'fail_first' responses.
+
+    If 'versions' is set, the n-th request is served the n-th version of the content (or the last one).
+    """
+
+    fail_first: int = 0
+    requests: List[Union[str, None]] = []
+    versions: List[bytes] = []
+
+    def do_GET(self):
+
+        if self.path != "/data.bin":
+            self.send_error(404)
+            return
+
+        range_header = self.headers.get("Range", None)
+        self.requests.append(range_header)
+        versions = self.versions or [CONTENT]
+        content = versions[min(len(self.requests), len(versions)) - 1]
+        etag = f'"{hashlib.sha256(content).hexdigest()}"'
+        if range_header and self.headers.get("If-Range", None) != etag:
+            range_header = None
+
+        start = int(range_header[6:-1]) if range_header else 0
+        body = content[start:]
+
+        self.send_response(206 if range_header else 200)
+        if range_header:
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}"
+            )
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        if len(self.requests) <= self.fail_first:
+            self.wfile.write(body[: len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+
+    handler: Dict = {"requests": [], "fail_first": 0, "versions": []}
+    handler_cls = type("Handler", (RangeRequestHandler,), handler)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler_cls)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+
+
+def _url(server: ThreadingHTTPServer, path: str) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_get_file_name_from_url():
+
+    assert get_file_name_from_url("https://example.com/a/data%20x.csv?x=1") == (
+        "data x.csv"
+    )
+    assert get_file_name_from_url("https://example.com/") == "download"
+
+
+def test_download_resumes(server: ThreadingHTTPServer, tmp_path: Path):
+
+    server.RequestHandlerClass.fail_first = 2  # type: ignore
+    progress = []
+    target = tmp_path / "data.bin"
+
+    download_to_file(
+        _url(server, "/data.bin"),
+        str(target),
+        chunk_size=1000,
+        retry_wait=0,
+        on_progress=lambda n, total: progress.append((n, total)),
+    )
+
+    assert target.read_bytes() == CONTENT
+    assert os.listdir(tmp_path) == ["data.bin"]
+    requests = server.RequestHandlerClass.requests  # type: ignore
+    assert requests == [None, "bytes=50000-", "bytes=75000-"]
+    assert progress[-1] == (len(CONTENT), len(CONTENT))
+
+
+def test_download_restarts_if_remote_file_changed(
+    server: ThreadingHTTPServer, tmp_path: Path
+):
+
+    server.RequestHandlerClass.fail_first = 1  # type: ignore
+    server.RequestHandlerClass.versions = [CONTENT, CHANGED_CONTENT]  # type: ignore
+    target = tmp_path / "data.bin"
+
+    download_to_file(_url(server, "/data.bin"), str(target), retry_wait=0)
+
+    # the resumed request was answered with the whole (changed) file
+    assert server.RequestHandlerClass.requests == [None, "bytes=50000-"]  # type: ignore
+    assert target.read_bytes() == CHANGED_CONTENT
+    assert os.listdir(tmp_path) == ["data.bin"]
+
+
+def test_download_retries_are_bounded(server: ThreadingHTTPServer, tmp_path: Path):
+
+    server.RequestHandlerClass.fail_first = 10  # type: ignore
+    target = tmp_path / "data.bin"
+
+    with pytest.raises(KiaraException):
+        download_to_file(
+            _url(server, "/data.bin"), str(target), max_retries=2, retry_wait=0
+        )
+    assert len(server.RequestHandlerClass.requests) == 3  # type: ignore
+    assert not target.exists()
+
+    with pytest.raises(KiaraException):
+        download_to_file(_url(server, "/missing.bin"), str(target), retry_wait=0)
+
+
+def test_download_manager(server: ThreadingHTTPServer, tmp_path: Path):
+
+    server.RequestHandlerClass.fail_first = 1  # type: ignore
+    manager = DownloadManager(base_path=str(tmp_path), max_retries=0, retry_wait=0)
+    url = _url(server, "/data.bin")
+
+    download_id = manager.start(url)
+    status = wait(manager, download_id)
+    assert status.state == "failed"
+    assert status.error
+
+    # starting a failed download again resumes it
+    assert manager.start(url) == download_id
+    status = wait(manager, download_id)
+    assert status.state == "finished"
+    assert status.fraction == 1.0
+    assert Path(status.path).read_bytes() == CONTENT
+    assert server.RequestHandlerClass.requests == [None, "bytes=50000-"]  # type: ignore
+
+    # finished downloads are not repeated
+    assert manager.start(url) == download_id
+    assert manager.get_status(download_id).state == "finished"
+
+
+def test_import_download(server: ThreadingHTTPServer, kiara_streamlit: KiaraStreamlit):
+
+    url = _url(server, "/data.bin")
+
+    download_id = kiara_streamlit.start_download(url)
+    assert wait(kiara_streamlit, download_id).state == "finished"
+    value = kiara_streamlit.import_download(download_id)
+    assert value.data.file_name == "data.bin"
+    assert Path(value.data.path).read_bytes() == CONTENT
+    assert value.data.metadata["download_info"]["url"] == url
+
+    # the imported file is not downloaded (or imported) again
+    assert kiara_streamlit.start_download(url) == download_id
+    assert wait(kiara_streamlit, download_id).state == "finished"
+    assert kiara_streamlit.import_download(download_id).value_id == value.value_id
+    assert server.RequestHandlerClass.requests == [None]  # type: ignore
+    assert os.listdir(os.path.dirname(value.data.path)) == ["data.bin"]
+    assert (
+        os.listdir(os.path.join(kiara_streamlit._downloads.base_path, download_id))
+        == []
+    )
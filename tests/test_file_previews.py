@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the file preview helpers in `kiara_plugin.streamlit.utils.files`."""
+
+from pathlib import Path
+
+import pyarrow as pa
+
+from kiara_plugin.streamlit.utils.files import (
+    aggregate_file_listing,
+    filter_file_listing,
+    format_hex_dump,
+    is_binary_content,
+    is_binary_file,
+    read_file_head,
+    read_file_preview,
+    read_file_range,
+    read_file_tail,
+)
+
+
+def _create_text_file(folder: Path, num_lines: int) -> Path:
+
+    path = folder / "lines.txt"
+    path.write_text("".join(f"line {idx}\n" for idx in range(num_lines)))
+    return path
+
+
+def test_binary_detection(tmp_path: Path):
+
+    assert not is_binary_content(b"")
+    assert not is_binary_content("hällo wörld\n".encode("utf-8"))
+    # multi-byte character cut off at the end of the sample
+    assert not is_binary_content("hällo".encode("utf-8")[0:2])
+    assert is_binary_content(b"abc\x00def")
+    assert is_binary_content(bytes(range(1, 32)) * 4)
+    # latin-1 encoded text is not considered binary
+    assert not is_binary_content("hällo wörld".encode("latin-1"))
+
+    binary_file = tmp_path / "data.bin"
+    binary_file.write_bytes(bytes(range(256)) * 10)
+    assert is_binary_file(str(binary_file))
+
+    text_file = _create_text_file(tmp_path, 10)
+    assert not is_binary_file(str(text_file))
+
+
+def test_read_file_range(tmp_path: Path):
+
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"0123456789")
+
+    assert read_file_range(str(path), 2, 3) == b"234"
+    assert read_file_range(str(path), 8, 100) == b"89"
+    assert read_file_range(str(path), 100, 10) == b""
+
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+    assert read_file_range(str(empty), 0, 10) == b""
+    assert read_file_preview(str(empty)) == ("", False)
+
+
+def test_read_file_head_and_tail(tmp_path: Path):
+
+    path = str(_create_text_file(tmp_path, 1000))
+
+    text, truncated = read_file_head(path, max_bytes=1024 * 1024, max_lines=5)
+    assert text.splitlines() == [f"line {idx}" for idx in range(5)]
+    assert truncated
+
+    text, truncated = read_file_head(path, max_bytes=1024 * 1024, max_lines=-1)
+    assert len(text.splitlines()) == 1000
+    assert not truncated
+
+    text, truncated = read_file_tail(path, max_bytes=1024 * 1024, max_lines=3)
+    assert text.splitlines() == ["line 997", "line 998", "line 999"]
+    assert truncated
+
+    # partial lines at the start of the tail are dropped
+    text, truncated = read_file_tail(path, max_bytes=12, max_lines=-1)
+    assert text.splitlines() == ["line 999"]
+    assert truncated
+
+
+def test_binary_preview(tmp_path: Path):
+
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(range(256)) * 4)
+
+    text, truncated = read_file_preview(str(path), section="head", max_lines=2)
+    lines = text.splitlines()
+    assert len(lines) == 2
+    assert lines[0].startswith("00000000  00 01 02")
+    assert truncated
+
+    text, _ = read_file_preview(str(path), section="tail", max_lines=1)
+    assert text.startswith("000003f0  f0 f1")
+
+    assert format_hex_dump(b"AB", offset=16) == f"00000010  {'41 42':<47}  |AB|"
+
+
+def test_file_listing():
+
+    listing = pa.table(
+        {
+            "path": ["a/x.txt", "a/y.csv", "b/z.txt", "a.txt.bak"],
+            "size": [1, 2, 3, 4],
+            "mime_type": ["text/plain", "text/csv", "text/plain", None],
+        }
+    )
+
+    assert filter_file_listing(listing, "").num_rows == 4
+    assert filter_file_listing(listing, "a/").column("path").to_pylist() == [
+        "a/x.txt",
+        "a/y.csv",
+    ]
+    # glob patterns need to match the whole path
+    assert filter_file_listing(listing, "*.txt").column("path").to_pylist() == [
+        "a/x.txt",
+        "b/z.txt",
+    ]
+
+    aggregated = aggregate_file_listing(listing).to_pydict()
+    assert aggregated["mime_type"] == ["text/plain", "text/csv", None]
+    assert aggregated["path_count"] == [2, 1, 1]
+    assert aggregated["size_sum"] == [4, 2, 4]
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the 'form' profile of the input assemblies in `kiara_plugin.streamlit.components.input.assemblies`."""
+
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+
+def form_app():
+
+    import streamlit as st
+
+    import kiara_plugin.streamlit as kst
+    from kiara.models.values.value_schema import ValueSchema
+
+    kst.init()
+    inputs = st.kiara.inputs_for_fields(
+        fields={"text": ValueSchema(type="string", optional=True)},
+        profile="form",
+        key="form_test",
+    )
+    st.session_state["assembled"] = {
+        field: None if value is None else st.kiara.api.get_value(value).data
+        for field, value in inputs.items()
+    }
+
+
+def test_form_inputs_only_change_on_submit(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+
+    monkeypatch.setenv("KIARA_BASE_DATA_PATH", str(tmp_path))
+
+    at = AppTest.from_function(form_app, default_timeout=120).run()
+    assert not at.exception
+    assert at.session_state["assembled"] == {"text": ""}
+
+    # editing an input does not change the assembled inputs...
+    at.text_input[0].input("hello").run()
+    assert at.session_state["assembled"] == {"text": ""}
+
+    # ... until the form is submitted
+    at.button[0].click().run()
+    assert at.button[0].label == "Apply inputs"
+    assert at.session_state["assembled"] == {"text": "hello"}
+
+    at.text_input[0].input("world").run()
+    assert at.session_state["assembled"] == {"text": "hello"}
+    at.button[0].click().run()
+    assert at.session_state["assembled"] == {"text": "world"}
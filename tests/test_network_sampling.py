@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the network sampling helpers in `kiara_plugin.streamlit.utils.networks`, and the network data preview."""
+
+import pyarrow as pa
+import pytest
+
+from kiara_plugin.streamlit.components.preview.network_data import NetworkDataPreview
+from kiara_plugin.streamlit.streamlit import ComponentMgmt, KiaraStreamlit
+from kiara_plugin.streamlit.utils.class_loading import (
+    find_all_kiara_streamlit_components,
+)
+from kiara_plugin.streamlit.utils.networks import NetworkIndex, create_dot_graph
+
+# a star around node 0, plus a chain 10 - 11 - 12 - 13, and one duplicate edge
+EDGES = pa.table(
+    {
+        "_source": [0, 0, 0, 0, 10, 11, 12, 0],
+        "_target": [1, 2, 3, 4, 11, 12, 13, 1],
+    }
+)
+NODES = pa.table({"_node_id": list(range(20)), "_label": [f"n{i}" for i in range(20)]})
+
+
+def test_network_summary():
+
+    summary = NetworkIndex(EDGES, NODES).create_summary()
+
+    assert summary["num_nodes"] == 20
+    assert summary["num_edges"] == 8
+    assert summary["num_isolated_nodes"] == 11
+    assert summary["num_parallel_edges"] == 1
+    assert summary["num_self_loops"] == 0
+    assert summary["max_degree"] == 5
+    assert summary["min_degree"] == 0
+    assert summary["top_degree_nodes"][0] == 0
+
+
+def test_network_samples():
+
+    index = NetworkIndex(EDGES)
+
+    assert sorted(index.get_neighbors(11).tolist()) == [10, 12]
+
+    sample = index.sample_k_hop(10, hops=2, max_nodes=100, max_edges=100)
+    assert sorted(sample.nodes) == [10, 11, 12]
+    assert sample.edges.num_rows == 2
+    assert not sample.truncated
+
+    sample = index.sample_k_hop(0, hops=1, max_nodes=3, max_edges=100)
+    assert len(sample.nodes) == 3
+    assert sample.truncated
+
+    sample = index.sample_top_degree(max_nodes=2, max_edges=1)
+    assert sample.nodes[0] == 0
+    assert sample.edges.num_rows <= 1
+    assert sample.truncated
+
+    sample = index.sample_random_walk(10, max_nodes=3, max_edges=100, random_seed=1)
+    assert set(sample.nodes) <= {10, 11, 12, 13}
+    assert sample.nodes[0] == 10
+
+    dot = create_dot_graph(sample, "_source", "_target", labels={10: 'a "b"'})
+    assert dot.startswith("graph {")
+    assert '"10" [label="a \\"b\\""];' in dot
+
+
+def test_network_data_preview_registration(
+    kiara_streamlit: KiaraStreamlit, monkeypatch
+):
+
+    # the sampled preview is used by default, unless another 'default' preview is registered
+    component = kiara_streamlit.get_preview_component("network_data")
+    assert isinstance(component, NetworkDataPreview)
+    assert kiara_streamlit.get_preview_component("network_data", "sampled") is component
+
+    class OtherNetworkDataPreview(NetworkDataPreview):
+        _component_name = "other_preview_network_data_sampled"
+
+    components = dict(find_all_kiara_streamlit_components())
+    components["other_preview_network_data_sampled"] = OtherNetworkDataPreview
+    monkeypatch.setattr(
+        "kiara_plugin.streamlit.streamlit.find_all_kiara_streamlit_components",
+        lambda: components,
+    )
+    with pytest.raises(ValueError, match="more than one component registered"):
+        ComponentMgmt(kiara_streamlit=kiara_streamlit, example_base_dir=None).components
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the precomputed preview artifacts in `kiara_plugin.streamlit.utils.artifacts`."""
+
+import os
+import time
+from pathlib import Path
+
+import pyarrow as pa
+
+from kiara.interfaces.python_api import KiaraAPI
+from kiara_plugin.streamlit.utils.artifacts import (
+    PreviewArtifactStore,
+    create_preview_artifact,
+)
+
+
+def test_table_preview_artifact(kiara_api: KiaraAPI, tmp_path: Path):
+
+    table = pa.table({"a": list(range(500)), "b": ["x"] * 500})
+    value = kiara_api.register_data(table, data_type="table")
+
+    artifact = create_preview_artifact(value, max_rows=10)
+    assert artifact is not None
+    assert artifact.artifact_type == "table_head"
+    assert artifact.data["num_rows"] == 500
+    assert artifact.data["schema"] == {"a": "int64", "b": "string"}
+    assert artifact.data["rows"]["a"] == list(range(10))
+
+    store = PreviewArtifactStore(base_path=str(tmp_path))
+    assert store.get_artifact(value.value_id) is None
+
+    future = store.submit(value)
+    assert future.result() is not None
+    stored = store.get_artifact(value.value_id)
+    assert stored is not None
+    assert stored.data == store.create_artifact(value).data  # type: ignore
+
+
+def test_no_preview_artifact_for_other_types(kiara_api: KiaraAPI):
+
+    # strings and files are previewed from their data directly
+    value = kiara_api.register_data("x" * 100, data_type="string")
+    assert create_preview_artifact(value) is None
+
+    value = kiara_api.register_data(True, data_type="boolean")
+    assert create_preview_artifact(value) is None
+
+
+def test_preview_artifact_store_limits(kiara_api: KiaraAPI, tmp_path: Path):
+
+    values = [
+        kiara_api.register_data(pa.table({"a": [i] * 100}), data_type="table")
+        for i in range(3)
+    ]
+    artifacts = [create_preview_artifact(v) for v in values]
+
+    store = PreviewArtifactStore(base_path=str(tmp_path), max_size=10**9)
+    for artifact in artifacts:
+        store.store_artifact(artifact)  # type: ignore
+    size = sum(f.stat().st_size for f in tmp_path.iterdir())
+
+    # the least recently used artifacts are deleted first
+    old = time.time() - 100
+    for i, value in enumerate(values):
+        os.utime(tmp_path / f"{value.value_id}.json", (old + i, old + i))
+    assert store.get_artifact(values[0].value_id) is not None
+
+    store._max_size = size - 1
+    assert store.prune() == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        f"{v.value_id}.json" for v in [values[0], values[2]]
+    )
+
+    store._max_age = 50
+    assert store.prune() == 1
+    assert [p.name for p in tmp_path.iterdir()] == [f"{values[0].value_id}.json"]
+
+    # loaded artifacts are kept in memory, a new store has to read them from disk
+    os.remove(tmp_path / f"{values[0].value_id}.json")
+    assert store.get_artifact(values[0].value_id) is not None
+    new_store = PreviewArtifactStore(base_path=str(tmp_path))
+    assert new_store.get_artifact(values[0].value_id) is None
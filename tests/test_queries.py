@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the SQL query helpers in `kiara_plugin.streamlit.utils.queries`."""
+
+import duckdb
+import pyarrow as pa
+import pytest
+
+from kiara_plugin.streamlit.utils.queries import query_tables, query_tables_page
+
+TABLES = {"data": pa.table({"a": list(range(25)), "b": ["x", "y", "z", "w", "v"] * 5})}
+
+
+def test_query_pages():
+
+    page = query_tables_page(
+        TABLES, "SELECT * FROM data ORDER BY a;", offset=0, limit=10
+    )
+    assert page.table.column("a").to_pylist() == list(range(10))
+    assert page.has_more
+
+    page = query_tables_page(
+        TABLES, "SELECT * FROM data ORDER BY a", offset=20, limit=10
+    )
+    assert page.table.column("a").to_pylist() == list(range(20, 25))
+    assert not page.has_more
+
+    page = query_tables_page(
+        TABLES, "SELECT * FROM data ORDER BY a -- first page", offset=0, limit=10
+    )
+    assert page.table.num_rows == 10
+    assert page.has_more
+
+    result = query_tables(TABLES, "SELECT b, count(*) AS n FROM data GROUP BY b")
+    assert result.num_rows == 5
+
+
+def test_query_restrictions():
+
+    with pytest.raises(duckdb.Error):
+        query_tables(TABLES, "SELECT * FROM read_csv_auto('/etc/hostname')")
+
+    with pytest.raises(TimeoutError):
+        query_tables(
+            TABLES,
+            "SELECT count(*) FROM range(100000000) r1, range(100000) r2 WHERE r1.range % 7 = r2.range",
+            timeout=0.2,
+        )
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the upload staging area in `kiara_plugin.streamlit.utils.staging`."""
+
+import hashlib
+import io
+import os
+import uuid
+from pathlib import Path
+from typing import Union
+
+import pytest
+
+from kiara.models.filesystem import KiaraFileBundle
+from kiara_plugin.streamlit.streamlit import KiaraStreamlit
+from kiara_plugin.streamlit.utils.staging import (
+    StagingArea,
+    cleanup_orphaned_dirs,
+    copy_file_obj,
+    hash_file_obj,
+    write_owner_marker,
+)
+
+
+def test_hash_and_copy_file_obj(tmp_path: Path):
+
+    content = os.urandom(10000)
+    file_obj = io.BytesIO(content)
+
+    assert (
+        hash_file_obj(file_obj, chunk_size=1024) == hashlib.sha256(content).hexdigest()
+    )
+    assert file_obj.tell() == 0
+
+    target = tmp_path / "copy.bin"
+    assert copy_file_obj(file_obj, str(target), chunk_size=1000) == len(content)
+    assert target.read_bytes() == content
+    assert os.listdir(tmp_path) == ["copy.bin"]
+
+
+def test_staging_area(tmp_path: Path):
+
+    staging_area = StagingArea(base_path=str(tmp_path / "staging"), chunk_size=16)
+
+    path = staging_area.stage(io.BytesIO(b"a,b\n1,2\n"), file_name="data.csv")
+    assert os.path.basename(path) == "data.csv"
+    mtime = os.stat(path).st_mtime_ns
+
+    # the same content is only written once
+    assert staging_area.stage(io.BytesIO(b"a,b\n1,2\n"), file_name="data.csv") == path
+    assert os.stat(path).st_mtime_ns == mtime
+
+    other = staging_area.stage(io.BytesIO(b"a,b\n3,4\n"), file_name="data.csv")
+    assert other != path
+
+    with pytest.raises(ValueError):
+        staging_area.get_path("abc", "..")
+
+
+def test_staging_area_quota(tmp_path: Path):
+
+    persisted = {}
+
+    def get_persisted_path(path: str):
+        return persisted.get(path, None)
+
+    staging_area = StagingArea(
+        base_path=str(tmp_path / "staging"),
+        quota=250,
+        get_persisted_path=get_persisted_path,
+    )
+
+    first = staging_area.stage(io.BytesIO(b"1" * 100), file_name="first.txt")
+    second = staging_area.stage(io.BytesIO(b"2" * 100), file_name="second.txt")
+    assert staging_area.get_stats().num_bytes == 200
+
+    # files without persisted copy are never released
+    third = staging_area.stage(io.BytesIO(b"3" * 100), file_name="third.txt")
+    stats = staging_area.get_stats()
+    assert (stats.num_files, stats.num_bytes, stats.num_released) == (3, 300, 0)
+
+    # re-staging a file makes it the most recently staged one
+    staging_area.stage(io.BytesIO(b"2" * 100), file_name="second.txt")
+
+    for path in (first, second):
+        persisted_path = tmp_path / os.path.basename(path)
+        persisted_path.write_bytes(Path(path).read_bytes())
+        persisted[path] = str(persisted_path)
+
+    # the least recently staged file is released first, and stays readable
+    assert staging_area.enforce_quota() == 1
+    stats = staging_area.get_stats()
+    assert (stats.num_files, stats.num_bytes, stats.num_released) == (2, 200, 1)
+    assert Path(first).read_bytes() == b"1" * 100
+    assert os.path.samefile(first, persisted[first])
+    assert not os.path.samefile(second, persisted[second])
+    assert Path(third).exists()
+
+
+def test_cleanup_orphaned_dirs(tmp_path: Path):
+
+    own = tmp_path / str(uuid.uuid4())
+    write_owner_marker(str(own))
+
+    _, hostname, boot_id = (own / "owner.pid").read_text().splitlines()
+
+    def create_dir(marker: Union[str, None]) -> Path:
+        path = tmp_path / str(uuid.uuid4())
+        path.mkdir()
+        if marker is not None:
+            (path / "owner.pid").write_text(marker)
+        return path
+
+    # a process id that does not exist (anymore), on this host
+    dead_pid = 2**22 + 1
+    dead = create_dir(f"{dead_pid}\n{hostname}\n{boot_id}\n")
+    # a process that existed before a reboot
+    rebooted = create_dir(f"{os.getpid()}\n{hostname}\nanother-boot\n")
+    # process ids of other hosts (or without host) can't be checked
+    foreign = create_dir(f"{dead_pid}\nanother-host\n{boot_id}\n")
+    unknown_host = create_dir(str(dead_pid))
+    unmarked = create_dir(None)
+    other = tmp_path / "preview_artifacts"
+    other.mkdir()
+
+    assert cleanup_orphaned_dirs(str(tmp_path), exclude=[str(own)]) == 2
+    assert not dead.exists()
+    assert not rebooted.exists()
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        [own.name, foreign.name, unknown_host.name, unmarked.name, other.name]
+    )
+
+    assert cleanup_orphaned_dirs(str(tmp_path), max_age=-1) == 3
+    assert sorted(os.listdir(tmp_path)) == sorted([own.name, other.name])
+
+
+def test_staging_area_stage_all(tmp_path: Path):
+
+    staging_area = StagingArea(base_path=str(tmp_path / "staging"))
+
+    file_objs = [
+        (io.BytesIO(f"content {i}".encode()), f"file_{i}.txt") for i in range(50)
+    ]
+    file_objs.append((io.BytesIO(b"content 3"), "duplicate.txt"))
+
+    staged = staging_area.stage_all(file_objs, max_workers=4)
+
+    # identical content is only staged once, under the first name
+    assert len(staged) == 50
+    assert [file_name for file_name, _ in staged.values()][:2] == [
+        "file_0.txt",
+        "file_1.txt",
+    ]
+    digest = hashlib.sha256(b"content 3").hexdigest()
+    file_name, path = staged[digest]
+    assert file_name == "file_3.txt"
+    assert Path(path).read_bytes() == b"content 3"
+    assert staging_area.get_stats().num_files == 50
+
+    assert staging_area.stage_all([]) == {}
+
+
+def test_import_file_obj(
+    kiara_streamlit: KiaraStreamlit, monkeypatch: pytest.MonkeyPatch
+):
+
+    staging_area = kiara_streamlit._staging_area
+    staged = []
+    stage = staging_area.stage
+
+    def count_stage(file_obj, file_name, digest=None):
+        staged.append(file_name)
+        return stage(file_obj, file_name=file_name, digest=digest)
+
+    monkeypatch.setattr(staging_area, "stage", count_stage)
+
+    value = kiara_streamlit.import_file_obj(io.BytesIO(b"content"), "a.txt")
+    assert value.data_type_name == "file"
+    assert value.data.file_name == "a.txt"
+
+    # the same content is neither staged nor registered again
+    again = kiara_streamlit.import_file_obj(io.BytesIO(b"content"), "a.txt")
+    assert again.value_id == value.value_id
+    assert staged == ["a.txt"]
+    assert staging_area.get_stats().num_files == 1
+    digest = hashlib.sha256(b"content").hexdigest()
+    assert os.listdir(os.path.join(staging_area.base_path, digest)) == ["a.txt"]
+
+
+def test_import_file_bundle(kiara_streamlit: KiaraStreamlit):
+    def create_file_objs():
+        return [
+            (io.BytesIO(b"first"), "a.txt"),
+            (io.BytesIO(b"second"), "b.txt"),
+            # same content as 'a.txt'
+            (io.BytesIO(b"first"), "c.txt"),
+            # different content, same name as 'a.txt'
+            (io.BytesIO(b"third"), "a.txt"),
+            (io.BytesIO(b"fourth"), "a.txt"),
+        ]
+
+    value = kiara_streamlit.import_file_bundle(create_file_objs(), bundle_name="corpus")
+    assert value.data_type_name == "file_bundle"
+
+    bundle: KiaraFileBundle = value.data
+    assert bundle.bundle_name == "corpus"
+    assert list(bundle.included_files.keys()) == [
+        "a.txt",
+        "b.txt",
+        "a_1.txt",
+        "a_2.txt",
+    ]
+    assert Path(bundle.included_files["a_1.txt"].path).read_bytes() == b"third"
+    assert bundle.included_files["a_2.txt"].file_name == "a_2.txt"
+
+    # the same files are not registered again
+    again = kiara_streamlit.import_file_bundle(create_file_objs(), bundle_name="corpus")
+    assert again.value_id == value.value_id
+
+    other = kiara_streamlit.import_file_bundle(
+        create_file_objs()[0:2], bundle_name="corpus"
+    )
+    assert other.value_id != value.value_id
+    assert other.data.number_of_files == 2
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the 'table.profile' module."""
+
+import pyarrow as pa
+
+from kiara_plugin.streamlit.modules.table import create_table_profile
+from kiara_plugin.streamlit.streamlit import KiaraStreamlit
+
+
+def test_table_profile():
+
+    table = pa.table(
+        {
+            "ints": [1, 2, 2, None, 5] * 100,
+            "floats": [1.5, 2.5, None, float("nan"), 3.0] * 100,
+            "strings": pa.array(["x", "y", "x", None, "z"] * 100).dictionary_encode(),
+        }
+    )
+    # make sure statistics are merged across record batches
+    table = pa.concat_tables([table.slice(idx, 50) for idx in range(0, 500, 50)])
+    assert len(table.to_batches()) == 10
+
+    profile = create_table_profile(table, num_top_values=2, num_histogram_bins=4)
+    assert profile["num_rows"] == 500
+
+    ints = profile["columns"]["ints"]
+    assert ints["null_count"] == 100
+    assert ints["distinct_count"] == 3
+    assert (ints["min"], ints["max"]) == (1, 5)
+    assert ints["mean"] == 2.5
+    assert ints["std"] == 1.5
+    assert ints["top_values"][0] == {"value": 2, "count": 200}
+    assert ints["histogram"]["counts"] == [100, 200, 0, 100]
+
+    floats = profile["columns"]["floats"]
+    assert floats["mean"] == (1.5 + 2.5 + 3.0) / 3
+    assert sum(floats["histogram"]["counts"]) == 300
+
+    strings = profile["columns"]["strings"]
+    assert strings["distinct_count"] == 3
+    assert strings["min"] == "x"
+    assert strings["histogram"] is None
+    assert strings["mean"] is None
+
+
+def test_table_profile_max_distinct_values():
+
+    # one frequent value, and many values that only occur once
+    values = [0] * 500 + list(range(1, 1001))
+    table = pa.table({"ints": values})
+    table = pa.concat_tables([table.slice(idx, 100) for idx in range(0, 1500, 100)])
+
+    profile = create_table_profile(
+        table, num_top_values=1, num_histogram_bins=4, max_distinct_values=200
+    )
+    ints = profile["columns"]["ints"]
+    assert ints["counts_truncated"]
+    assert ints["distinct_count"] is None
+    assert ints["top_values"] == []
+    assert (ints["min"], ints["max"]) == (0, 1000)
+    # the histogram is created from the sketch, over the per-batch ranges
+    histogram = ints["histogram"]
+    assert histogram["bin_edges"] == [0.0, 250.0, 500.0, 750.0, 1000.0]
+    assert sum(histogram["counts"]) == 1500
+    for count, expected in zip(histogram["counts"], [749, 250, 250, 251]):
+        assert abs(count - expected) <= 2
+
+    profile = create_table_profile(table, num_top_values=1, num_histogram_bins=4)
+    ints = profile["columns"]["ints"]
+    assert not ints["counts_truncated"]
+    assert ints["distinct_count"] == 1001
+    assert ints["top_values"] == [{"value": 0, "count": 500}]
+    assert ints["histogram"]["counts"] == [749, 250, 250, 251]
+
+
+def test_table_profile_is_only_stored_for_stored_tables(
+    kiara_streamlit: KiaraStreamlit,
+):
+
+    api = kiara_streamlit.api
+    component = kiara_streamlit.get_component("preview_table")
+
+    value = api.register_data(pa.table({"a": [1, 2, 3]}), data_type="table")
+    profile_value = component.get_table_profile(value)
+    assert profile_value.data.dict_data["num_rows"] == 3
+    assert not profile_value.is_stored
+
+    other = api.register_data(pa.table({"a": [1, 2, 3, 4]}), data_type="table")
+    api.store_value(other, alias="my_other_table")
+    assert component.get_table_profile(other).is_stored
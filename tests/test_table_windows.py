@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the table filter/sort helpers in `kiara_plugin.streamlit.utils.tables`."""
+
+import pyarrow as pa
+import pytest
+
+from kiara_plugin.streamlit.utils.tables import (
+    ColumnFilter,
+    create_filter_expression,
+    get_table_window,
+)
+
+TABLE = pa.table(
+    {
+        "id": list(range(100)),
+        "name": [f"item {i}" for i in range(100)],
+        "score": [None if i % 10 == 0 else float(i % 7) for i in range(100)],
+    }
+)
+
+
+def test_filter_expressions():
+
+    expr = create_filter_expression(
+        TABLE.schema,
+        [ColumnFilter("id", ">=", "50"), ColumnFilter("name", "contains", "5")],
+    )
+    result = TABLE.filter(expr)
+    assert result.column("id").to_pylist() == [
+        50,
+        51,
+        52,
+        53,
+        54,
+        55,
+        56,
+        57,
+        58,
+        59,
+        65,
+        75,
+        85,
+        95,
+    ]
+
+    expr = create_filter_expression(TABLE.schema, [ColumnFilter("score", "is null")])
+    assert TABLE.filter(expr).num_rows == 10
+
+    assert create_filter_expression(TABLE.schema, []) is None
+
+    with pytest.raises(ValueError):
+        create_filter_expression(TABLE.schema, [ColumnFilter("id", "==", "abc")])
+    with pytest.raises(ValueError):
+        create_filter_expression(TABLE.schema, [ColumnFilter("id", "contains", "1")])
+    with pytest.raises(ValueError):
+        create_filter_expression(TABLE.schema, [ColumnFilter("x", "==", "1")])
+
+
+def test_table_window():
+
+    window, num_rows = get_table_window(
+        TABLE, offset=0, length=5, sort_column="id", descending=True
+    )
+    assert num_rows == 100
+    assert window.column("id").to_pylist() == [99, 98, 97, 96, 95]
+
+    expr = create_filter_expression(TABLE.schema, [ColumnFilter("id", "<", "20")])
+    window, num_rows = get_table_window(
+        TABLE, offset=5, length=10, filter_expression=expr, sort_column="score"
+    )
+    assert num_rows == 20
+    assert window.num_rows == 10
+    scores = window.column("score").to_pylist()
+    assert scores == sorted(scores)
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the nested data preview helpers in `kiara_plugin.streamlit.utils.trees`."""
+
+import orjson
+
+from kiara_plugin.streamlit.utils.trees import (
+    create_tree_preview,
+    create_tree_preview_json,
+    get_tree_node,
+    list_expandable_children,
+)
+
+DATA = {
+    "numbers": list(range(1000)),
+    "nested": {"a": {"b": {"c": 1}}},
+    "text": "x" * 1000,
+}
+
+
+def test_tree_preview_truncation():
+
+    tree = create_tree_preview(DATA, max_depth=2, max_items=10, max_string_length=20)
+
+    assert tree["numbers"][0:10] == list(range(10))
+    assert tree["numbers"][10] == "… 990 more items"
+    assert tree["nested"] == {"a": "{…} (1 items)"}
+    assert tree["text"].startswith("x" * 20 + "…")
+
+    tree = create_tree_preview(DATA, max_depth=0)
+    assert tree == "{…} (3 items)"
+
+
+def test_tree_preview_node_budget():
+
+    tree = create_tree_preview(
+        {"a": list(range(100)), "b": list(range(100))}, max_items=100, max_nodes=50
+    )
+    # one node is used for the 'a' key itself
+    assert tree["a"][0:49] == list(range(49))
+    assert tree["a"][49] == "… 51 more items"
+    assert tree["…"] == "1 more items"
+
+
+def test_tree_preview_json_size_limit():
+
+    json_str, fits = create_tree_preview_json(DATA, max_items=1000, max_json_size=500)
+    assert fits
+    assert len(json_str) <= 500
+    assert "numbers" in orjson.loads(json_str)
+
+
+def test_tree_navigation():
+
+    assert list_expandable_children(DATA) == ["numbers", "nested"]
+    assert get_tree_node(DATA, ["nested", "a", "b"]) == {"c": 1}
+    assert get_tree_node([[1, [2, 3]]], ["0", "1"]) == [2, 3]
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the generic helpers in `kiara_plugin.streamlit.utils`."""
+
+import pyarrow as pa
+import pytest
+
+from kiara_plugin.streamlit.utils.arrays import (
+    compute_numeric_summary,
+    get_array_window,
+)
+from kiara_plugin.streamlit.utils.caching import BoundedCache
+from kiara_plugin.streamlit.utils.text import split_text_chunks
+
+
+def test_split_text_chunks():
+
+    text = "".join(f"line {idx}\n" for idx in range(10))
+
+    chunks = split_text_chunks(text, max_lines=3, max_chars=0)
+    assert len(chunks) == 4
+    assert chunks[0] == "line 0\nline 1\nline 2\n"
+    assert "".join(chunks) == text
+
+    # long lines are split over several chunks
+    text = "a" * 25 + "\nbb\n"
+    chunks = split_text_chunks(text, max_lines=0, max_chars=10)
+    assert chunks == ["a" * 10, "a" * 10, "aaaaa\nbb\n"]
+
+    assert split_text_chunks("", max_lines=3, max_chars=3) == []
+
+
+def test_bounded_cache():
+
+    cache: BoundedCache[int] = BoundedCache(max_items=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    # 'b' is the least recently used item now
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_array_window():
+
+    array = pa.chunked_array(
+        [pa.array(range(idx * 10, idx * 10 + 10)) for idx in range(5)]
+    )
+
+    assert get_array_window(array, offset=8, length=5) == ([8, 9, 10, 11, 12], [0, 1])
+    assert get_array_window(array, offset=45, length=100) == (
+        [45, 46, 47, 48, 49],
+        [4],
+    )
+    assert get_array_window(array, offset=100, length=5) == ([], [])
+
+
+def test_numeric_summary():
+
+    array = pa.chunked_array(
+        [pa.array([1.0, 2.0, 3.0]), pa.array([4.0, None, float("nan")])]
+    )
+    summary = compute_numeric_summary(array, num_bins=3)
+
+    assert summary["count"] == 4
+    assert summary["null_count"] == 1
+    assert (summary["min"], summary["max"]) == (1.0, 4.0)
+    assert summary["mean"] == 2.5
+    assert summary["std"] == pytest.approx(1.118, abs=0.001)
+    assert summary["quantiles"][0.5] == pytest.approx(2.5, abs=0.5)
+    assert summary["histogram"]["counts"] == [1, 1, 2]
+
+
+def test_model_flattening_plan():
+
+    from kiara.models.filesystem import KiaraFile
+    from kiara_plugin.streamlit.components.models import (
+        create_recursive_table_from_model_object,
+        get_model_flattening_plan,
+        get_model_schema,
+    )
+
+    plan = get_model_flattening_plan(KiaraFile)
+    assert plan is get_model_flattening_plan(KiaraFile)
+    assert [x.name for x in plan] == sorted(KiaraFile.model_fields.keys())
+    assert get_model_schema.cache_info().currsize >= 1
+
+    kiara_file = KiaraFile.load_file(__file__)
+    table = create_recursive_table_from_model_object(kiara_file)
+    assert table["file_name"] == "test_utils.py"
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the value summaries in `kiara_plugin.streamlit.components.preview`."""
+
+import humanfriendly
+import pyarrow as pa
+
+from kiara.interfaces.python_api import KiaraAPI
+from kiara_plugin.streamlit.components.preview import create_value_summary
+
+
+def test_table_value_summary(kiara_api: KiaraAPI):
+
+    table = pa.table({"a": list(range(500)), "b": ["x"] * 500})
+    value = kiara_api.register_data(table, data_type="table")
+
+    summary = create_value_summary(value)
+    assert summary == {
+        "type": "table",
+        "size": humanfriendly.format_size(value.value_size),
+        "rows": 500,
+    }
+
+
+def test_value_summary_for_other_types(kiara_api: KiaraAPI):
+
+    value = kiara_api.register_data("hello", data_type="string")
+    assert create_value_summary(value) == {
+        "type": "string",
+        "size": "5 bytes",
+        "rows": None,
+    }
+
+    value = kiara_api.register_data(None, data_type="string")
+    assert not value.is_set
+    assert create_value_summary(value) == {
+        "type": "string",
+        "size": None,
+        "rows": None,
+    }